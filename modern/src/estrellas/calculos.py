@@ -1,5 +1,16 @@
 # src/estrellas/calculos.py
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
 from skyfield.api import Star
+from skyfield.constants import C_AUDAY
+from skyfield.functions import length_of
+from skyfield.positionlib import Astrometric
+from skyfield.relativity import add_aberration, light_time_difference
 # Importamos el módulo completo para acceder a load_data y a la variable actualizada
 from utils import read_de440 
 
@@ -13,75 +24,278 @@ STI2RAD = 0.7272205216643039e-04
 SAR2RAD = 0.484813681109536e-05
 PI = 3.141592653589793
 
+# Razón entre el día sidéreo y el día solar medio (tiempo sidéreo / tiempo UT)
+SIDEREO_POR_SOLAR = 1.00273790935
+
+# Corrección (días) por debajo de la cual un paso por el meridiano se da por
+# convergido en el cálculo en lote (~0.1 ms, muy por debajo del minuto impreso)
+TOL_PASO_MERIDIANO = 1e-9
+
+# Registro de una estrella del catálogo (array paralelo al Star vectorial)
+DTYPE_CATALOGO = np.dtype([
+    ('inu', 'i4'),                  # Número de la estrella en el Almanaque
+    ('nfk', 'i4'),                  # Número en el fichero (sin el ajuste de la Polar)
+    ('img', 'i4'),                  # Magnitud x 100
+    ('tip', 'U4'),                  # Tipo espectral
+    ('ra_hours', 'f8'),             # AR J2000 (horas)
+    ('dec_degrees', 'f8'),          # Dec J2000 (grados)
+    ('ra_mas_per_year', 'f8'),      # Movimientos propios (mas/año)
+    ('dec_mas_per_year', 'f8'),
+    ('parallax_mas', 'f8'),         # Paralaje (mas)
+])
+
+# Caché en disco de los catálogos ya leídos: cache/estrellas/<nombre>_<clave>.npy
+# (fuera de /data, como la caché de páginas). La clave es el SHA-256 del
+# contenido del fichero y de VERSION_CATALOGO, así que editar el catálogo o
+# cambiar la lectura (unidades, ajuste de la Polar) invalida la entrada.
+RUTA_CACHE_CATALOGOS = Path(__file__).resolve().parent.parent.parent.parent / "cache" / "estrellas"
+VERSION_CATALOGO = 2
+
 class DatosEstrella:
     """Estructura simple para almacenar datos crudos del fichero"""
+    __slots__ = ('inu', 'img', 'tip', 'skyfield_star')
+
     def __init__(self):
         self.inu = 0
         self.img = 0
         self.tip = ""
         self.skyfield_star = None
 
-def cargar_catalogo(ruta_fichero):
+def _parsear_linea(linea):
     """
-    Lee el fichero estANFKH.txt o estAN_UH.txt y crea objetos Star de Skyfield.
+    Convierte una línea del catálogo (formato estANFKH.txt / estAN_UH.txt) en
+    una tupla DTYPE_CATALOGO con las unidades de Skyfield (None si no es válida).
+    """
+    parts = linea.split()
+    if not parts:
+        return None
+
+    try:
+        inu = int(parts[0])
+        img = int(parts[1])
+        tip = parts[2]
+
+        # Lectura de datos astrométricos (J2000)
+        ars = float(parts[3])   # AR en segundos de tiempo
+        arp = float(parts[4])   # Mov. Propio AR (s/siglo)
+        dec_d = float(parts[5]) # Dec en segundos de arco
+        dep = float(parts[6])   # Mov. Propio Dec (arcsec/siglo)
+        par = float(parts[7])   # Paralaje (arcsec)
+    except (ValueError, IndexError):
+        return None
+
+    # --- CONVERSIONES ---
+    ra_hours = ars / 3600.0 * 15.0 / 15.0 # Segundos tiempo -> Horas
+    dec_deg = dec_d / 3600.0              # Segundos arco -> Grados
+
+    # Movimientos propios: Skyfield quiere mas/año
+    pm_ra_mas_yr = (arp * 15000.0) / 100.0
+    pm_dec_mas_yr = (dep * 1000.0) / 100.0
+    parallax_mas = par * 1000.0
+
+    return (inu, inu, img, tip, ra_hours, dec_deg, pm_ra_mas_yr, pm_dec_mas_yr, parallax_mas)
+
+def _leer_catalogo(ruta_fichero):
+    """
+    Lee el fichero estANFKH.txt o estAN_UH.txt y devuelve un array DTYPE_CATALOGO
+    con los datos ya convertidos a las unidades de Skyfield (None si no existe).
     """
-    catalogo = []
-    
     try:
         with open(ruta_fichero, 'r') as f:
             lineas = f.readlines()
-            
-        for _k, linea in enumerate(lineas):
-            parts = linea.split()
-            if not parts: continue
-            
-            e = DatosEstrella()
-            try:
-                e.inu = int(parts[0])
-                e.img = int(parts[1])
-                e.tip = parts[2]
-                
-                # Lectura de datos astrométricos (J2000)
-                ars = float(parts[3])   # AR en segundos de tiempo
-                arp = float(parts[4])   # Mov. Propio AR (s/siglo)
-                dec_d = float(parts[5]) # Dec en segundos de arco
-                dep = float(parts[6])   # Mov. Propio Dec (arcsec/siglo)
-                par = float(parts[7])   # Paralaje (arcsec)                
-            except ValueError:
+    except FileNotFoundError:
+        print(f"ERROR CRÍTICO: No se encuentra {ruta_fichero}")
+        return None
+
+    filas = [fila for fila in map(_parsear_linea, lineas) if fila is not None]
+    registros = np.array(filas, dtype=DTYPE_CATALOGO)
+
+    # Ajuste de índices de la Polar
+    if len(registros) >= 12:
+        registros['inu'][10] = 12
+        registros['inu'][11] = 11
+
+    return registros
+
+def leer_catalogo_por_bloques(ruta_fichero, tam_bloque):
+    """
+    Lee un catálogo de cualquier tamaño con el formato de estANFKH.txt y lo
+    devuelve por bloques de como mucho 'tam_bloque' estrellas (arrays
+    DTYPE_CATALOGO), sin cargar el fichero entero en memoria.
+
+    No aplica el ajuste de la Polar, que es propio de los catálogos del
+    Almanaque.
+    """
+    filas = []
+    with open(ruta_fichero, 'r') as f:
+        for linea in f:
+            fila = _parsear_linea(linea)
+            if fila is None:
                 continue
-            
-            # --- CONVERSIONES ---
-            ra_hours = ars / 3600.0 * 15.0 / 15.0 # Segundos tiempo -> Horas
-            dec_deg = dec_d / 3600.0              # Segundos arco -> Grados
-            
-            # Movimientos propios: Skyfield quiere mas/año
-            pm_ra_mas_yr = (arp * 15000.0) / 100.0
-            pm_dec_mas_yr = (dep * 1000.0) / 100.0
-            parallax_mas = par * 1000.0
-            
-            # --- CREACIÓN DEL OBJETO SKYFIELD ---
-                
-            e.skyfield_star = Star(
-                ra_hours=ra_hours,
-                dec_degrees=dec_deg,
-                ra_mas_per_year=pm_ra_mas_yr,
-                dec_mas_per_year=pm_dec_mas_yr,
-                parallax_mas=parallax_mas
-            )
-            
-            catalogo.append(e)
-            
-        # Ajuste de índices de la Polar
-        if len(catalogo) >= 12:
-            catalogo[10].inu = 12
-            catalogo[11].inu = 11
-            
-        return catalogo
-        
+            filas.append(fila)
+            if len(filas) == tam_bloque:
+                yield np.array(filas, dtype=DTYPE_CATALOGO)
+                filas = []
+
+    if filas:
+        yield np.array(filas, dtype=DTYPE_CATALOGO)
+
+def estrella_vectorial(registros):
+    """Crea un único Star de Skyfield con arrays a partir de registros DTYPE_CATALOGO."""
+    return Star(
+        ra_hours=registros['ra_hours'],
+        dec_degrees=registros['dec_degrees'],
+        ra_mas_per_year=registros['ra_mas_per_year'],
+        dec_mas_per_year=registros['dec_mas_per_year'],
+        parallax_mas=registros['parallax_mas']
+    )
+
+
+def _leer_cache_catalogo(ruta):
+    """Registros guardados en 'ruta' (None si no existen o están dañados)."""
+    try:
+        registros = np.load(ruta, allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    return registros if registros.dtype == DTYPE_CATALOGO else None
+
+def _guardar_cache_catalogo(ruta, registros):
+    """Guarda los registros de forma atómica; si no se puede escribir se ignora."""
+    try:
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        fd, ruta_tmp = tempfile.mkstemp(dir=ruta.parent, suffix=".tmp")
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, 'wb') as f_tmp:
+            np.save(f_tmp, registros, allow_pickle=False)
+        os.replace(ruta_tmp, ruta)
+    except OSError:
+        if os.path.exists(ruta_tmp):
+            os.remove(ruta_tmp)
+
+@lru_cache(maxsize=16)
+def _catalogo_memorizado(ruta, tam, mtime_ns, directorio):
+    """
+    Registros (sólo lectura) y Star vectorial de un catálogo. Memorizado por
+    (ruta, tamaño, fecha de modificación): en un proceso que ya lo cargó no
+    se vuelve a tocar el disco; en uno nuevo se lee el .npy de la caché.
+    """
+    contenido = Path(ruta).read_bytes()
+    clave = hashlib.sha256(contenido + f"|{VERSION_CATALOGO}".encode()).hexdigest()
+    ruta_npy = Path(directorio) / f"{Path(ruta).stem}_{clave[:16]}.npy"
+
+    registros = _leer_cache_catalogo(ruta_npy)
+    if registros is None:
+        registros = _leer_catalogo(ruta)
+        _guardar_cache_catalogo(ruta_npy, registros)
+
+    registros.flags.writeable = False
+    estrellas = estrella_vectorial(registros) if len(registros) else None
+    return registros.view(np.recarray), estrellas
+
+def leer_catalogo_cacheado(ruta_fichero, directorio=RUTA_CACHE_CATALOGOS):
+    """
+    Como _leer_catalogo (incluido el ajuste de la Polar), pero leído una sola
+    vez: de la caché en disco si ya existe y de memoria en llamadas
+    posteriores del mismo proceso.
+
+    Retorna: (registros, estrellas) como cargar_catalogo_vectorial, o None si
+             no existe el fichero. Los registros son de sólo lectura.
+    """
+    ruta = Path(ruta_fichero)
+    try:
+        info = ruta.stat()
     except FileNotFoundError:
         print(f"ERROR CRÍTICO: No se encuentra {ruta_fichero}")
+        return None
+
+    return _catalogo_memorizado(str(ruta.resolve()), info.st_size, info.st_mtime_ns,
+                                str(directorio))
+
+
+def cargar_catalogo(ruta_fichero):
+    """
+    Lee el fichero estANFKH.txt o estAN_UH.txt y crea objetos Star de Skyfield.
+    """
+    leido = leer_catalogo_cacheado(ruta_fichero)
+    if leido is None:
         return []
 
+    catalogo = []
+    for r in leido[0]:
+        e = DatosEstrella()
+        e.inu = int(r['inu'])
+        e.img = int(r['img'])
+        e.tip = str(r['tip'])
+
+        # --- CREACIÓN DEL OBJETO SKYFIELD ---
+        e.skyfield_star = Star(
+            ra_hours=float(r['ra_hours']),
+            dec_degrees=float(r['dec_degrees']),
+            ra_mas_per_year=float(r['ra_mas_per_year']),
+            dec_mas_per_year=float(r['dec_mas_per_year']),
+            parallax_mas=float(r['parallax_mas'])
+        )
+        catalogo.append(e)
+
+    return catalogo
+
+
+def cargar_catalogo_vectorial(ruta_fichero, directorio=RUTA_CACHE_CATALOGOS):
+    """
+    Lee el catálogo como un único Star de Skyfield con arrays (una posición por
+    estrella) y un array de registros paralelo con número, magnitud y tipo.
+    Pasa por leer_catalogo_cacheado (caché en disco en 'directorio').
+
+    Retorna: (registros, estrellas); registros es un np.recarray DTYPE_CATALOGO
+             de sólo lectura (vacío si no existe el fichero) y estrellas el Star
+             vectorial (None si el catálogo está vacío).
+    """
+    leido = leer_catalogo_cacheado(ruta_fichero, directorio)
+    if leido is None:
+        return np.recarray(0, dtype=DTYPE_CATALOGO), None
+
+    return leido
+
+# Campos que identifican a una estrella al unir catálogos
+CAMPOS_ESTRELLA = ['nfk', 'ra_hours', 'dec_degrees', 'ra_mas_per_year',
+                   'dec_mas_per_year', 'parallax_mas']
+
+def cargar_catalogos_unidos(rutas, directorio=RUTA_CACHE_CATALOGOS):
+    """
+    Une varios catálogos (p. ej. estAN_UH.txt y estANFKH.txt, cuyas 50
+    estrellas están todas en el segundo) en un único Star vectorial sin
+    repeticiones, para calcular cada estrella una sola vez por época.
+
+    Las estrellas se identifican por su número en el fichero ('nfk') junto
+    con su astrometría: dos entradas con el mismo número y datos distintos
+    se tratan como estrellas distintas. Cada catálogo se lee con
+    cargar_catalogo_vectorial (caché en disco en 'directorio').
+
+    Retorna: (catalogos, estrellas, indices); catalogos[i] son los registros
+             del catálogo rutas[i] (con su número del Almanaque), estrellas el
+             Star vectorial de la unión (orden de primera aparición) e
+             indices[i] la fila de la unión de cada estrella de catalogos[i].
+    """
+    catalogos = [cargar_catalogo_vectorial(ruta, directorio)[0] for ruta in rutas]
+    todos = np.concatenate(catalogos) if catalogos else np.empty(0, dtype=DTYPE_CATALOGO)
+
+    _, primeras, inversa = np.unique(todos[CAMPOS_ESTRELLA], return_index=True,
+                                     return_inverse=True)
+    # Renumerar por orden de primera aparición
+    orden = np.argsort(primeras)
+    posicion = np.empty_like(orden)
+    posicion[orden] = np.arange(len(orden))
+
+    union = todos[np.sort(primeras)]
+    inversa = posicion[inversa.ravel()]
+    indices = np.split(inversa, np.cumsum([len(c) for c in catalogos])[:-1])
+
+    estrellas = estrella_vectorial(union) if len(union) else None
+    return catalogos, estrellas, indices
+
 def calcular_posicion_aparente(jd_tt, estrella_obj):
     """
     Calcula AR y DEC aparentes.
@@ -101,6 +315,118 @@ def calcular_posicion_aparente(jd_tt, estrella_obj):
     
     return ra.radians, dec.radians
 
+def calcular_posiciones_aparentes(jd_tt, estrellas):
+    """
+    Calcula AR y DEC aparentes de todas las estrellas de un Star vectorial
+    (ver cargar_catalogo_vectorial) en varias épocas.
+
+    Skyfield no combina un Star con arrays y un Time con arrays en la misma
+    llamada, así que se hace una llamada observe/apparent por época, cada una
+    con todas las estrellas a la vez.
+
+    Retorna: (ra, dec) en radianes, arrays (estrellas x épocas).
+    """
+    if hasattr(read_de440, 'load_data'):
+        read_de440.load_data()
+
+    earth = read_de440._planets['earth']
+
+    jd_tt = np.atleast_1d(np.asarray(jd_tt, dtype=float))
+    n = len(np.atleast_1d(estrellas.ra.hours))
+    ra = np.empty((n, len(jd_tt)))
+    dec = np.empty((n, len(jd_tt)))
+
+    for k, jd in enumerate(jd_tt):
+        t = read_de440._ts.tt_jd(jd)
+        apparent = earth.at(t).observe(estrellas).apparent()
+        ra_k, dec_k, _ = apparent.radec(epoch='date')
+        ra[:, k] = ra_k.radians
+        dec[:, k] = dec_k.radians
+
+    return ra, dec
+
+def _vectores_estrella(estrellas):
+    """
+    Posición (au) y velocidad (au/día) baricéntricas del Star, tal como las
+    guarda Skyfield internamente, o None si esta versión de Skyfield no las
+    expone con esos nombres (las vías rápidas recurren entonces a la API pública).
+    """
+    try:
+        return estrellas._position_au, estrellas._velocity_au_per_d
+    except AttributeError:
+        return None
+
+
+def _deflexion_un_cuerpo():
+    """
+    Función interna de Skyfield que aplica la deflexión de un solo cuerpo, o
+    None si esta versión de Skyfield no la tiene. Se importa aquí y no al cargar
+    el módulo para que un cambio de Skyfield sólo desactive la vía rápida.
+    """
+    try:
+        from skyfield.relativity import _add_deflection
+    except ImportError:
+        return None
+    return _add_deflection
+
+
+def calcular_posiciones_aparentes_rapido(jd_tt, estrellas):
+    """
+    Vía rápida de calcular_posiciones_aparentes para estrellas fijas.
+
+    Lo que depende sólo de la época (matriz precesión-nutación t.M, posición
+    y velocidad baricéntricas de la Tierra, posición del Sol) se calcula una
+    vez con un único Time vectorial; después se aplica a la vez a todo el
+    catálogo: movimiento propio y paralaje (posición baricéntrica del Star),
+    deflexión por el Sol, aberración anual y rotación al equinoccio de la
+    fecha como un solo producto matricial (estrellas x épocas).
+
+    Omite la deflexión de los planetas (< 0.02" salvo rozando el disco), de
+    modo que coincide con Skyfield muy por debajo de 0.01'.
+
+    Usa funciones y atributos internos de Skyfield (ver requirements.txt); si
+    no existen en la versión instalada, calcula con calcular_posiciones_aparentes.
+
+    Retorna: (ra, dec) en radianes, arrays (estrellas x épocas).
+    """
+    vectores = _vectores_estrella(estrellas)
+    add_deflection = _deflexion_un_cuerpo()
+    if vectores is None or add_deflection is None:
+        return calcular_posiciones_aparentes(jd_tt, estrellas)
+
+    if hasattr(read_de440, 'load_data'):
+        read_de440.load_data()
+
+    earth = read_de440._planets['earth']
+    sun = read_de440._planets['sun']
+
+    jd_tt = np.atleast_1d(np.asarray(jd_tt, dtype=float))
+    t = read_de440._ts.tt_jd(jd_tt)
+
+    # --- Por época (3 x épocas) ---
+    tierra = earth.at(t)
+    pos_tierra = tierra.xyz.au[:, None, :]
+    vel_tierra = tierra.velocity.au_per_d[:, None, :]
+    pos_sol = sun.at(t).xyz.au[:, None, :]
+
+    # --- Por estrella (3 x estrellas x épocas) ---
+    posicion = vectores[0].reshape(3, -1)[:, :, None]
+    velocidad = vectores[1].reshape(3, -1)[:, :, None]
+
+    dt = light_time_difference(posicion, pos_tierra)
+    posicion = posicion + velocidad * (t.tdb + dt - estrellas.epoch)
+    vector = posicion - pos_tierra
+
+    add_deflection(vector, pos_tierra, pos_sol, 1.0)
+    add_aberration(vector, vel_tierra, length_of(vector) / C_AUDAY)
+
+    # Rotación ICRS -> ecuador y equinoccio verdaderos de la fecha
+    x, y, z = np.einsum('ije,jne->ine', np.atleast_3d(t.M), vector)
+
+    ra = np.arctan2(y, x) % (2.0 * PI)
+    dec = np.arctan2(z, np.hypot(x, y))
+    return ra, dec
+
 def calcular_paso_meridiano_greenwich(jd_start, estrella_obj):
     """
     Calcula la hora exacta del paso por el meridiano de Greenwich.
@@ -123,7 +449,7 @@ def calcular_paso_meridiano_greenwich(jd_start, estrella_obj):
         while diff > 12.0: diff -= 24.0
         while diff < -12.0: diff += 24.0
         
-        correction_days = - (diff / 24.0) / 1.00273790935
+        correction_days = - (diff / 24.0) / SIDEREO_POR_SOLAR
         t_est = read_de440._ts.tt_jd(t_est.tt + correction_days)
     
     jd_val = t_est.tt
@@ -134,4 +460,160 @@ def calcular_paso_meridiano_greenwich(jd_start, estrella_obj):
     dia_frac = t_ut % 1.0
     hora_paso = dia_frac * 24.0
     
-    return dt_cent, hora_paso
\ No newline at end of file
+    return dt_cent, hora_paso
+
+
+def _observar_por_pares(observador, estrellas, indices):
+    """
+    Equivalente a observador.observe(estrellas) cuando cada elemento del
+    observador (una época) ve a una estrella distinta: la época j observa a
+    la estrella indices[j] del Star vectorial.
+
+    Skyfield propaga un Star con arrays a un Time con arrays como producto
+    exterior (todas las estrellas en todas las épocas); aquí se hace elemento
+    a elemento con las mismas fórmulas de starlib.Star._observe_from_bcrs,
+    sobre atributos internos de Skyfield. Devuelve None si esta versión de
+    Skyfield no los tiene.
+    """
+    vectores = _vectores_estrella(estrellas)
+    if vectores is None or not hasattr(observador, '_ephemeris'):
+        return None
+
+    posicion = vectores[0][:, indices]
+    velocidad = vectores[1][:, indices]
+    t = observador.t
+
+    dt = light_time_difference(posicion, observador.xyz.au)
+    posicion = posicion + velocidad * (t.tdb + dt - estrellas.epoch)
+
+    vector = posicion - observador.xyz.au
+    vel = observador.velocity.au_per_d - velocidad
+    light_time = length_of(vector) / C_AUDAY
+
+    astrometric = Astrometric(vector, vel, t, observador.target, estrellas.target)
+    astrometric._ephemeris = observador._ephemeris
+    astrometric.center_barycentric = observador
+    astrometric.light_time = light_time
+    return astrometric
+
+def calcular_pasos_meridiano_greenwich(jd_start, estrellas, max_iter=3,
+                                       tol=TOL_PASO_MERIDIANO, seleccion=None):
+    """
+    Versión en lote de calcular_paso_meridiano_greenwich: pasos por el
+    meridiano de Greenwich de todas las estrellas de un Star vectorial (ver
+    cargar_catalogo_vectorial), o sólo de las filas 'seleccion', a partir de
+    cada fecha de 'jd_start'.
+
+    Todas las estimaciones (estrella x fecha) avanzan juntas con una única
+    evaluación observe/apparent por iteración de Newton. Cada elemento deja
+    de iterar cuando su corrección es menor que 'tol' días (como máximo
+    'max_iter' iteraciones, las mismas que la versión escalar). Si la versión
+    instalada de Skyfield no permite observar por pares (_observar_por_pares),
+    cada paso se calcula con calcular_paso_meridiano_greenwich.
+
+    Retorna: (dt_cent, hora_paso), arrays (estrellas x fechas).
+    """
+    if hasattr(read_de440, 'load_data'):
+        read_de440.load_data()
+
+    earth = read_de440._planets['earth']
+    ts = read_de440._ts
+
+    jd_start = np.atleast_1d(np.asarray(jd_start, dtype=float))
+    if seleccion is None:
+        seleccion = np.arange(len(np.atleast_1d(estrellas.ra.hours)))
+    forma = (len(seleccion), len(jd_start))
+
+    # Estimación inicial: mediodía de cada fecha, para todas las estrellas
+    jd_est = np.broadcast_to(jd_start + 0.5, forma).ravel().copy()
+    indices = np.repeat(np.asarray(seleccion), len(jd_start))
+    activos = np.arange(jd_est.size)
+
+    for _ in range(max_iter):
+        if activos.size == 0:
+            break
+
+        t = ts.tt_jd(jd_est[activos])
+        astrometrica = _observar_por_pares(earth.at(t), estrellas, indices[activos])
+        if astrometrica is None:
+            return _pasos_meridiano_uno_a_uno(jd_start, estrellas, seleccion)
+        ra, _, _ = astrometrica.apparent().radec(epoch='date')
+
+        diff = t.gast - ra.hours
+        diff = (diff + 12.0) % 24.0 - 12.0
+
+        correction_days = - (diff / 24.0) / SIDEREO_POR_SOLAR
+        jd_est[activos] = t.tt + correction_days
+        activos = activos[np.abs(correction_days) >= tol]
+
+    t_est = ts.tt_jd(jd_est)
+    dt_cent = (t_est.tt - 2451545.0) / 36525.0
+
+    # Hora civil aproximada del evento
+    hora_paso = (t_est.ut1 % 1.0) * 24.0
+
+    return dt_cent.reshape(forma), hora_paso.reshape(forma)
+
+def _pasos_meridiano_uno_a_uno(jd_start, estrellas, seleccion):
+    """
+    Respaldo de calcular_pasos_meridiano_greenwich con la API pública de
+    Skyfield: un Star escalar por estrella y calcular_paso_meridiano_greenwich
+    para cada fecha.
+    """
+    forma = (len(seleccion), len(jd_start))
+    dt_cent = np.empty(forma)
+    hora_paso = np.empty(forma)
+
+    ra_horas = np.atleast_1d(estrellas.ra.hours)
+    dec_grados = np.atleast_1d(estrellas.dec.degrees)
+    pm_ra = np.broadcast_to(estrellas.ra_mas_per_year, ra_horas.shape)
+    pm_dec = np.broadcast_to(estrellas.dec_mas_per_year, ra_horas.shape)
+    paralaje = np.broadcast_to(estrellas.parallax_mas, ra_horas.shape)
+    vel_radial = np.broadcast_to(estrellas.radial_km_per_s, ra_horas.shape)
+
+    for i, k in enumerate(seleccion):
+        estrella = Star(ra_hours=float(ra_horas[k]), dec_degrees=float(dec_grados[k]),
+                        ra_mas_per_year=float(pm_ra[k]), dec_mas_per_year=float(pm_dec[k]),
+                        parallax_mas=float(paralaje[k]), radial_km_per_s=float(vel_radial[k]),
+                        epoch=estrellas.epoch)
+        for j, jd in enumerate(jd_start):
+            dt_cent[i, j], hora_paso[i, j] = calcular_paso_meridiano_greenwich(jd, estrella)
+
+    return dt_cent, hora_paso
+
+def calcular_pasos_meridiano_rapido(jd_start, estrellas):
+    """
+    Vía rápida de calcular_pasos_meridiano_greenwich para catálogos grandes.
+
+    La AR aparente de una estrella fija varía casi linealmente a lo largo de
+    un día, así que se toma al principio y al final de cada fecha
+    (calcular_posiciones_aparentes_rapido, dos épocas por fecha) y el paso es
+    la raíz de una ecuación lineal con el tiempo sidéreo del mediodía: sólo
+    hay 24 evaluaciones de la nutación en lugar de una por estrella, fecha e
+    iteración. Difiere de la versión con Newton en centésimas de segundo.
+
+    Retorna: (dt_cent, hora_paso), arrays (estrellas x fechas).
+    """
+    jd_start = np.atleast_1d(np.asarray(jd_start, dtype=float))
+    ts = read_de440._ts
+
+    t_mediodia = ts.tt_jd(jd_start + 0.5)
+    ra, _ = calcular_posiciones_aparentes_rapido(
+        np.concatenate((jd_start, jd_start + 1.0)), estrellas)
+    ra_ini, ra_fin = np.split(ra * (12.0 / PI), 2, axis=1)
+
+    # AR del mediodía y su variación diaria (horas, horas/día)
+    deriva = (ra_fin - ra_ini + 12.0) % 24.0 - 12.0
+    ra_mediodia = ra_ini + 0.5 * deriva
+
+    diff = t_mediodia.gast - ra_mediodia
+    diff = (diff + 12.0) % 24.0 - 12.0
+    correction_days = - diff / (24.0 * SIDEREO_POR_SOLAR - deriva)
+
+    t_est = ts.tt_jd(t_mediodia.tt + correction_days)
+    dt_cent = (t_est.tt - 2451545.0) / 36525.0
+
+    # Hora civil aproximada del evento
+    hora_paso = (t_est.ut1 % 1.0) * 24.0
+
+    return dt_cent, hora_paso
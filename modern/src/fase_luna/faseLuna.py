@@ -1,7 +1,16 @@
+import hashlib
+import logging
 import math
+import os
 import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
 # =============================================================================
 # CONFIGURACIÓN DE RUTAS E IMPORTACIONES
 # =============================================================================
@@ -22,6 +31,7 @@ try:
     # _ts: escala de tiempo para posiciones planetarias
     # coor: cálculo de coordenadas eclípticas (Longitude, Latitude, Radius)
     from utils import funciones as fun
+    from utils import read_de440
     from utils.read_de440 import _ts
     from utils import coordena as coor
 except ImportError as e:
@@ -29,6 +39,10 @@ except ImportError as e:
     # pero permite cargar el script para revisión de código.
     pass
 
+from utils.salida import SalidaDirectorio
+
+logger = logging.getLogger(__name__)
+
 # =============================================================================
 # FUNCIONES MATEMÁTICAS Y ASTRONÓMICAS (Lógica de Cálculo)
 # =============================================================================
@@ -50,6 +64,11 @@ def cual_fase(tt_jd):
             2 -> Luna Llena      (180 grados)
             3 -> Cuarto Menguante (270 grados)
     """
+    # 0. Si la fecha está en el catálogo precalculado, basta con consultarlo
+    fase = fase_catalogo(tt_jd)
+    if fase is not None:
+        return fase
+
     # 1. Crear objeto de tiempo para la librería astronómica
     t_skyfield = _ts.tt_jd(tt_jd)
     
@@ -155,119 +174,556 @@ def fase_newt(t_val, dt, fi, dif):
     return t_new_val, dt_new, dif_new
 
 # =============================================================================
-# FUNCIÓN PRINCIPAL 1: GENERADOR DE TABLA LATEX
+# BÚSQUEDA VECTORIAL DE TODAS LAS FASES DE UN INTERVALO
 # =============================================================================
 
-def FasesDeLaLunaLatex(ano, dt_in):
+PASO_REJILLA_FASES = 1.0     # Paso (días) de la rejilla de elongaciones (la Luna avanza ~12°/día)
+PASO_DERIVADA_FASES = 1.0e-3 # Paso (días) de la derivada numérica de Newton
+TOL_FASES = 1.0e-8           # Tolerancia (días, ~1 ms) de la corrección de Newton
+MAX_ITER_NEWTON = 9          # Iteraciones de 'fase_newt' antes de pasar a bisección
+DIAS_ACOTACION_FASE = 10     # Días en los que se busca el intervalo de una fase (fases cada ~7.4 días)
+
+
+def elongacion(tt_jd):
     """
-    Calcula las fases y genera un archivo .dat formateado para ser incrustado
-    en una tabla LaTeX. Incluye mes, día, hora, minuto y número de lunación.
+    Elongación eclíptica aparente Luna - Sol para un array de fechas.
+
+    Parámetros:
+        tt_jd (numpy.ndarray): Fechas Julianas en Tiempo Terrestre (TT).
+
+    Retorna:
+        numpy.ndarray: Longitud de la Luna menos la del Sol, en radianes [0, 2PI).
     """
-    # --- Inicialización de variables ---
-    v = [" " * 11] * 60   # Array para guardar strings temporales "FaseMesDiaHoraMin"
-    w = " " * 11          # Variable auxiliar para comparar entradas
-    x = [" " * 44] * 16   # Array final: 16 filas (cada una contiene 4 fases)
-    f = [0.0] * 64        # Array para guardar las fechas numéricas calculadas
-    fi = [0.0] * 4        # Array para los ángulos objetivo
-    
-    err = 1.0e-5          # Tolerancia de error (convergencia)
+    t_skyfield = _ts.tt_jd(tt_jd)
+    lel, _la_lun, _r_lun = coor.ecliptic_apparent(10, t_skyfield)
+    les, _la_sol, _r_sol = coor.ecliptic_apparent(11, t_skyfield)
+    return (lel - les) % (2.0 * math.pi)
+
+
+def _diferencia_fase(tt_jd, fi):
+    """Elongación menos el ángulo de fase 'fi', reducida a [-PI, PI)."""
+    return (elongacion(tt_jd) - fi + math.pi) % (2.0 * math.pi) - math.pi
+
+
+def biseccion_fases(fi, t_a, t_b, tol=TOL_FASES):
+    """
+    Refina por bisección (convergencia garantizada) varias fases a la vez.
+
+    Parámetros:
+        fi (numpy.ndarray): Ángulo objetivo de cada fase en radianes.
+        t_a, t_b (numpy.ndarray): Intervalos TT que contienen cada fase: la
+                                  diferencia elongación - fi pasa de negativa
+                                  en t_a a positiva en t_b.
+        tol (float): Anchura final (días) de los intervalos.
+
+    Retorna:
+        numpy.ndarray: Fecha TT de cada fase.
+    """
+    t_a = np.array(t_a, dtype=float)
+    t_b = np.array(t_b, dtype=float)
+    while np.max(t_b - t_a, initial=0.0) > tol:
+        t_m = 0.5 * (t_a + t_b)
+        antes = _diferencia_fase(t_m, fi) < 0.0
+        t_a = np.where(antes, t_m, t_a)
+        t_b = np.where(antes, t_b, t_m)
+    return 0.5 * (t_a + t_b)
+
+
+def _acotar_fase(fi, tt_ini):
+    """Primer intervalo de un día a partir de 'tt_ini' en el que se cruza la fase 'fi'."""
+    rejilla = tt_ini + np.arange(DIAS_ACOTACION_FASE + 1, dtype=float)
+    dif = _diferencia_fase(rejilla, fi)
+    # Cruce de negativo a positivo (no el salto de +PI a -PI del lado opuesto)
+    k = np.nonzero((dif[:-1] < 0.0) & (dif[1:] >= 0.0) & (dif[1:] - dif[:-1] < math.pi))[0][0]
+    return rejilla[k], rejilla[k + 1]
+
+
+def buscar_fases(tt_ini, tt_fin, max_iter=8, tol=TOL_FASES):
+    """
+    Encuentra a la vez todas las fases de la Luna entre dos fechas.
+
+    Lógica:
+        1. Una rejilla gruesa de elongaciones (paso de un día) acota cada fase
+           entre dos nodos: el cuadrante de la elongación cambia en ellos.
+        2. Todas las raíces se refinan simultáneamente por Newton, con una
+           sola llamada a las efemérides por iteración (t-h, t, t+h de todas
+           las fases que aún no han convergido).
+
+    Parámetros:
+        tt_ini (float): Fecha Juliana TT de inicio (se excluyen fases anteriores).
+        tt_fin (float): Fecha Juliana TT final.
+        max_iter (int): Máximo de iteraciones de Newton.
+        tol (float): Corrección (días) por debajo de la cual una fase ha convergido.
+
+        Las fases que no convergen en 'max_iter' iteraciones (o que salen de
+        su intervalo) se resuelven por bisección dentro del intervalo.
+
+    Retorna:
+        tuple: (fases, tt, diagnostico) -> arrays con la fase (0-3) y la fecha
+               TT de cada evento, en orden cronológico, y un diccionario con
+               'iteraciones' (de Newton), 'residuo' (|elongación - fase| final
+               en radianes) y 'biseccion' (True si se resolvió por bisección)
+               de cada fase.
+    """
+    cpi = math.pi
+
+    # --- Rejilla gruesa y acotación de cada fase ---
+    rejilla = np.arange(tt_ini, tt_fin + PASO_REJILLA_FASES, PASO_REJILLA_FASES)
+    e = np.unwrap(elongacion(rejilla))
+    cuadrante = np.floor(e / (cpi / 2.0)).astype(int)
+    i = np.nonzero(np.diff(cuadrante))[0]
+
+    objetivo = cuadrante[i + 1] * (cpi / 2.0)
+    fases = cuadrante[i + 1] % 4
+    fi = fases * (cpi / 2.0)
+
+    # Estimación inicial: interpolación lineal dentro del intervalo
+    tt = rejilla[i] + (objetivo - e[i]) / (e[i + 1] - e[i]) * PASO_REJILLA_FASES
+
+    # --- Newton simultáneo con máscara de fases sin converger ---
+    h = PASO_DERIVADA_FASES
+    activos = np.ones(len(tt), dtype=bool)
+    iteraciones = np.zeros(len(tt), dtype=int)
+    for _ in range(max_iter):
+        if not activos.any():
+            break
+        iteraciones[activos] += 1
+        n = int(activos.sum())
+        t_act = tt[activos]
+        dif = elongacion(np.concatenate([t_act - h, t_act, t_act + h])) - np.tile(fi[activos], 3)
+        dif = (dif + cpi) % (2.0 * cpi) - cpi
+
+        v = (dif[2*n:] - dif[:n]) / (2.0 * h)
+        correccion = dif[n:2*n] / v
+        tt[activos] = t_act - correccion
+        activos[activos] = np.abs(correccion) > tol
+
+    # --- Respaldo: bisección en el intervalo de la rejilla ---
+    biseccion = activos | ~((tt >= rejilla[i]) & (tt <= rejilla[i + 1]))
+    if biseccion.any():
+        tt[biseccion] = biseccion_fases(fi[biseccion], rejilla[i][biseccion],
+                                        rejilla[i + 1][biseccion], tol)
+
+    diagnostico = {'iteraciones': iteraciones,
+                   'residuo': np.abs(_diferencia_fase(tt, fi)),
+                   'biseccion': biseccion}
+    return fases, tt, diagnostico
+
+
+# =============================================================================
+# CATÁLOGO PRECALCULADO DE FASES (1900-2100)
+# =============================================================================
+# Todas las fases de los años que admite la aplicación web, calculadas una vez
+# con 'buscar_fases' (paso de construcción 'construir_catalogo_fases') y
+# guardadas como tabla binaria ordenada en TT, que no depende de Delta T.
+# Las consultas son búsquedas binarias (np.searchsorted). Si el catálogo no
+# existe, o no cubre la fecha pedida, se calcula como siempre.
+
+ANIO_INICIO_CATALOGO = 1900
+ANIO_FIN_CATALOGO = 2100
+DIAS_BLOQUE_CATALOGO = 366.0     # Las efemérides se evalúan por bloques de un año
+VERSION_CATALOGO_FASES = 1
+
+# Directorio del catálogo (fuera del control de versiones, como la caché de estrellas)
+RUTA_CACHE_FASES = Path(__file__).resolve().parent.parent.parent.parent / "cache" / "fases"
+
+DTYPE_CATALOGO_FASES = np.dtype([('fase', 'i1'), ('tt', 'f8'), ('lunacion', 'i4')])
+
+
+def _huella_efemerides():
+    """
+    Identificador de las efemérides en uso (el catálogo sólo vale para ellas):
+    el mismo SHA-256 del contenido que usa la caché de páginas.
+    """
+    ruta = read_de440.DE440_PATH
+    if not ruta.exists():
+        # Sin fichero local se usa el de440.bsp de la caché de Skyfield
+        return hashlib.sha256(ruta.name.encode()).hexdigest()[:16]
+    return read_de440.hash_efemerides(ruta)[:16]
+
+
+def _ruta_catalogo(directorio, huella):
+    return Path(directorio) / f"fases_v{VERSION_CATALOGO_FASES}_{huella}.npy"
+
+
+def construir_catalogo_fases(inicio=ANIO_INICIO_CATALOGO, fin=ANIO_FIN_CATALOGO,
+                             directorio=None):
+    """
+    Paso de construcción: calcula todas las fases necesarias para los años
+    'inicio' a 'fin' (desde noviembre del año anterior hasta marzo del
+    siguiente) y las guarda, ordenadas en TT y con su número de lunación.
+
+    Parámetros:
+        inicio, fin (int): Primer y último año del almanaque cubiertos.
+        directorio (Path): Destino; por defecto RUTA_CACHE_FASES.
+
+    Retorna:
+        Path: Ruta del catálogo escrito.
+    """
+    directorio = Path(directorio or RUTA_CACHE_FASES)
+    tt_ini = fun.DiaJul(1, 11, inicio - 1, 0.0)
+    tt_fin = fun.DiaJul(1, 4, fin + 1, 0.0)
+
+    # Bloques solapados de un año: cada fase se queda en el bloque que la contiene
+    fases, tt = [], []
+    for a in np.arange(tt_ini, tt_fin, DIAS_BLOQUE_CATALOGO):
+        b = min(a + DIAS_BLOQUE_CATALOGO, tt_fin)
+        fases_b, tt_b, _ = buscar_fases(a - 2.0, b + 2.0)
+        sel = (tt_b >= a) & (tt_b < b)
+        fases.append(fases_b[sel])
+        tt.append(tt_b[sel])
+
+    catalogo = np.zeros(sum(len(t) for t in tt), dtype=DTYPE_CATALOGO_FASES)
+    catalogo['fase'] = np.concatenate(fases)
+    catalogo['tt'] = np.concatenate(tt)
+
+    # Lunaciones: se cuentan las Lunas Nuevas a partir de la más próxima a la
+    # base de 1998 (numerada como en 'serie_fases'); cada fase pertenece a la
+    # lunación de la Luna Nueva anterior.
+    cuenta = np.cumsum(catalogo['fase'] == 0)
+    nuevas = np.nonzero(catalogo['fase'] == 0)[0]
+    base = fun.DiaJul(*BASES_LUNACION[0])
+    ref = nuevas[np.argmin(np.abs(catalogo['tt'][nuevas] - base))]
+    lunacion_ref = 930 + int((catalogo['tt'][ref] - base) / 29.53059028 + 0.5)
+    catalogo['lunacion'] = lunacion_ref + cuenta - cuenta[ref]
+
+    ruta = _ruta_catalogo(directorio, _huella_efemerides())
+    directorio.mkdir(parents=True, exist_ok=True)
+    fd, ruta_tmp = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f_tmp:
+            np.save(f_tmp, catalogo, allow_pickle=False)
+        os.replace(ruta_tmp, ruta)
+    finally:
+        if os.path.exists(ruta_tmp):
+            os.remove(ruta_tmp)
+
+    _catalogo_memorizado.cache_clear()
+    logger.info(f"Catálogo de fases {inicio}-{fin}: {len(catalogo)} fases en {ruta}")
+    return ruta
+
+
+@lru_cache(maxsize=4)
+def _catalogo_memorizado(directorio, huella):
+    """
+    Catálogo de sólo lectura del directorio y fechas TT de sus Lunas Nuevas
+    (None si no existe o está dañado).
+    """
+    try:
+        catalogo = np.load(_ruta_catalogo(directorio, huella), allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+    if catalogo.dtype != DTYPE_CATALOGO_FASES or len(catalogo) == 0:
+        return None
+
+    catalogo.flags.writeable = False
+    nuevas = catalogo['tt'][catalogo['fase'] == 0]
+    nuevas.flags.writeable = False
+    return catalogo, nuevas
+
+
+def catalogo_fases():
+    """
+    Catálogo precalculado para las efemérides en uso (array DTYPE_CATALOGO_FASES
+    de sólo lectura, ordenado por 'tt'), o None si no se ha construido.
+    """
+    tablas = _catalogo_memorizado(str(RUTA_CACHE_FASES), _huella_efemerides())
+    return None if tablas is None else tablas[0]
+
+
+def _anterior(tt, tt_jd):
+    """Índice del último valor de 'tt' en o antes de tt_jd (-1 fuera de 'tt')."""
+    # Fuera del intervalo cubierto no se puede asegurar cuál es el anterior
+    if len(tt) == 0 or not tt[0] <= tt_jd < tt[-1]:
+        return -1
+    return int(np.searchsorted(tt, tt_jd, side='right')) - 1
+
+
+def fase_catalogo(tt_jd):
+    """
+    Cuadrante de la Luna (como 'cual_fase') según el catálogo.
+
+    Retorna:
+        int | None: Última fase alcanzada en tt_jd, o None fuera del catálogo.
+    """
+    catalogo = catalogo_fases()
+    i = -1 if catalogo is None else _anterior(catalogo['tt'], tt_jd)
+    return None if i < 0 else int(catalogo['fase'][i])
+
+
+def edad_luna(ut_jd, dt_in):
+    """
+    Edad de la Luna (días desde la última Luna Nueva) según el catálogo.
+
+    Parámetros:
+        ut_jd (float): Fecha Juliana UT.
+        dt_in (float): Delta T (TT - UT) en segundos.
+
+    Retorna:
+        float | None: Edad en días, o None fuera del catálogo.
+    """
+    tablas = _catalogo_memorizado(str(RUTA_CACHE_FASES), _huella_efemerides())
+    if tablas is None:
+        return None
+
+    dt = dt_in / 86400.0
+    nuevas = tablas[1]
+    i = _anterior(nuevas, ut_jd + dt)
+    return None if i < 0 else ut_jd - (nuevas[i] - dt)
+
+
+def _fases_catalogo(ut, utf, dt):
+    """
+    Fases de la serie y sus números de lunación leídos del catálogo (None si
+    no cubre el intervalo).
+    """
+    catalogo = catalogo_fases()
+    if catalogo is None:
+        return None
+
+    tt = catalogo['tt']
+    i = int(np.searchsorted(tt, ut + dt, side='right'))
+    j = int(np.searchsorted(tt, utf + 30.0 + dt, side='left'))
+    if i == 0 or j >= len(tt):
+        return None
+
+    # Como en la búsqueda: hasta la primera fase en o tras utf + 30 (incluida)
+    tramo = catalogo[i:j + 1]
+    fases = list(zip(tramo['fase'].tolist(), (tramo['tt'] - dt).tolist()))
+    return (fases, 0, 0.0, 0), tramo['lunacion']
+
+
+# =============================================================================
+# SERIE DE FASES DEL AÑO (cálculo compartido por todas las salidas)
+# =============================================================================
+
+# Ajuste empírico (aprox. 30 segundos) que la tabla LaTeX suma a la hora UT
+AJUSTE_LATEX = 3.47222e-4
+
+# Una fila por fase encontrada: fase (0-3), fecha juliana UT y número de lunación
+DTYPE_FASES = np.dtype([('fase', 'i1'), ('ut', 'f8'), ('lunacion', 'i4')])
+
+
+
+@dataclass(slots=True)
+class MetricasFases:
+    """
+    Resumen de una búsqueda de fases, para que un año lento o con problemas de
+    convergencia se vea en los registros (y en la aplicación web).
+    """
+    ano: int
+    metodo: str
+    fases: int              # Número de fases encontradas
+    iteraciones: int        # Máximo de iteraciones de Newton de una fase
+    residuo: float          # Máximo |elongación - ángulo de fase| final (radianes)
+    biseccion: int          # Fases resueltas por bisección al no converger Newton
+    segundos: float         # Duración de la búsqueda
+
+
+# Métricas de la última búsqueda de cada (año, Delta T, método)
+METRICAS_FASES = {}
+
+# Fechas base en 1998 para sincronizar la serie de lunaciones (una por fase)
+BASES_LUNACION = ((26, 2, 1998, 17.433), (5, 3, 1998, 8.683),
+                  (13, 3, 1998, 4.567), (21, 3, 1998, 7.633))
+
+
+def _fases_newton(ut, utf, dt):
+    """Búsqueda secuencial original: una fase tras otra con 'fase_newt'."""
     PI = 4.0 * math.atan(1.0)
-    can = f"{ano:4d}"     # Año en formato string (ej: "2024")
-    
-    # Definición de ángulos de fase (en radianes)
-    fi[0] = 0.0             # Nueva
-    fi[1] = PI / 2.0        # Creciente
-    fi[2] = PI              # Llena
-    fi[3] = 3.0 * PI / 2.0  # Menguante
-    
-    dt = dt_in / 86400.0  # Convertir DeltaT de segundos a fracción de día
-    
-    # --- Definición del rango temporal ---
-    # Se busca desde el 1 de Diciembre del año anterior hasta fin del actual
-    # para asegurar que capturamos la primera fase que ocurra en Enero.
-    ut = fun.DiaJul(1, 12, ano - 1, 0.0)
-    utf = fun.DiaJul(31, 12, ano, 24.0)
+    fi = [0.0, PI/2.0, PI, 3.0*PI/2.0] # Ángulos de fase
+
     tt = ut + dt
-    
-    # Fase inicial aproximada
+
+    # Fase inicial
     qf = cual_fase(tt)
-    
-    # --- Ajuste de índices ---
-    # Si el año no empieza en Luna Nueva (0), rellenamos las posiciones anteriores con ceros
-    if qf < 3:
-        for i in range(qf + 1):
-            f[i] = 0.0
-        i = qf 
-    else:
-        i = -1
-        
-    i0 = 0      # Contador max iteraciones
-    dif0 = 0.0  # Max error registrado
-    
-    # Limpieza inicial del array visual
-    for j in range(60):
-        v[j] = " " * 11
-        
-    j = 1
-    dif = 0.0 
-    
-    # --- BUCLE PRINCIPAL (Búsqueda de eventos) ---
+
+    err = 1.0e-5
+    dif = 0.0
+    fases = []
+    i0 = 0          # Máximo de iteraciones
+    dif0 = 0.0      # Máximo residuo
+    biseccion = 0
+
     while ut < utf + 30.0:
-        qf = (qf + 1) % 4  # Ciclar fases: 0 -> 1 -> 2 -> 3 -> 0...
-        ep = 0.5           # Paso inicial de búsqueda (medio día)
+        qf = (qf + 1) % 4
+        ep = 0.5
         min_iter = 0
-        
+        semilla = tt
+
         # --- Newton-Raphson: Refinar hasta que el error sea < err ---
         while ep > err:
-            min_iter = min_iter + 1
+            min_iter += 1
             tt, ep, dif = fase_newt(tt, ep, fi[qf], dif)
-            
-            if min_iter > 9:
-                print(' No converge tras ', min_iter, '  iteraciones')
-                input("Presione Enter para continuar...")
-        
-        # Estadísticas de rendimiento
+            if min_iter > MAX_ITER_NEWTON and ep > err:
+                # Sin convergencia: bisección en el intervalo que contiene la fase
+                t_a, t_b = _acotar_fase(fi[qf], semilla)
+                tt = float(biseccion_fases(fi[qf], t_a, t_b))
+                dif = abs(float(_diferencia_fase(tt, fi[qf])))
+                biseccion += 1
+                break
+
+        # Estadísticas de convergencia
         if min_iter > i0: i0 = min_iter
         if dif > dif0: dif0 = dif
-            
+
         # Calcular Tiempo Universal (UT) restando DeltaT
-        ut = tt - dt + 3.47222e-4 # Pequeño ajuste empírico (aprox 30 segs)
-        i = i + 1
-        
-        # Guardar fecha numérica
-        if i < len(f):
-            f[i] = ut
-        
-        # --- Formateo para Visualización ---
+        ut = tt - dt
+        fases.append((qf, ut))
+
+        tt = ut + dt # Avanzar tiempo base para siguiente búsqueda
+
+    return fases, i0, float(dif0), biseccion
+
+
+def _fases_vectorial(ut, utf, dt):
+    """Todas las fases del intervalo a la vez con 'buscar_fases'."""
+    # Margen de sobra para la primera fase posterior a utf + 30 (fases cada ~7.4 días)
+    fases, tt, diagnostico = buscar_fases(ut + dt, utf + 30.0 + dt + 10.0)
+    ut_fases = tt - dt
+
+    # Como en la búsqueda secuencial: hasta la primera fase en o tras utf + 30
+    n = int(np.argmax(ut_fases >= utf + 30.0)) + 1
+    return (list(zip(fases[:n].tolist(), ut_fases[:n].tolist())),
+            int(diagnostico['iteraciones'][:n].max()),
+            float(diagnostico['residuo'][:n].max()),
+            int(diagnostico['biseccion'][:n].sum()))
+
+
+@lru_cache(maxsize=8)
+def serie_fases(ano, dt_in, metodo='auto'):
+    """
+    Busca todas las fases de la Luna desde el 1 de diciembre del año anterior
+    hasta 30 días después del final del año. Es la única búsqueda de fases del
+    módulo: las tablas LaTeX y numérica y las páginas diarias la comparten, y
+    queda en memoria para cada (año, Delta T, método). Las métricas de la
+    búsqueda quedan en METRICAS_FASES.
+
+    Parámetros:
+        ano (int): Año del almanaque.
+        dt_in (float): Delta T (TT - UT) en segundos.
+        metodo (str): 'auto' (catálogo precalculado si cubre el año y, si no,
+                      'vectorial'), 'catalogo', 'vectorial' (todas las fases a
+                      la vez, 'buscar_fases') o 'newton' (búsqueda secuencial
+                      original con 'fase_newt').
+
+    Retorna:
+        numpy.ndarray: Array de sólo lectura con dtype DTYPE_FASES, una fila
+                       por fase en orden cronológico.
+    """
+    dt = dt_in / 86400.0 # Segundos a días
+
+    # Límites temporales
+    ut = fun.DiaJul(1, 12, ano - 1, 0.0)
+    utf = fun.DiaJul(31, 12, ano, 24.0)
+
+    inicio = time.perf_counter()
+    if metodo in ('auto', 'catalogo'):
+        encontradas = _fases_catalogo(ut, utf, dt)
+        if encontradas is not None:
+            metodo = 'catalogo'
+        elif metodo == 'catalogo':
+            raise ValueError(f"El catálogo de fases no cubre el año {ano}")
+        else:
+            metodo = 'vectorial'
+
+    lunaciones = None
+    if metodo == 'catalogo':
+        (fases, i0, dif0, biseccion), lunaciones = encontradas
+    elif metodo == 'vectorial':
+        fases, i0, dif0, biseccion = _fases_vectorial(ut, utf, dt)
+    elif metodo == 'newton':
+        fases, i0, dif0, biseccion = _fases_newton(ut, utf, dt)
+    else:
+        raise ValueError(f"Método de búsqueda de fases desconocido: {metodo}")
+
+    # --- Métricas de la búsqueda ---
+    metricas = MetricasFases(ano, metodo, len(fases), i0, dif0, biseccion,
+                             time.perf_counter() - inicio)
+    METRICAS_FASES[(ano, dt_in, metodo)] = metricas
+    logger.info(f"Fases {ano} ({metodo}): {metricas.fases} fases en {metricas.segundos:.2f} s, "
+                f"máx. {i0} iteraciones, residuo máx. {dif0:.1e} rad")
+    if biseccion:
+        logger.warning(f"Fases {ano} ({metodo}): {biseccion} fases sin converger por Newton "
+                       f"resueltas por bisección")
+
+    serie = np.array([(qf, ut, 0) for qf, ut in fases], dtype=DTYPE_FASES)
+
+    # --- Número de Lunación ---
+    if lunaciones is not None:
+        # Las del catálogo, numeradas al construirlo con la misma base
+        serie['lunacion'] = lunaciones
+    else:
+        # Algoritmo de Brown/Meeus sobre la primera fase (29.53059028 es el mes
+        # sinódico medio); una lunación nueva por cada fila de la tabla LaTeX.
+        fase0 = int(serie['fase'][0])
+        lunacion = 930 + int((serie['ut'][0] + AJUSTE_LATEX - fun.DiaJul(*BASES_LUNACION[fase0]))
+                             / 29.53059028 + 0.5)
+        serie['lunacion'] = lunacion + (fase0 + np.arange(len(serie))) // 4
+
+    serie.setflags(write=False)
+    return serie
+
+
+def fechas_fases(ano, dt):
+    """
+    Fechas (UT) de las fases en el orden del fichero Fases[Año].dat: 64 valores
+    donde el índice % 4 es la fase y 0.0 marca un hueco.
+
+    Parámetros:
+        ano (int): Año del almanaque.
+        dt (float): Delta T (TT - UT) en segundos.
+
+    Retorna:
+        list: Las 64 fechas, sin escribir ningún fichero.
+    """
+    serie = serie_fases(ano, dt)
+    f = [0.0] * 64
+
+    # La primera fase va a la casilla de su cuadrante (índice % 4 = fase)
+    fase0 = int(serie['fase'][0])
+    for n, ut in enumerate(serie['ut'][:64 - fase0].tolist()):
+        f[fase0 + n] = ut
+    return f
+
+# =============================================================================
+# FUNCIÓN PRINCIPAL 1: GENERADOR DE TABLA LATEX
+# =============================================================================
+
+def FasesDeLaLunaLatex(ano, dt_in, salida=None):
+    """
+    Calcula las fases y genera un archivo .dat formateado para ser incrustado
+    en una tabla LaTeX. Incluye mes, día, hora, minuto y número de lunación.
+
+    'salida' es un destino de utils/salida.py; si no se da, el fichero va a
+    data/almanaque_nautico/AAAA. Retorna el destino como cadena.
+    """
+    # --- Inicialización de variables ---
+    v = [" " * 11] * 60   # Array para guardar strings temporales "FaseMesDiaHoraMin"
+    w = " " * 11          # Variable auxiliar para comparar entradas
+    x = [" " * 44] * 16   # Array final: 16 filas (cada una contiene 4 fases)
+    can = f"{ano:4d}"     # Año en formato string (ej: "2024")
+
+    # Fases desde el 1 de Diciembre del año anterior hasta fin del actual
+    # (para asegurar que capturamos la primera fase que ocurra en Enero)
+    serie = serie_fases(ano, dt_in)
+    lunacion = int(serie['lunacion'][0])
+
+    # --- Formateo para Visualización ---
+    for j, (qf, ut) in enumerate(zip(serie['fase'].tolist(), serie['ut'].tolist()), start=1):
+        if j > 60:
+            break
+
         # Convertir Julian Date a fecha Gregoriana
-        dia, mes, ano_calc, hora = fun.DJADia(ut)
+        dia, mes, ano_calc, hora = fun.DJADia(ut + AJUSTE_LATEX)
         minutos = int(60.0 * (hora - int(hora)))
-        
+
         # Crear string compacta: "F Mmm DD HH mm" (ej: "0Ene.151430")
-        str_temp = f"{qf:1d}{fun.MesNom(mes)}{dia:2d}{int(hora):2d}{minutos:2d}"
-        if j <= 60:
-            v[j-1] = str_temp
-            # Asegurar que los espacios vacíos se rellenen con '0' si es necesario
-            if len(v[j-1]) >= 10 and v[j-1][9] == ' ':
-                v[j-1] = v[j-1][:9] + '0' + v[j-1][10:]
-        
-        # --- Cálculo del número de Lunación ---
-        # Se usa el algoritmo de Brown/Meeus. Se calcula solo la primera vez (j=1)
-        # y luego se incrementa secuencialmente.
-        if j == 1:
-            jd_actual = fun.DiaJul(dia, mes, ano_calc, hora)
-            # Fechas base arbitrarias en 1998 para sincronizar la serie de lunaciones
-            if qf == 0: base = fun.DiaJul(26,2,1998,17.433)
-            elif qf == 1: base = fun.DiaJul(5,3,1998,8.683)
-            elif qf == 2: base = fun.DiaJul(13,3,1998,4.567)
-            elif qf == 3: base = fun.DiaJul(21,3,1998,7.633)
-            
-            # 29.53059028 es el mes sinódico medio
-            lunacion = 930 + int((jd_actual - base) / 29.53059028 + 0.5)
+        v[j-1] = f"{qf:1d}{fun.MesNom(mes)}{dia:2d}{int(hora):2d}{minutos:2d}"
+        # Asegurar que los espacios vacíos se rellenen con '0' si es necesario
+        if len(v[j-1]) >= 10 and v[j-1][9] == ' ':
+            v[j-1] = v[j-1][:9] + '0' + v[j-1][10:]
 
-        tt = ut + dt # Avanzar tiempo base para siguiente búsqueda
-        j = j + 1
-    
     # --- REORDENAMIENTO PARA TABLA (Lógica Visual) ---
     # Este bloque maneja los saltos de año (Dic -> Ene) para la visualización
     k = -1
@@ -323,12 +779,12 @@ def FasesDeLaLunaLatex(ano, dt_in):
             if idx_x + 1 < 16: x[idx_x+1] = s2 + s3 + s4 + x[idx_x+1][30:]
     
     # --- ESCRIBIR ARCHIVO DE SALIDA (Formato LaTeX) ---
-    ruta_proyecto = Path(__file__).resolve().parent.parent.parent.parent
-    filename = ruta_proyecto / "data" / "almanaque_nautico" / f"{can}" / f"FasesLuna.dat"
+    if salida is None:
+        ruta_proyecto = Path(__file__).resolve().parent.parent.parent.parent
+        salida = SalidaDirectorio(ruta_proyecto / "data" / "almanaque_nautico" / f"{can}")
     
     try:
-        filename.parent.mkdir(parents=True, exist_ok=True)
-        with open(filename, 'w') as f_out:
+        with salida.abrir("FasesLuna.dat") as f_out:
             for i in range(16):
                 linea = x[i]
                 
@@ -363,84 +819,40 @@ def FasesDeLaLunaLatex(ano, dt_in):
     except Exception as e:
         print(f"Error escribiendo archivo: {e}")
 
-    return str(filename.parent)
+    return str(salida)
 
 # =============================================================================
 # FUNCIÓN PRINCIPAL 2: GENERADOR DE DATOS NUMÉRICOS (Formato Fortran)
 # =============================================================================
 
-def FasesDeLaLunaDatos(ano, dt):
+def FasesDeLaLunaDatos(ano, dt, salida=None):
     """
     Calcula las fases lunares y genera un archivo .dat con DATOS NUMÉRICOS PUROS.
     Mantiene estrictamente el formato de salida del código Fortran original:
     4 columnas de números float con ancho fijo (F14.5).
+
+    'salida' es un destino de utils/salida.py; si no se da, el fichero va a
+    data/almanaque_nautico/AAAA.
+
+    Retorna:
+        list: Las 64 fechas (UT) escritas en el fichero, en el mismo orden
+              (índice % 4 = fase, 0.0 = hueco), para reutilizarlas sin releer disco.
     """
     can = f"{ano:4d}"
-    
+
     # Array 'f' de tamaño 64 (equivalente a f(0:63) de Fortran)
-    f = [0.0] * 64
-    
-    PI = 4.0 * math.atan(1.0)
-    fi = [0.0, PI/2.0, PI, 3.0*PI/2.0] # Ángulos de fase
-    
-    dt = dt / 86400.0 # Segundos a días
-    
-    # Límites temporales
-    ut = fun.DiaJul(1, 12, ano - 1, 0.0)
-    utf = fun.DiaJul(31, 12, ano, 24.0)
-    tt = ut + dt
-    
-    # Fase inicial
-    qf = cual_fase(tt)
-    
-    # Ajuste de índice inicial: Rellenar con 0 si no empieza en Luna Nueva
-    if qf < 3:
-        for k in range(qf + 1):
-            f[k] = 0.0
-        i = qf
-    else:
-        i = -1
-        
-    err = 1.0e-5
-    i0 = 0
-    dif0 = 0.0
-    dif = 0.0
-    
-    # --- BUCLE DE CÁLCULO (Idéntico a la función anterior) ---
-    while ut < utf + 30.0:
-        qf = (qf + 1) % 4
-        ep = 0.5
-        min_iter = 0
-        
-        while ep > err:
-            min_iter += 1
-            tt, ep, dif = fase_newt(tt, ep, fi[qf], dif)
-            if min_iter > 9:
-                print(f' No converge tras {min_iter} iteraciones')
-                input("Presione Enter...")
-        
-        if min_iter > i0: i0 = min_iter
-        if dif > dif0: dif0 = dif
-        
-        ut = tt - dt
-        i += 1
-        
-        # Almacenar Fecha Juliana (número real) en el array
-        if i < 64:
-            f[i] = ut
-            
-        tt = ut + dt
+    f = fechas_fases(ano, dt)
 
     # --- ESCRITURA DEL ARCHIVO (Formato Fixed-Width Fortran) ---
     # Objetivo: Simular la instrucción Fortran: FORMAT(4(F14.5,2X))
     
-    ruta_proyecto = Path(__file__).resolve().parent.parent.parent.parent
-    # Nota: El nombre del archivo usa el patrón "Fases[Año].dat"
-    filename = ruta_proyecto / "data" / "almanaque_nautico" / f"{can}" / f"Fases{can}.dat"
+    if salida is None:
+        ruta_proyecto = Path(__file__).resolve().parent.parent.parent.parent
+        salida = SalidaDirectorio(ruta_proyecto / "data" / "almanaque_nautico" / f"{can}")
     
     try:
-        filename.parent.mkdir(parents=True, exist_ok=True)
-        with open(filename, 'w') as f_out:
+        # Nota: El nombre del archivo usa el patrón "Fases[Año].dat"
+        with salida.abrir(f"Fases{can}.dat") as f_out:
             
             # Procesamos de 4 en 4 para hacer 16 filas
             for k in range(16):
@@ -462,8 +874,14 @@ def FasesDeLaLunaDatos(ano, dt):
     except Exception as e:
         print(f"Error escribiendo archivo: {e}")
 
+    return f
+
 # Bloque de ejecución principal
 if __name__ == "__main__":
-    # Delta T aproximado para 2012: 69.18 segundos
-    FasesDeLaLunaDatos(2012, 69.18)  
-    FasesDeLaLunaLatex(2012, 69.18)
\ No newline at end of file
+    if "--catalogo" in sys.argv:
+        # Paso de construcción del catálogo de fases 1900-2100
+        print(f"Catálogo escrito en {construir_catalogo_fases()}")
+    else:
+        # Delta T aproximado para 2012: 69.18 segundos
+        FasesDeLaLunaDatos(2012, 69.18)  
+        FasesDeLaLunaLatex(2012, 69.18)
\ No newline at end of file
@@ -1,6 +1,13 @@
 import sys
+import os
+import json
+import hashlib
+import queue
 import tempfile
-import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
 from pathlib import Path
 
 # =============================================================================
@@ -38,11 +45,11 @@ if ruta_str not in sys.path:
 # =============================================================================
 #importamos las funciones necesarias de este mismo módulo
 try:
-    from pagEntera import UNAPAG
+    from pagEntera import calcular_pagina, formatear_pagina, formatear_latex, DatosPagina, VERSION_CALCULO
     from pagLatex import PagTexProcessor
 except ImportError:
     # Fallback por si acaso
-    from src.paginas_an.pagEntera import UNAPAG
+    from src.paginas_an.pagEntera import calcular_pagina, formatear_pagina, formatear_latex, DatosPagina, VERSION_CALCULO
     from src.paginas_an.pagLatex import PagTexProcessor
 
 try:
@@ -52,8 +59,220 @@ try:
 except ImportError as e:
     pass
 
+from utils.salida import SalidaDirectorio
+from utils.read_de440 import hash_efemerides
+
 # =============================================================================
-# 3. FUNCIONES
+# 3. CACHÉ DE DÍAS (DATOS NUMÉRICOS DE CADA PÁGINA)
+# =============================================================================
+# Cada día se guarda como JSON en cache/paginas_an/<ab>/<clave>.json (fuera de
+# /data, que la aplicación web borra en cada ejecución). La clave es el SHA-256
+# de (año, día, dt, hash del fichero de efemérides, VERSION_CALCULO), de modo
+# que un cambio de dt, de efemérides o del cálculo invalida la entrada y un
+# cambio sólo de formato la reutiliza.
+ruta_cache = ruta_Padre.parent.parent / "cache" / "paginas_an"
+
+"""""
+Cabecera: clave_cache_dia(anio: int, dia: int, dt: float, hash_eph: str = None) -> str
+Precondición: recibe el año, el día del año, el delta T y, opcionalmente, el hash
+              de las efemérides (si no se da, se calcula el de DE440_PATH)
+Postcondición: devuelve la clave (SHA-256 hexadecimal) de la entrada de caché del día
+"""""
+def clave_cache_dia(anio: int, dia: int, dt: float, hash_eph: str = None) -> str:
+    if hash_eph is None:
+        hash_eph = hash_efemerides()
+    ident = json.dumps([int(anio), int(dia), float(dt), hash_eph, VERSION_CALCULO])
+    return hashlib.sha256(ident.encode('utf-8')).hexdigest()
+
+
+def _ruta_cache_dia(clave: str, directorio: Path) -> Path:
+    return Path(directorio) / clave[:2] / f"{clave}.json"
+
+
+"""""
+Cabecera: leer_cache_dia(clave: str, directorio: Path = ruta_cache) -> DatosPagina | None
+Precondición: recibe la clave de un día
+Postcondición: devuelve los datos guardados o None si no existen o están dañados
+"""""
+def leer_cache_dia(clave: str, directorio: Path = ruta_cache):
+    ruta = _ruta_cache_dia(clave, directorio)
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f_cache:
+            return DatosPagina.desde_dict(json.load(f_cache))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+"""""
+Cabecera: guardar_cache_dia(clave: str, datos: DatosPagina, directorio: Path = ruta_cache)
+Precondición: recibe la clave de un día y sus datos numéricos
+Postcondición: guarda los datos de forma atómica (fichero temporal + os.replace),
+               así una ejecución interrumpida nunca deja una entrada a medias
+"""""
+def guardar_cache_dia(clave: str, datos: DatosPagina, directorio: Path = ruta_cache):
+    ruta = _ruta_cache_dia(clave, directorio)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, ruta_tmp = tempfile.mkstemp(dir=ruta.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f_tmp:
+            json.dump(datos.a_dict(), f_tmp)
+        os.replace(ruta_tmp, ruta)
+    except BaseException:
+        if os.path.exists(ruta_tmp):
+            os.remove(ruta_tmp)
+        raise
+
+
+"""""
+Cabecera: pagina_cacheada(dia: int, anio: int, dt: float, fases = None, directorio: Path = ruta_cache)
+Precondición: recibe el día del año, el año, el delta T y, opcionalmente, las fases
+              de la Luna del año (sólo se usan si hay que recalcular el día)
+Postcondición: devuelve (datos, desde_cache): los datos numéricos del día, leídos
+               de la caché si existen o calculados (y guardados) si no
+"""""
+def pagina_cacheada(dia: int, anio: int, dt: float, fases=None, directorio: Path = ruta_cache):
+    clave = clave_cache_dia(anio, dia, dt)
+    datos = leer_cache_dia(clave, directorio)
+    if datos is not None:
+        return datos, True
+
+    datos = calcular_pagina(dia, anio, dt, fases)
+    guardar_cache_dia(clave, datos, directorio)
+    return datos, False
+
+
+"""""
+Cabecera: _datos_dia(tarea: tuple) -> tuple
+Precondición: recibe (dia, anio, dt, fases, usar_cache)
+Postcondición: devuelve (dia, datos, desde_cache) con los datos numéricos del día.
+               Está a nivel de módulo para poder ejecutarse en otro proceso.
+"""""
+def _datos_dia(tarea: tuple) -> tuple:
+    dia, anio, dt, fases, usar_cache = tarea
+    if usar_cache:
+        datos, desde_cache = pagina_cacheada(dia, anio, dt, fases)
+    else:
+        datos, desde_cache = calcular_pagina(dia, anio, dt, fases), False
+    return dia, datos, desde_cache
+
+
+"""""
+Cabecera: datos_en_orden(anio: int, dt: float, fases, num_dias: int, usar_cache: bool = True, procesos: int = 1)
+Precondición: recibe el año, el delta T, las fases de la Luna del año, el número
+              de días y el número de procesos de cálculo
+Postcondición: generador que produce (dia, datos, desde_cache) para los días
+               1..num_dias, siempre en orden de día. Con procesos > 1 los días se
+               calculan en paralelo y ProcessPoolExecutor.map retiene los que
+               terminan antes de tiempo hasta que les toca salir.
+"""""
+def datos_en_orden(anio: int, dt: float, fases, num_dias: int, usar_cache: bool = True, procesos: int = 1):
+    tareas = [(dia, anio, dt, fases, usar_cache) for dia in range(1, num_dias + 1)]
+
+    if procesos <= 1:
+        for tarea in tareas:
+            yield _datos_dia(tarea)
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        yield from ejecutor.map(_datos_dia, tareas)
+
+
+# =============================================================================
+# 4. CANALIZACIÓN CÁLCULO -> ESCRITURA
+# =============================================================================
+# El cálculo de las páginas (productor) y su conversión a texto/LaTeX y escritura
+# en disco (consumidor) se solapan: el productor deja cada página terminada en
+# una cola acotada y un hilo escritor la formatea y la escribe mientras se
+# calcula la siguiente. La cola acotada limita las páginas en memoria.
+TAM_COLA_PAGINAS = 8
+
+#marca de fin de la cola
+_FIN_COLA = object()
+
+
+"""""
+Cabecera: canalizar(fuente, consumidor, tam_cola: int = TAM_COLA_PAGINAS, canalizado: bool = True) -> dict
+Precondición: recibe un iterable 'fuente' (productor) y una función 'consumidor'
+              que se llama con cada elemento, en el mismo orden
+Postcondición: consume toda la fuente y devuelve la utilización de cada etapa:
+               {'total': s, 'produccion': s, 'consumo': s, 'espera_cola': s}
+               con los segundos de reloj totales, los ocupados en cada etapa y los
+               que el productor pasó bloqueado por tener la cola llena.
+               Con canalizado=False las dos etapas se ejecutan seguidas en el
+               hilo actual (modo secuencial).
+               Un error del consumidor se relanza al terminar la fuente; la cola
+               se sigue vaciando para que el productor no quede bloqueado.
+"""""
+def canalizar(fuente, consumidor, tam_cola: int = TAM_COLA_PAGINAS, canalizado: bool = True) -> dict:
+    tiempos = {'total': 0.0, 'produccion': 0.0, 'consumo': 0.0, 'espera_cola': 0.0}
+    inicio = time.perf_counter()
+    fuente = iter(fuente)
+
+    def siguiente():
+        t0 = time.perf_counter()
+        try:
+            return next(fuente)
+        except StopIteration:
+            return _FIN_COLA
+        finally:
+            tiempos['produccion'] += time.perf_counter() - t0
+
+    def consume(elemento):
+        t0 = time.perf_counter()
+        consumidor(elemento)
+        tiempos['consumo'] += time.perf_counter() - t0
+
+    if not canalizado:
+        while (elemento := siguiente()) is not _FIN_COLA:
+            consume(elemento)
+        tiempos['total'] = time.perf_counter() - inicio
+        return tiempos
+
+    cola = queue.Queue(maxsize=tam_cola)
+    errores = []
+
+    def escritor():
+        while (elemento := cola.get()) is not _FIN_COLA:
+            if not errores:
+                try:
+                    consume(elemento)
+                except BaseException as e:
+                    errores.append(e)
+
+    hilo = threading.Thread(target=escritor, name="escritor_paginas", daemon=True)
+    hilo.start()
+    try:
+        while (elemento := siguiente()) is not _FIN_COLA and not errores:
+            t0 = time.perf_counter()
+            cola.put(elemento)
+            tiempos['espera_cola'] += time.perf_counter() - t0
+    finally:
+        cola.put(_FIN_COLA)
+        hilo.join()
+
+    if errores:
+        raise errores[0]
+
+    tiempos['total'] = time.perf_counter() - inicio
+    return tiempos
+
+
+"""""
+Cabecera: informe_utilizacion(tiempos: dict) -> str
+Precondición: recibe los tiempos que devuelve canalizar
+Postcondición: devuelve una línea con la utilización (% del tiempo total) de cada etapa
+"""""
+def informe_utilizacion(tiempos: dict) -> str:
+    total = tiempos['total'] or 1.0
+    return (f"Utilización de etapas ({tiempos['total']:.1f} s): "
+            f"cálculo {100 * tiempos['produccion'] / total:.0f}%, "
+            f"LaTeX/escritura {100 * tiempos['consumo'] / total:.0f}%, "
+            f"espera por cola llena {100 * tiempos['espera_cola'] / total:.0f}%")
+
+
+# =============================================================================
+# 5. FUNCIONES
 # =============================================================================
 
 """""
@@ -69,21 +288,122 @@ def IDIAAN(dia: int, mes: int, anio: int) -> int:
 
 
 """""
-Cabecera: generarFichero(anio: int, dt: int, opcion = 1)
-Precondición: recibe un año, un delta y una opción (por defecto, generar el año completo)
-Postcondición: genera el fichero final con todos los resultados
-
-OPTIMIZACIÓN CON FICHEROS TEMPORALES:
-- Cada día se escribe directamente a un fichero temporal individual
-- Se concatenan al final de forma eficiente usando shutil.copyfileobj
-- Memoria mínima: solo un día en RAM a la vez
-- I/O optimizado con buffering y escritura directa
+Cabecera: _fecha(fecha) -> date
+Precondición: recibe un datetime.date o una tupla (dia, mes, anio)
+Postcondición: devuelve el datetime.date equivalente
 """""
-def generarFichero(anio: int, dt: float, opcion: int = 1):
-    
-    # Inicializamos ruta_final para el return
-    ruta_final = Path("")
+def _fecha(fecha) -> date:
+    if isinstance(fecha, date):
+        return fecha
+    dia, mes, anio = fecha
+    return date(int(anio), int(mes), int(dia))
+
+
+"""""
+Cabecera: _iter_datos(start_date, n_days: int, dt: float, fases: dict = None)
+Precondición: los mismos parámetros que iter_pages.
+Postcondición: generador de tuplas (anio, dia_del_anio, datos) con el registro
+               DatosPagina de cada página, del que se generan todas sus salidas.
+"""""
+def _iter_datos(start_date, n_days: int, dt: float, fases: dict = None):
+    inicio = _fecha(start_date)
+    if fases is None:
+        fases = {}
+
+    for i in range(n_days):
+        dia = inicio + timedelta(days=i)
+        anio = dia.year
+
+        # Índice de fases del año: se calcula la primera vez que se necesita
+        if anio not in fases:
+            fases[anio] = faseLuna.fechas_fases(anio, dt)
 
+        diaAnio = dia.timetuple().tm_yday
+        yield anio, diaAnio, calcular_pagina(diaAnio, anio, dt, fases[anio])
+
+
+"""""
+Cabecera: iter_pages(start_date, n_days: int, dt: float, fases: dict = None)
+Precondición: recibe la fecha inicial (datetime.date o (dia, mes, anio)),
+              el número de días y el delta T (dt = TT - UT) en segundos.
+              'fases' es opcional: diccionario {anio: fases} ya calculado.
+Postcondición: generador que produce, día a día y sin pedir nada por consola,
+               tuplas (anio, dia_del_anio, contenido) con el texto de cada página.
+
+Las efemérides quedan cargadas una sola vez al importar pagEntera, y las fases
+de la Luna se calculan una vez por año tocado por el intervalo (el intervalo
+puede cruzar el fin de año) y se comparten entre todas sus páginas.
+"""""
+def iter_pages(start_date, n_days: int, dt: float, fases: dict = None):
+    for anio, diaAnio, datos in _iter_datos(start_date, n_days, dt, fases):
+        yield anio, diaAnio, formatear_pagina(datos)
+
+
+"""""
+Cabecera: escribir_paginas(start_date, n_days: int, dt: float, salida, latex: bool = False)
+Precondición: recibe el intervalo (como iter_pages) y un flujo de texto abierto
+              ('salida', cualquier objeto con write) o la ruta de un fichero.
+Postcondición: escribe en 'salida', una tras otra, todas las páginas del intervalo
+               (texto .dat o, si latex=True, su conversión LaTeX separada por una
+               línea en blanco, como en AN{anio}COMLatex.dat).
+               Devuelve el número de páginas escritas.
+"""""
+def escribir_paginas(start_date, n_days: int, dt: float, salida, latex: bool = False) -> int:
+    if isinstance(salida, (str, Path)):
+        with open(salida, 'w', encoding='latin-1' if latex else 'utf-8') as f_out:
+            return escribir_paginas(start_date, n_days, dt, f_out, latex)
+
+    # Las dos salidas se generan del registro numérico de cada página
+    procLatex = PagTexProcessor() if latex else None
+    n = 0
+    for _, _, datos in _iter_datos(start_date, n_days, dt):
+        if latex:
+            salida.write(formatear_latex(datos, procLatex))
+            salida.write("\n")
+        else:
+            salida.write(formatear_pagina(datos))
+        n += 1
+    return n
+
+
+"""""
+Cabecera: generarFichero(anio: int, dt: int, opcion = 1, fecha = None, n_dias = None, usar_cache = True,
+                         latex_por_dia = False, procesos = 1, canalizado = True, salida = None)
+Precondición: recibe un año, un delta y una opción (por defecto, generar el año completo).
+              Para las opciones 2 (un día) y 3 (intervalo) se puede pasar la fecha
+              (datetime.date o (dia, mes, anio)) y el número de días; si no se pasan,
+              se piden por consola.
+Postcondición: genera el fichero final con todos los resultados y devuelve,
+               como cadena, el directorio (o ZIP) de salida
+
+DESTINO DE SALIDA:
+- 'salida' es un destino de utils/salida.py (SalidaDirectorio o SalidaZip);
+  si no se da, se escribe en data/almanaque_nautico/{anio} como siempre
+
+CACHÉ DE DÍAS (opción 1):
+- Los datos numéricos de cada día se guardan en la caché de días (ver arriba)
+- Sólo se recalculan los días que faltan o cuya clave ha cambiado; el formato
+  (.dat y LaTeX) se vuelve a generar siempre a partir de los números
+- usar_cache=False recalcula todos los días sin leer ni escribir la caché
+
+ESCRITURA EN FLUJO (opción 1):
+- Cada página se añade a AN{anio}COM.dat y AN{anio}COMLatex.dat en cuanto se
+  produce, sin ficheros temporales ni segunda copia de los datos
+- Memoria acotada: sólo los días de la cola de escritura (TAM_COLA_PAGINAS) y
+  los que esperan turno si se usan varios procesos
+- procesos > 1 reparte los días entre varios procesos; las páginas se siguen
+  escribiendo en orden de día (ver datos_en_orden)
+- latex_por_dia=True escribe además el LaTeX de cada día en latex/AN{anio}{dia}.dat
+
+CANALIZACIÓN (opción 1):
+- canalizado=True (por defecto) solapa el cálculo con el formato LaTeX y la
+  escritura, que hace un hilo escritor alimentado por una cola acotada (ver
+  canalizar); canalizado=False ejecuta las dos etapas seguidas
+- Al terminar se informa de la utilización de cada etapa
+"""""
+def generarFichero(anio: int, dt: float, opcion: int = 1, fecha=None, n_dias: int = None, usar_cache: bool = True,
+                   latex_por_dia: bool = False, procesos: int = 1, canalizado: bool = True, salida=None):
+    
     #comprobamos la opción elegida por el usuario
     while True:
         try:
@@ -102,155 +422,103 @@ def generarFichero(anio: int, dt: float, opcion: int = 1):
     match opcion:
         case 1:     #Quiere prepararlo en un año en concreto
 
-            ruta_final = ruta_datos / str(anio)
-            
-            # --- Crear directorios si no existen ---
-            ruta_final.mkdir(parents=True, exist_ok=True)
-            ruta_latex = ruta_final / "latex"
-            ruta_latex.mkdir(parents=True, exist_ok=True)
+            # --- Destino de los ficheros (por defecto, el directorio del año) ---
+            if salida is None:
+                salida = SalidaDirectorio(ruta_datos / str(anio))
 
-            #calculamos el .dat de fases de la luna
-            faseLuna.FasesDeLaLunaDatos(anio, dt)
+            #calculamos el .dat de fases de la luna (y nos quedamos con las fechas)
+            fases = faseLuna.FasesDeLaLunaDatos(anio, dt, salida=salida)
 
-            #preparamos el fichero final
+            #preparamos los ficheros finales
             canio = f"{anio:04d}"   #ponemos el año en formato de 4 dígitos
-            ComDat = ruta_final / f"AN{canio}COM.dat"
-
-            # Crear directorio temporal para ficheros intermedios
-            temp_dir = tempfile.mkdtemp(prefix=f"AN{anio}_")
-            temp_path = Path(temp_dir)
-            
-            try:
-                num_dias = 366
-                
-                # Instanciamos el procesador LaTeX UNA sola vez (reutilizable)
-                procLatex = PagTexProcessor()
-                
-                print(f"Iniciando procesamiento secuencial optimizado para {num_dias} días...")
-                print(f"Directorio temporal: {temp_dir}")
-                
-                # =============================================================
-                # FASE 1: Generar cada día y escribir a fichero temporal
-                # =============================================================
-                for dia in range(1, num_dias + 1):
-                    # Generar contenido del día (en memoria, un día a la vez)
-                    pag_content = UNAPAG(dia, anio, dt, return_content=True)
-                    
-                    # Escribir a fichero temporal inmediatamente (libera memoria)
-                    temp_file = temp_path / f"day_{dia:03d}.tmp"
-                    with open(temp_file, 'w', encoding='utf-8') as f_tmp:
-                        f_tmp.write(pag_content)
-                    
-                    # Procesar LaTeX
-                    if dia < 100: 
-                        nombre_fich = f"AN{anio}{dia:02d}.dat"
-                    else:       
-                        nombre_fich = f"AN{anio}{dia:03d}.dat"
-                    
-                    path_latex_out = ruta_latex / nombre_fich
-                    procLatex.pagtex_bis(dia, anio, input_content=pag_content, output_path=path_latex_out)
-                    
-                    # Progreso cada 50 días
-                    if dia % 50 == 0:
-                        print(f"  Procesados {dia}/{num_dias} días...")
-                
-                print("Fase 1 completada: Todos los días generados.")
-                
-                # =============================================================
-                # FASE 2: Concatenar ficheros temporales al archivo final
-                # Usamos shutil.copyfileobj para eficiencia máxima en I/O
-                # =============================================================
-                print("Fase 2: Concatenando ficheros temporales...")
-                
-                with open(ComDat, 'wb') as f_out:  # Modo binario para copyfileobj
-                    for dia in range(1, num_dias + 1):
-                        temp_file = temp_path / f"day_{dia:03d}.tmp"
-                        if temp_file.exists():
-                            with open(temp_file, 'rb') as f_tmp:
-                                shutil.copyfileobj(f_tmp, f_out, length=65536)  # Buffer 64KB
-                        else:
-                            print(f"Error: Falta el fichero temporal del día {dia}")
-                
-                print("Generación de archivo de año completo finalizada.")
-
-                # =============================================================
-                # FASE 3: Fusionar todos los LaTeX en un archivo combinado
-                # =============================================================
-                latex_completo = ruta_final / f"AN{anio}COMLatex.dat"
-                with open(latex_completo, 'wb') as f_latex:
-                    for j in range(1, num_dias + 1):
-                        if j < 100: 
-                            nombre_latex = f"AN{anio}{j:02d}.dat"
-                        else:       
-                            nombre_latex = f"AN{anio}{j:03d}.dat"
-                        latex_file = ruta_latex / nombre_latex
-                        if latex_file.exists():
-                            with open(latex_file, 'rb') as f_src:
-                                shutil.copyfileobj(f_src, f_latex, length=65536)
-                            f_latex.write(b"\n")
-                            
-                print(f"LaTeX combinado generado: {latex_completo}")
-
-            except IOError as e:
-                print(f"Error fatal al abrir el archivo {ComDat}: {e}")
-                return
-            finally:
-                # Limpiar directorio temporal siempre
-                if temp_path.exists():
-                    shutil.rmtree(temp_path, ignore_errors=True)
-                    print(f"Directorio temporal eliminado: {temp_dir}")
-
-        case 2:     #Quiere prepararlo en un día en concreto
+            ComDat = f"AN{canio}COM.dat"
+            latex_completo = f"AN{anio}COMLatex.dat"
 
-            try:
-                fecha = input("Escriba día (dd), mes (mm) y año(aaaa) [separado por comas o espacios]: ")
-                datos = fecha.replace(',',' ').split()
-
-                dia = int(datos[0])
-                mes = int(datos[1])
-                anio = int(datos[2])
-
-                dt = int(input("Introduzca dt (dt = TT - UT): "))
-            except (ValueError, IndexError):
-                print("Error: formato de fecha o dt incorrecto")
-                return
-
-            #calculamos el .dat de fases de la luna
-            faseLuna.FasesDeLaLunaDatos(anio, dt)
+            num_dias = 366
 
-            #obtenemos el dia del año concreto
-            diaAnio = IDIAAN(dia,mes,anio)
+            # Instanciamos el procesador LaTeX UNA sola vez (reutilizable)
+            procLatex = PagTexProcessor()
 
-            #creamos la página del día establecido, esta queda generada en PAG.DAT
-            UNAPAG(diaAnio, anio, dt)          
+            print(f"Iniciando procesamiento de {num_dias} días ({procesos} proceso(s))...")
+            dias_cache = 0
 
-        case 3:     #quiere prepararlo en un intervalo en concreto
             try:
-                fecha = input("Fecha inicial (dd,mm,aaaa) [separado por comas o espacios]: ")
-                datos = fecha.replace(',',' ').split()
+                with salida.abrir(ComDat, encoding='utf-8') as f_com, \
+                     salida.abrir(latex_completo, encoding='latin-1') as f_latex:
+
+                    # Etapa de escritura (hilo escritor si canalizado=True):
+                    # cada página llega en orden de día y se añade a los dos ficheros
+                    def escribir_dia(elemento):
+                        dia, datos, _ = elemento
+                        f_com.write(formatear_pagina(datos))
+
+                        # LaTeX generado del mismo registro (en memoria, un día a la vez)
+                        texto_latex = formatear_latex(datos, procLatex)
+                        f_latex.write(texto_latex)
+                        f_latex.write("\n")
+
+                        # Fichero LaTeX individual del día (opcional)
+                        if latex_por_dia:
+                            if dia < 100: 
+                                nombre_fich = f"AN{anio}{dia:02d}.dat"
+                            else:       
+                                nombre_fich = f"AN{anio}{dia:03d}.dat"
+                            with salida.abrir(f"latex/{nombre_fich}", encoding='latin-1') as f_dia:
+                                f_dia.write(texto_latex)
+
+                        # Progreso cada 50 días
+                        if dia % 50 == 0:
+                            print(f"  Procesados {dia}/{num_dias} días...")
+
+                    # Etapa de cálculo: días en orden (de la caché o calculados)
+                    def calcular_dias():
+                        nonlocal dias_cache
+                        for elemento in datos_en_orden(anio, dt, fases, num_dias, usar_cache, procesos):
+                            dias_cache += elemento[2]
+                            yield elemento
+
+                    tiempos = canalizar(calcular_dias(), escribir_dia, canalizado=canalizado)
 
-                diaIni = int(datos[0])
-                mesIni = int(datos[1])
-                anioIni = int(datos[2])
+                print("Generación de archivo de año completo finalizada.")
+                if usar_cache:
+                    print(f"  Días leídos de la caché: {dias_cache}, recalculados: {num_dias - dias_cache}")
+                print(f"  {informe_utilizacion(tiempos)}")
+                print(f"LaTeX combinado generado: {salida.ruta(latex_completo)}")
 
-                nDias = int(input("Número de días: "))
-                dt = int(input("Introduzca dt (dt = TT - UT): "))
-            except (ValueError, IndexError):
-                print("Error: formato de fecha incorrecto o datos incorrectos.")
+            except IOError as e:
+                print(f"Error fatal al abrir el archivo {ComDat}: {e}")
                 return
 
-            #calculamos el .dat de fases de la luna
-            faseLuna.FasesDeLaLunaDatos(anioIni, dt)
-
-            #obtenemos el dia del año concreto de la fecha inicial
-            diaAnIni = IDIAAN(diaIni, mesIni, anioIni)
-
-            #vamos generando las páginas del intervalo dado por el usuario
-            for i in range(nDias):
-                diaActual = diaAnIni + i
-                UNAPAG(diaActual, anioIni, dt)     #generamos la página
-
-    return str(ruta_final)      #devolvemos en formato de cadena, la ruta del directorio de nuestro fichero latex
+        case 2 | 3:     #Quiere prepararlo en un día o en un intervalo concreto
+
+            #si no se ha indicado la fecha, se pregunta por consola (uso interactivo)
+            if fecha is None:
+                try:
+                    if opcion == 2:
+                        texto = input("Escriba día (dd), mes (mm) y año(aaaa) [separado por comas o espacios]: ")
+                    else:
+                        texto = input("Fecha inicial (dd,mm,aaaa) [separado por comas o espacios]: ")
+                    datos = texto.replace(',',' ').split()
+                    fecha = (int(datos[0]), int(datos[1]), int(datos[2]))
+
+                    if opcion == 3:
+                        n_dias = int(input("Número de días: "))
+                    dt = int(input("Introduzca dt (dt = TT - UT): "))
+                except (ValueError, IndexError):
+                    print("Error: formato de fecha incorrecto o datos incorrectos.")
+                    return
+
+            if opcion == 2 or n_dias is None:
+                n_dias = 1
+
+            #todas las páginas del intervalo van seguidas a PAG.dat del año inicial
+            inicio = _fecha(fecha)
+            if salida is None:
+                salida = SalidaDirectorio(ruta_datos / str(inicio.year))
+            with salida.abrir("PAG.dat", encoding='utf-8') as f_pag:
+                escribir_paginas(inicio, n_dias, dt, f_pag)
+
+    return str(salida)      #devolvemos en formato de cadena, la ruta del directorio de nuestro fichero latex
 
 """
 if __name__ == "__main__": 
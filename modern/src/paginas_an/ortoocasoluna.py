@@ -40,6 +40,10 @@ AU_KM = 149597870.7    # Unidad Astronómica en km
 RET_AU_RATIO = RET_KM / AU_KM
 REL_AU_RATIO = REL_KM / AU_KM
 
+# Distancia cenital del fenómeno lunar: 90° 34' en radianes
+# (radio geométrico 90° + refracción atmosférica estándar 34').
+DZ0_LUNA = 1.580686525889531153
+
 # =============================================================================
 # FUNCIONES AUXILIARES DE CÁLCULO
 # =============================================================================
@@ -184,7 +188,7 @@ def fenoluna(dj, lat_deg, fen='ort', lon_deg=0.0):
     
     # dz0 = 90° 34' en radianes
     # Esto incluye el radio geométrico (90) + refracción atmosférica estándar (34')
-    dz0 = 1.580686525889531153 
+    dz0 = DZ0_LUNA
     
     # Dirección del fenómeno para detectar cruces:
     # Orto (-1): Altura aumenta, distancia cenital disminuye.
@@ -1,5 +1,6 @@
 import numpy as np
 import sys
+from dataclasses import dataclass, asdict
 from pathlib import Path
 from skyfield.api import load
 from skyfield.magnitudelib import planetary_magnitude
@@ -51,6 +52,7 @@ from subAN import *
 from constants import *
 from ortoocasoluna import fenoluna #, retardo_lunar_R (comentado en original)
 from ortoocasol import fenosol
+from pagLatex import PagTexProcessor, CamposLatex, TABLA_ARRIBA, TABLA_ABAJO
 
 """""
 Por último, importamos la carpeta padre en el sys.path.
@@ -60,6 +62,8 @@ Se transforma a string ya que sys.path espera una lista de strings, no objetos P
 if str(ruta_Padre) not in sys.path:
     sys.path.append(str(ruta_Padre))
 
+from fase_luna import faseLuna
+
 
 # =============================================================================
 # CARGA DE EFEMÉRIDES Y CONSTANTES
@@ -357,372 +361,651 @@ def Mag_visual(jd_tt, cuerpo):
 # FUNCIÓN PRINCIPAL DE GENERACIÓN DE PÁGINA
 # =============================================================================
 
-def UNAPAG(da, annio, dt, return_content=False):
+def leer_fases(annio):
     """
-    Genera una página completa del Almanaque Náutico (fichero .dat formateado).
-    
+    Lee las fechas de las fases del fichero Fases{annio}.dat generado por
+    'faseLuna.FasesDeLaLunaDatos' (16 filas de 4 valores, índice % 4 = fase).
+
+    Returns:
+        list | None: Lista de Días Julianos (0.0 = hueco), o None si no existe.
+    """
+    can = f"{annio:04d}"
+    fichero_fases = ruta_data / "data" / "almanaque_nautico" / f"{can}" / f"Fases{can}.dat"
+    try:
+        if fichero_fases.exists():
+            return [float(x) for x in fichero_fases.read_text().split()]
+    except (OSError, ValueError):
+        pass
+    return None
+
+def calcular_edad_luna(jd, fases):
+    """
+    Calcula la Edad de la Luna (días desde la última Luna Nueva).
+
+    Args:
+        jd (float): Día Juliano del día de la página.
+        fases (list): Fechas de las fases como las devuelve 'leer_fases'
+                      o 'faseLuna.FasesDeLaLunaDatos' (índice % 4 == 0 es Luna Nueva).
+
+    Returns:
+        float: Edad en días; 0.0 si no hay fases o ninguna Luna Nueva previa.
+    """
+    if not fases:
+        return 0.0
+
+    ult_fase = 0.0
+    for idx, v in enumerate(fases):
+        # Buscamos la última fase (Luna Nueva) ocurrida antes o en el día actual
+        if v > 0 and v > jd:
+            break # Paramos al encontrar una fecha futura
+
+        if v > 0 and (idx % 4 == 0): # idx % 4 == 0 implica Luna Nueva
+            ult_fase = v
+
+    if ult_fase > 0:
+        return jd - ult_fase
+    return 0.0
+
+# =============================================================================
+# DATOS NUMÉRICOS DE UNA PÁGINA (CÁLCULO SEPARADO DEL FORMATO)
+# =============================================================================
+
+# Versión del cálculo numérico de las páginas. Forma parte de la clave de la
+# caché de días de 'fichDatAN': hay que incrementarla cuando cambie cualquier
+# resultado de 'calcular_pagina' (no cuando sólo cambia el formato de texto).
+VERSION_CALCULO = 1
+
+# Orden de los planetas en la parte inferior de la página
+CUERPOS_ORDEN = ['ven', 'mar', 'jup', 'sat']
+
+# Valor constante para interpolación "v" de la Luna (minutos por hora)
+CONST_MOV_MEDIO_LUNA_MIN = 859.0
+
+
+@dataclass(slots=True)
+class DatosPagina:
+    """
+    Magnitudes numéricas de una página del Almanaque, tal como salen del cálculo
+    y antes de cualquier redondeo de presentación. Todas las listas son de
+    floats nativos, de modo que el registro se serializa a JSON sin pérdida.
+
+    Es el registro intermedio del que se generan todas las salidas de la página
+    ('formatear_pagina' para el .dat y 'formatear_latex' para LaTeX).
+    """
+    da: int                 # Día del año (1-366)
+    annio: int              # Año
+    jd: float               # Día Juliano base de la página
+    dia: int                # Fecha de la cabecera
+    mes: int
+    anomas: int
+    dia_sem: int            # 0 = Lunes ... 6 = Domingo
+    pmg_sol: float          # Horas decimales
+    sd_sol: float           # Minutos de arco
+    sd_lun: float
+    edad_luna: float        # Días
+    pmg_lun: float
+    phe: list               # PHE de la Luna a las 4, 12 y 20 h
+    pmg_lun_sig: float      # PMG de la Luna del día siguiente
+    gha_sol: list           # 25 valores horarios (grados)
+    dec_sol: list
+    gha_lun: list
+    dec_lun: list
+    fen_sol: list           # 25 latitudes x 3 fenómenos solares de la página
+    fen_lun_hoy: list       # 25 latitudes x (orto, ocaso) de hoy
+    fen_lun_man: list       # 25 latitudes x (orto, ocaso) de mañana
+    pmg_ari: float
+    pmg_pla: list           # PMG de Venus, Marte, Júpiter y Saturno
+    mag_pla: list           # Magnitudes visuales
+    gha_ari: list           # 25 valores horarios
+    gha_pla: list           # 4 planetas x 25 valores
+    dec_pla: list
+    dif_pla: list           # 4 planetas x (gha 0h, dec 0h, gha 24h, dec 24h)
+
+    def a_dict(self):
+        """Devuelve el registro como diccionario serializable (JSON)."""
+        return asdict(self)
+
+    @classmethod
+    def desde_dict(cls, d):
+        """Reconstruye el registro a partir de 'a_dict'."""
+        return cls(**d)
+
+
+def calcular_pagina(da, annio, dt, fases=None):
+    """
+    Calcula todas las magnitudes numéricas de una página (sin formatear).
+
     Args:
         da (int): Día del Año (1-365/366).
         annio (int): Año.
         dt (float): Delta T (diferencia TT - UT1).
-        return_content (bool): Si es True, devuelve el string en lugar de escribir a disco.
+        fases (list): Fechas de las fases lunares del año ya calculadas
+                      (ver 'calcular_edad_luna'). Si es None se leen de Fases{annio}.dat
+                      o, si no existe, del catálogo de fases ('faseLuna.edad_luna').
+
+    Returns:
+        DatosPagina: Registro con los valores de la página.
     """
-    import io
     print(f"Generando página para el día {da} de {annio} (Delta: {dt})...")
 
     # Cálculo del Día Juliano base
     jd0_annio = funciones.DiaJul(1,1,annio,0.0)
     jd  = jd0_annio + (da - 1)
 
-    can = f"{annio:04d}" # Cadena año
-
     # --- Cabecera ---
     dia, mes, anomas, _ = funciones.DJADia(jd + 1)
-    nombre_mes = MesANom(mes)
-    nombre_dia_sem = num_a_dia[DiaSem(jd)]
 
-    # Ruta de salida
-    fichero_salida = ruta_data / "data" / "almanaque_nautico" / f"{annio}" / "PAG.dat"
-    fichero_salida.parent.mkdir(parents=True, exist_ok=True)
+    # --- Datos Diarios del SOL ---
+    pmg_sol = Paso_Mer(jd, 'sol', dt)
+
+    t_mediodia = ts.tt_jd(jd + 0.5 + dt/86400.0)
+    _, _, dist_sol = cal_coord_ap('sol', t_mediodia)
+    sd_sol = calc_sd_sol(dist_sol)
+
+    # --- Datos Diarios de la LUNA ---
+    _, _, dist_lun = cal_coord_ap('lun', t_mediodia)
+    sd_lun = calc_sd_luna(dist_lun)
+
+    # Cálculo de la Edad de la Luna (días desde Luna Nueva)
+    if fases is None:
+        fases = leer_fases(annio)
+    if fases is not None:
+        edad_luna = calcular_edad_luna(jd, fases)
+    else:
+        # Sin fichero Fases: consulta en el catálogo precalculado de fases
+        edad_luna = faseLuna.edad_luna(jd, dt)
+        if edad_luna is None:
+            print("Aviso: no existe fichero Fases ni catálogo de fases, edad_luna = 0")
+            edad_luna = 0.0
+
+    # PMG de la Luna
+    pmg_lun = Paso_Mer(jd, 'lun', dt)
+
+    # PHE de la Luna (Paralaje Horizontal Ecuatorial) - calculado cada 8 horas
+    phe = []
+    for i in range(4, 21, 8):
+        t_phe = ts.tt_jd(jd + i/24.0 + dt/86400.0)
+        _, _, d_phe = cal_coord_ap('lun', t_phe)
+        phe.append(float(calc_phe_luna(d_phe)))
+
+    # PMG de la Luna del día siguiente (para el retardo)
+    pmg_lun_sig = Paso_Mer(jd + 1.0, 'lun', dt)
+
+    # ----------------------------------------------------------------------------------
+    # SECCIÓN VECTORIZADA (SOL Y LUNA)
+    # ----------------------------------------------------------------------------------
+    # Aquí optimizamos el rendimiento calculando las 24 horas (indices 0-24) de una sola vez
+    # usando arrays de NumPy en lugar de un bucle "for" convencional para las llamadas a Skyfield.
+
+    # 1. Crear vector de tiempos (0..24 horas)
+    horas_vec = np.arange(25)
+    t_vec_main = ts.tt_jd(jd + horas_vec/24.0)
+
+    # 2. Calcular SOL para las 25 horas
+    ast_sol_vec = tierra.at(t_vec_main).observe(sol).apparent()
+    ra_sol_vec, dec_sol_vec, _ = ast_sol_vec.radec(epoch='date')
+
+    # Cálculo vectorizado del GHA: (GAST - RA) % 360
+    gh_sol_deg_arr = (t_vec_main.gast * 15.0 - ra_sol_vec.hours * 15.0) % 360.0
+    dec_sol_deg_arr = dec_sol_vec.degrees
+
+    # 3. Calcular LUNA para las 25 horas
+    ast_lun_vec = tierra.at(t_vec_main).observe(luna).apparent()
+    ra_lun_vec, dec_lun_vec, _ = ast_lun_vec.radec(epoch='date')
+
+    gh_lun_deg_arr = (t_vec_main.gast * 15.0 - ra_lun_vec.hours * 15.0) % 360.0
+    dec_lun_deg_arr = dec_lun_vec.degrees
+
+    # ----------------------------------------------------------------------------------
+    # OPTIMIZACIÓN: CACHE DE FENÓMENOS (ORTOS/OCASOS)
+    # ----------------------------------------------------------------------------------
+    # Pre-calculamos todos los eventos (salidas, puestas, crepúsculos) antes de imprimir
+    # las filas. Esto evita recalcular la geometría solar/lunar cientos de veces.
+    eventos_sol = eventos_sol_pagina(da)
+
+    fen_sol = [[fenosol(jd, lat_val, evt) for evt in eventos_sol] for lat_val in LATITUDES_VAL]
+
+    # Fenómenos LUNARES (Hoy y Mañana para cálculo de retraso)
+    fen_lun_hoy = []
+    fen_lun_man = []
+    for lat_val in LATITUDES_VAL:
+        fen_lun_hoy.append([fenoluna(jd, lat_val, evt) for evt in ['ort', 'oca']])
+        fen_lun_man.append([fenoluna(jd + 1, lat_val, evt) for evt in ['ort', 'oca']])
+
+    # --- PIE DE PÁGINA (Planetas y Aries) ---
+    pmg_ari = Paso_Mer(jd, 'ari', dt)
+    pmg_pla = [Paso_Mer(jd, k, dt) for k in CUERPOS_ORDEN]
+    mag_pla = [Mag_visual(jd + 0.5, k) for k in CUERPOS_ORDEN]
+
+    # ----------------------------------------------------------------------------------
+    # SECCIÓN VECTORIZADA (PLANETAS)
+    # ----------------------------------------------------------------------------------
+    # Similar a la sección Sol/Luna, pero usando UT1 para precisión
+    t_vec_planets = ts.ut1_jd(jd + horas_vec/24.0)
+
+    # 1. Calcular Aries Vectorizado
+    gh_ari_arr = (t_vec_planets.gast * 15.0) % 360.0
+
+    # 2. Pre-calcular posiciones de planetas
+    gha_pla = []
+    dec_pla = []
+    for k in CUERPOS_ORDEN:
+        ast_p = tierra.at(t_vec_planets).observe(plan_dic[k]).apparent()
+        ra_p, dec_p, _ = ast_p.radec(epoch='date')
+
+        # GHA = GAST - RA
+        gha_pla.append(((t_vec_planets.gast * 15.0 - ra_p.hours * 15.0) % 360.0).tolist())
+        dec_pla.append(dec_p.degrees.tolist())
+
+    # --- Bloque de Diferencias (posición a 0h y 24h de cada planeta) ---
+    dif_pla = []
+    for k in CUERPOS_ORDEN:
+        t0, t1 = ts.ut1_jd(jd), ts.ut1_jd(jd + 1.0)
+        gha0, dec0, _ = cal_coord_ap(k, t0)
+        gha1, dec1, _ = cal_coord_ap(k, t1)
+        dif_pla.append([float(gha0), float(dec0), float(gha1), float(dec1)])
+
+    return DatosPagina(
+        da=int(da), annio=int(annio), jd=float(jd),
+        dia=dia, mes=mes, anomas=anomas, dia_sem=DiaSem(jd),
+        pmg_sol=float(pmg_sol), sd_sol=float(sd_sol), sd_lun=float(sd_lun),
+        edad_luna=float(edad_luna), pmg_lun=float(pmg_lun), phe=phe,
+        pmg_lun_sig=float(pmg_lun_sig),
+        gha_sol=gh_sol_deg_arr.tolist(), dec_sol=dec_sol_deg_arr.tolist(),
+        gha_lun=gh_lun_deg_arr.tolist(), dec_lun=dec_lun_deg_arr.tolist(),
+        fen_sol=[[float(h) for h in fila] for fila in fen_sol],
+        fen_lun_hoy=[[_a_float(h) for h in fila] for fila in fen_lun_hoy],
+        fen_lun_man=[[_a_float(h) for h in fila] for fila in fen_lun_man],
+        pmg_ari=float(pmg_ari),
+        pmg_pla=[float(h) for h in pmg_pla], mag_pla=[float(m) for m in mag_pla],
+        gha_ari=gh_ari_arr.tolist(), gha_pla=gha_pla, dec_pla=dec_pla,
+        dif_pla=dif_pla,
+    )
+
+
+def _a_float(valor):
+    """Convierte a float nativo conservando None (fenómeno no calculado)."""
+    return None if valor is None else float(valor)
+
+
+def eventos_sol_pagina(da):
+    """
+    Fenómenos solares que muestra la página según sea par (0) o impar (1):
+    principio de crepúsculos y orto, u ocaso y fin de crepúsculos.
+    """
+    if (da + 1) % 2 == 0:
+        return ['pcn', 'pcc', 'ort'] # Principio Crepúsculo Nautico/Civil, Orto
+    return ['oca', 'fcc', 'fcn'] # Ocaso, Fin Crepúsculo Civil/Nautico
+
+
+def _titulo(datos):
+    """Línea de título de la página: día de la semana y fecha."""
+    nombre_mes = MesANom(datos.mes)
+    nombre_dia_sem = num_a_dia[datos.dia_sem]
+    return f" {nombre_dia_sem:>9}   {datos.dia}  de  {nombre_mes}  de  {datos.anomas}"
+
+
+def _pmg_sol(datos):
+    """PMG del Sol como (horas, minutos decimales), sin minutos que redondeen a 60."""
+    h, mi = HOMI(datos.pmg_sol)
+
+    # Ajuste visual si el minuto se redondea a 60
+    if mi >= 59.95:
+        mi = 0.0
+        h += 1
+    return h, mi
+
+
+def _indice_fase(edad_luna):
+    """Índice (0-11) de la imagen de la fase lunar para una edad en días."""
+    nfl = int((edad_luna * 10 - 13) / 24) + 1
+    return nfl % 12
+
+
+def _retardo_pmg(datos):
+    """Retardo del paso de la Luna (diferencia con el día siguiente), en minutos."""
+    return ROUND(60.0 * datos.pmg_lun_sig) - ROUND(60.0 * datos.pmg_lun)
+
+
+def _variaciones_luna(datos, i):
+    """
+    Variaciones horarias 'v' y 'd' de la Luna entre las horas i-1 e i (i > 0),
+    en décimas de minuto.
+    """
+    # Cálculo de 'v' (variación del GHA)
+    diff_gha = datos.gha_lun[i] - datos.gha_lun[i-1]
+    if diff_gha < -180.0: diff_gha += 360.0 # Corrección por salto de día (360 -> 0)
+
+    diff_mins = diff_gha * 60.0
+    v_float = (diff_mins - CONST_MOV_MEDIO_LUNA_MIN) * 10.0
+
+    # Cálculo de 'd' (variación de declinación)
+    diff_dec = abs(datos.dec_lun[i] - datos.dec_lun[i-1])
+    d_float = diff_dec * 60.0 * 10.0
+    return int(round(v_float)), int(round(d_float))
+
+
+def _texto_fenomenos(datos, i):
+    """
+    Fenómenos de la fila 'i' (latitud LATITUDES_STR[i]): horas y minutos de los
+    tres fenómenos solares y orto/ocaso de la Luna con su retardo. Las horas sin
+    fenómeno (9999) ensanchan el texto, como en el .dat original.
+    """
+    # Sol
+    vals_sol = []
+    for hora_raw in datos.fen_sol[i]:
+        h_entera, m_entera = HOMIEN(hora_raw)
+        vals_sol.extend([h_entera, m_entera])
+
+    # Luna
+    vals_lun = []
+    for today, maniana in zip(datos.fen_lun_hoy[i], datos.fen_lun_man[i]):
+        h_entera, m_entera = HOMIEN(today)
+
+        # Cálculo del retardo lunar (diferencia entre mañana y hoy)
+        if maniana is None or today is None:
+            ret_val = 9999
+        else:
+            ret_val = ROUND(maniana * 60) - ROUND(today * 60)
+        vals_lun.extend([h_entera, m_entera, int(ret_val)])
+
+    s_fen_sol = f"{vals_sol[0]:2d} {vals_sol[1]:2d}  {vals_sol[2]:2d} {vals_sol[3]:2d}  {vals_sol[4]:2d} {vals_sol[5]:2d}"
+    s_fen_lun = f"{vals_lun[0]:2d} {vals_lun[1]:2d} {vals_lun[2]:3d}  {vals_lun[3]:2d} {vals_lun[4]:2d} {vals_lun[5]:3d}"
+    return f"{s_fen_sol}  {s_fen_lun}"
+
+
+def _linea_dif(datos):
+    """
+    Línea 'DIF' de la página: cuánto varían el GHA y la Dec de cada planeta en
+    24 horas (décimas de minuto por hora), como ayuda de interpolación.
+    """
+    dif_str = "DIF         "
+    for gha0, dec0, gha1, dec1 in datos.dif_pla:
+        d_gha = gha1 - gha0
+        if d_gha < -180:
+            d_gha += 360 # Normalización del giro
+
+        val_h = (d_gha * 60.0 * 10.0) /24.0
+        if abs(val_h) > 4500:
+            val_h -= np.sign(val_h) * 9000
+
+        sh, ah = SIGENT(ROUND(val_h))
+
+        d_dec = dec1 - dec0
+        val_d = (d_dec * 60.0 * 10.0) / 24.0
+        sd, ad = SIGENT(ROUND(val_d))
+
+        dif_str += f"      {sh} {ah:2d}      {sd} {ad:2d}"
+    return dif_str
+
+
+def lineas_pagina(datos):
+    """
+    Formatea un registro 'DatosPagina' a las líneas de ancho fijo de la página.
+
+    Args:
+        datos (DatosPagina): Valores numéricos de la página.
+
+    Returns:
+        list: Líneas de la página, sin salto de línea.
+    """
+    lineas = []
+    escribe = lineas.append
 
     # Variables de estado para interpolación en el formato final
     org = [0]*6; orm = [0]*6
     err = 0.05      # Tolerancia estándar
 
-    # --- Manejo de Contexto de Salida (Archivo vs Memoria) ---
-    class OutputContext:
-        """Context Manager para manejar escritura en archivo o en buffer de memoria StringIO."""
-        def __init__(self, path, return_content):
-            self.path = path
-            self.return_content = return_content
-            self.f = None
-
-        def __enter__(self):
-            if self.return_content:
-                self.f = io.StringIO()
-            else:
-                self.f = open(self.path, 'w', encoding='utf-8')
-            return self.f
-
-        def __exit__(self, exc_type, exc_val, exc_tb):
-            if not self.return_content:
-                self.f.close()
-            pass
-
-    # Inicio del bloque de escritura
-    with OutputContext(fichero_salida, return_content) as f23:
-        # Escritura de Título
-        f23.write(f" {nombre_dia_sem:>9}   {dia}  de  {nombre_mes}  de  {anomas}\n")
-
-        # --- Datos Diarios del SOL ---
-        pmg_sol = Paso_Mer(jd, 'sol', dt)
-        org[1], mie_sol = HOMI(pmg_sol)
-
-        # Ajuste visual si el minuto se redondea a 60
-        if mie_sol >= 59.95:
-            mie_sol = 0.0
-            org[1] += 1
-
-        t_mediodia = ts.tt_jd(jd + 0.5 + dt/86400.0)
-        _, _, dist_sol = cal_coord_ap('sol', t_mediodia)
-
-        sd_sol = calc_sd_sol(dist_sol)
-
-        f23.write(f"S D : {sd_sol:4.1f}\n")
-        f23.write(f"PMG : {org[1]:2d} {mie_sol:4.1f}\n")       
-
-        # --- Datos Diarios de la LUNA ---
-        _, _, dist_lun = cal_coord_ap('lun', t_mediodia)
-        sd_lun = calc_sd_luna(dist_lun)
-        f23.write(f"S D : {sd_lun:4.1f}\n")
-
-        # Cálculo de la Edad de la Luna (días desde Luna Nueva)
-        fichero_fases = ruta_data / "data" / "almanaque_nautico" /  f"{can}" / f"Fases{can}.dat"
-        edad_luna = 0.0
-
-        try:
-            if fichero_fases.exists():
-                # Leemos las fases pre-calculadas
-                vals = [float(x) for x in fichero_fases.read_text().split()]
-                ult_fase = 0.0
-                
-                for idx, v in enumerate(vals):
-                    # Buscamos la última fase (Luna Nueva) ocurrida antes o en el día actual
-                    if v > 0 and v > jd:
-                        break # Paramos al encontrar una fecha futura
-                    
-                    if v > 0 and (idx % 4 == 0): # idx % 4 == 0 implica Luna Nueva
-                        ult_fase = v
-                
-                if ult_fase > 0:
-                    edad_luna = jd - ult_fase
-                else:
-                    edad_luna = 0.0
-            else:
-                print("Aviso: no existe fichero Fases, edad_luna = 0")
-        except:
-            edad_luna = 0.0
+    # Escritura de Título
+    escribe(_titulo(datos))
 
-        f23.write(f"Edad : {edad_luna:4.1f}\n")
-
-        # Índice de la imagen de la fase lunar (0-11)
-        nfl = int((edad_luna * 10 - 13) / 24) + 1
-        nfl = nfl % 12
-
-        # PMG de la Luna
-        pmg_lun = Paso_Mer(jd, 'lun', dt)
-        org[2], orm[2] = HOMIEN(pmg_lun)
-        f23.write(f"PMG : {org[2]:2d} {orm[2]:2d}\n")
-
-        # PHE de la Luna (Paralaje Horizontal Ecuatorial) - calculado cada 8 horas
-        for i in range(4, 21, 8):
-            t_phe = ts.tt_jd(jd + i/24.0 + dt/86400.0)
-            _, _, d_phe = cal_coord_ap('lun', t_phe)
-            phe = calc_phe_luna(d_phe)
-            f23.write(f"PHE : {i:2d} {phe:4.1f}\n")
-
-        # Retardo del paso de la Luna (diferencia con el día siguiente)
-        pmg_lun_sig = Paso_Mer(jd + 1.0, 'lun', dt)
-        ret_pmg = ROUND(60.0 * pmg_lun_sig) - ROUND(60.0 * pmg_lun)
-        f23.write(f"Rº PMG {ret_pmg:3d}\n")
- 
-        # Definición de latitudes para visualización
-        LAT_VALS = [60, 58, 56, 54, 52, 50, 45, 40, 35, 30, 20, 10, 0,
-                -10, -20, -30, -35, -40, -45, -50, -52, -54, -56, -58, -60]
-        
-        LAT_STRS = ['60 N', '58  ', '56  ', '54  ', '52  ', '50  ',
-                    '45  ', '40  ', '35  ', '30  ', '20  ', '10 N',
-                    ' 0  ', '10 S', '20  ', '30  ', '35  ', '40  ',
-                    '45  ', '50  ', '52  ', '54  ', '56  ', '58  ',
-                    '60 S']
-
-        # ----------------------------------------------------------------------------------
-        # SECCIÓN VECTORIZADA (SOL Y LUNA)
-        # ----------------------------------------------------------------------------------
-        # Aquí optimizamos el rendimiento calculando las 24 horas (indices 0-24) de una sola vez
-        # usando arrays de NumPy en lugar de un bucle "for" convencional para las llamadas a Skyfield.
-        
-        # 1. Crear vector de tiempos (0..24 horas)
-        horas_vec = np.arange(25)
-        t_vec_main = ts.tt_jd(jd + horas_vec/24.0)
+    # --- Datos Diarios del SOL ---
+    org[1], mie_sol = _pmg_sol(datos)
 
-        # 2. Calcular SOL para las 25 horas
-        ast_sol_vec = tierra.at(t_vec_main).observe(sol).apparent()
-        ra_sol_vec, dec_sol_vec, _ = ast_sol_vec.radec(epoch='date')
-        
-        # Cálculo vectorizado del GHA: (GAST - RA) % 360
-        gh_sol_deg_arr = (t_vec_main.gast * 15.0 - ra_sol_vec.hours * 15.0) % 360.0
-        dec_sol_deg_arr = dec_sol_vec.degrees
+    escribe(f"S D : {datos.sd_sol:4.1f}")
+    escribe(f"PMG : {org[1]:2d} {mie_sol:4.1f}")
 
-        # 3. Calcular LUNA para las 25 horas
-        ast_lun_vec = tierra.at(t_vec_main).observe(luna).apparent()
-        ra_lun_vec, dec_lun_vec, _ = ast_lun_vec.radec(epoch='date')
+    # --- Datos Diarios de la LUNA ---
+    escribe(f"S D : {datos.sd_lun:4.1f}")
+    escribe(f"Edad : {datos.edad_luna:4.1f}")
 
-        gh_lun_deg_arr = (t_vec_main.gast * 15.0 - ra_lun_vec.hours * 15.0) % 360.0
-        dec_lun_deg_arr = dec_lun_vec.degrees
+    # Índice de la imagen de la fase lunar (0-11)
+    nfl = _indice_fase(datos.edad_luna)
 
-        CONST_MOV_MEDIO_LUNA_MIN = 859.0 # Valor constante para interpolación "v"
+    org[2], orm[2] = HOMIEN(datos.pmg_lun)
+    escribe(f"PMG : {org[2]:2d} {orm[2]:2d}")
 
-        # ----------------------------------------------------------------------------------
-        # OPTIMIZACIÓN: CACHE DE FENÓMENOS (ORTOS/OCASOS)
-        # ----------------------------------------------------------------------------------
-        # Pre-calculamos todos los eventos (salidas, puestas, crepúsculos) antes de imprimir
-        # las filas. Esto evita recalcular la geometría solar/lunar cientos de veces.
-        
-        # Determinamos si es página par (0) o impar (1) para saber qué eventos mostrar
-        pn_calc = (da + 1) % 2
-        if pn_calc == 0:
-            eventos_sol = ['pcn', 'pcc', 'ort'] # Principio Crepúsculo Nautico/Civil, Orto
+    for i, phe in zip(range(4, 21, 8), datos.phe):
+        escribe(f"PHE : {i:2d} {phe:4.1f}")
+
+    # Retardo del paso de la Luna (diferencia con el día siguiente)
+    escribe(f"Rº PMG {_retardo_pmg(datos):3d}")
+
+    # Bucle de impresión de filas (0 a 24 horas)
+    for i in range(25):
+        gh_sol_deg = datos.gha_sol[i]
+        dec_sol_deg = datos.dec_sol[i]
+
+        gh_lun_deg = datos.gha_lun[i]
+        dec_lun_deg = datos.dec_lun[i]
+
+        # Formateo
+        hgg_sol, hgm_sol = formato_grado_minuto(gh_sol_deg, 0.05)
+        sgn_sol, deg_sol, dem_sol = formato_signo_grado_minuto(dec_sol_deg, 0.05)
+
+        hgg_lun, hgm_lun = formato_grado_minuto(gh_lun_deg, 0.05)
+        sgn_lun, deg_lun, dem_lun = formato_signo_grado_minuto(dec_lun_deg, 0.05)
+
+        # Cálculo de "v" y "d" (variaciones horarias)
+        if i > 0:
+            v_final, d_final = _variaciones_luna(datos, i)
+
+        lat_act_str = LATITUDES_STR[i]
+
+        # --- Construcción de la línea de texto ---
+        s_sol = f"{hgg_sol:3d} {hgm_sol:4.1f} {sgn_sol} {deg_sol:2d} {dem_sol:4.1f}"
+        s_lun = f"{hgg_lun:3d} {hgm_lun:4.1f}"
+        s_lun_dec = f"{sgn_lun} {deg_lun:2d} {dem_lun:4.1f}"
+        s_fen = _texto_fenomenos(datos, i)
+
+        # Escritura condicional (la fila 0 no lleva 'v' ni 'd')
+        if i == 0:
+            linea = f"&{i:2d}  {s_sol}  {s_lun}     {s_lun_dec}      {lat_act_str}  {s_fen}"
         else:
-            eventos_sol = ['oca', 'fcc', 'fcn'] # Ocaso, Fin Crepúsculo Civil/Nautico
-        
-        # Cache Fenómenos SOLARES
-        cache_fenosol = {}
-        for lat_val in LAT_VALS:
-            for evt in eventos_sol:
-                cache_fenosol[(lat_val, evt)] = fenosol(jd, lat_val, evt)
-        
-        # Cache Fenómenos LUNARES (Hoy y Mañana para cálculo de retraso)
-        cache_fenoluna_hoy = {}
-        cache_fenoluna_maniana = {}
-        for lat_val in LAT_VALS:
-            for evt in ['ort', 'oca']:
-                cache_fenosol_hoy = fenoluna(jd, lat_val, evt)
-                cache_fenoluna_hoy[(lat_val, evt)] = cache_fenosol_hoy
-                cache_fenoluna_maniana[(lat_val, evt)] = fenoluna(jd + 1, lat_val, evt)
-
-        # Bucle de impresión de filas (0 a 24 horas)
-        for i in range(25):
-            # Extraemos datos pre-calculados de los arrays
-            gh_sol_deg = gh_sol_deg_arr[i]
-            dec_sol_deg = dec_sol_deg_arr[i]
-            
-            gh_lun_deg = gh_lun_deg_arr[i]
-            dec_lun_deg = dec_lun_deg_arr[i]
-
-            # Formateo
-            hgg_sol, hgm_sol = formato_grado_minuto(gh_sol_deg, 0.05) 
-            sgn_sol, deg_sol, dem_sol = formato_signo_grado_minuto(dec_sol_deg, 0.05)
-
-            hgg_lun, hgm_lun = formato_grado_minuto(gh_lun_deg, 0.05)
-            sgn_lun, deg_lun, dem_lun = formato_signo_grado_minuto(dec_lun_deg, 0.05)
-
-            # Cálculo de "v" y "d" (variaciones horarias)
-            if i > 0:
-                prev_gha_lun = gh_lun_deg_arr[i-1]
-                prev_dec_lun = dec_lun_deg_arr[i-1]
-
-                # Cálculo de 'v' (variación del GHA)
-                diff_gha = gh_lun_deg - prev_gha_lun
-                if diff_gha < -180.0: diff_gha += 360.0 # Corrección por salto de día (360 -> 0)
-                
-                diff_mins = diff_gha * 60.0
-                v_float = (diff_mins - CONST_MOV_MEDIO_LUNA_MIN) * 10.0
-                v_final = int(round(v_float))
-
-                # Cálculo de 'd' (variación de declinación)
-                diff_dec = abs(dec_lun_deg - prev_dec_lun)
-                d_float = diff_dec * 60.0 * 10.0
-                d_final = int(round(d_float))
-
-
-            # --- Recuperación de Fenómenos desde Cache ---
-            lat_act_val = LAT_VALS[i]
-            lat_act_str = LAT_STRS[i]
-
-            # Sol
-            vals_sol = []
-            for evt in eventos_sol:
-                hora_raw = cache_fenosol[(lat_act_val, evt)]
-                h_entera, m_entera = HOMIEN(hora_raw)    
-                vals_sol.extend([h_entera, m_entera])
-
-            # Luna
-            vals_lun = []
-            for evt in ['ort', 'oca']:
-                hora_raw = cache_fenoluna_hoy[(lat_act_val, evt)]
-                h_entera, m_entera = HOMIEN(hora_raw)
-                
-                maniana = cache_fenoluna_maniana[(lat_act_val, evt)]
-                today = hora_raw  
-                
-                # Cálculo del retardo lunar (diferencia entre mañana y hoy)
-                if maniana is None or today is None:
-                    ret_val = 9999
-                else:
-                    ret_val = ROUND(maniana * 60) - ROUND(today * 60)
-                vals_lun.extend([h_entera, m_entera, int(ret_val)])  
-
-            # --- Construcción de la línea de texto ---
-            s_sol = f"{hgg_sol:3d} {hgm_sol:4.1f} {sgn_sol} {deg_sol:2d} {dem_sol:4.1f}"
-            s_lun = f"{hgg_lun:3d} {hgm_lun:4.1f}"
-            s_lun_dec = f"{sgn_lun} {deg_lun:2d} {dem_lun:4.1f}"
-            
-            s_fen_sol = f"{vals_sol[0]:2d} {vals_sol[1]:2d}  {vals_sol[2]:2d} {vals_sol[3]:2d}  {vals_sol[4]:2d} {vals_sol[5]:2d}"
-            s_fen_lun = f"{vals_lun[0]:2d} {vals_lun[1]:2d} {vals_lun[2]:3d}  {vals_lun[3]:2d} {vals_lun[4]:2d} {vals_lun[5]:3d}"
+            linea = f"&{i:2d}  {s_sol}  {s_lun} {v_final:3d} {s_lun_dec} {d_final:3d}  {lat_act_str}  {s_fen}"
+        escribe(linea)
 
-            # Escritura condicional (la fila 0 no lleva 'v' ni 'd')
-            if i == 0:
-                linea = f"&{i:2d}  {s_sol}  {s_lun}     {s_lun_dec}      {lat_act_str}  {s_fen_sol}  {s_fen_lun}"
-            else:
-                linea = f"&{i:2d}  {s_sol}  {s_lun} {v_final:3d} {s_lun_dec} {d_final:3d}  {lat_act_str}  {s_fen_sol}  {s_fen_lun}"            
-            f23.write(linea + "\n")
+    # --- PIE DE PÁGINA (Planetas y Aries) ---
+    h_ari, m_ari = HOMI(datos.pmg_ari)
+    escribe(f"PMG Aries : {h_ari:2d} {m_ari:4.1f}")
 
+    for pmg, val_mag in zip(datos.pmg_pla, datos.mag_pla):
+        h, m = HOMIEN(pmg)
+        sig = '+' if val_mag > 0 else '-'
+        escribe(f"PMG : {h:2d} {m:2d}")
+        escribe(f"Mag. : {sig}{abs(val_mag):4.1f}")
 
-        # --- PIE DE PÁGINA (Planetas y Aries) ---
-        pmg_ari = Paso_Mer(jd, 'ari', dt)
-        h_ari, m_ari = HOMI(pmg_ari)
-        f23.write(f"PMG Aries : {h_ari:2d} {m_ari:4.1f}\n")
+    # Impresión de la tabla inferior (Planetas)
+    for i in range(25):
+        # Aries
+        tsg, tsm = formato_grado_minuto(datos.gha_ari[i], err)
 
-        cuerpos_orden  = ['ven', 'mar', 'jup', 'sat']
-        for k in cuerpos_orden: 
-            h, m = HOMIEN(Paso_Mer(jd, k, dt))
-            
-            # Magnitud
-            val_mag = Mag_visual(jd + 0.5, k)
-            sig = '+' if val_mag > 0 else '-'
+        linea = f"&{i:2d} {tsg:3d} {tsm:4.1f} "
 
-            f23.write(f"PMG : {h:2d} {m:2d}\nMag. : {sig}{abs(val_mag):4.1f}\n")
+        # Iteramos planetas
+        for gh_arr, dec_arr in zip(datos.gha_pla, datos.dec_pla):
+            hg, hm = formato_grado_minuto(gh_arr[i], err)
+            sg, dg, dm = formato_signo_grado_minuto(dec_arr[i], err)
 
-        # ----------------------------------------------------------------------------------
-        # SECCIÓN VECTORIZADA (PLANETAS)
-        # ----------------------------------------------------------------------------------
-        # Similar a la sección Sol/Luna, pero usando UT1 para precisión
-        t_vec_planets = ts.ut1_jd(jd + horas_vec/24.0)
+            linea += f"{hg:3d} {hm:4.1f} {sg} {dg:2d} {dm:4.1f}  "
 
-        # 1. Calcular Aries Vectorizado
-        gh_ari_arr = (t_vec_planets.gast * 15.0) % 360.0
+        escribe(linea)
 
-        # 2. Pre-calcular posiciones de planetas
-        planets_data = {}
-        for k in cuerpos_orden:
-            obj_planet = plan_dic[k]
-            
-            ast_p = tierra.at(t_vec_planets).observe(obj_planet).apparent()
-            ra_p, dec_p, _ = ast_p.radec(epoch='date')
-            
-            # GHA = GAST - RA
-            gh_p_arr = (t_vec_planets.gast * 15.0 - ra_p.hours * 15.0) % 360.0
-            dec_p_arr = dec_p.degrees
-            
-            planets_data[k] = (gh_p_arr, dec_p_arr)
+    # --- Bloque de Diferencias ---
+    escribe(_linea_dif(datos))
 
-        # Impresión de la tabla inferior (Planetas)
-        for i in range(25):
-            # Aries
-            gha_ari = gh_ari_arr[i]
-            tsg, tsm = formato_grado_minuto(gha_ari, err)
+    # Referencia al archivo gráfico de la fase lunar
+    escribe(f"\\def\\figlun{{FigLuna{nfl+1:02d}.epsf scaled 120}}")
 
-            linea = f"&{i:2d} {tsg:3d} {tsm:4.1f} "
-            
-            # Iteramos planetas
-            for k in cuerpos_orden:
-                gh_arr, dec_arr = planets_data[k]
-                
-                gha = gh_arr[i]
-                dec = dec_arr[i]
+    return lineas
 
-                hg, hm = formato_grado_minuto(gha, err)
-                sg, dg, dm = formato_signo_grado_minuto(dec, err)
 
-                linea += f"{hg:3d} {hm:4.1f} {sg} {dg:2d} {dm:4.1f}  "
-            
-            f23.write(linea + "\n")
-
-        # --- Bloque de Diferencias ---
-        # Calcula cuánto varía el GHA y la Dec en 24 horas para dar ayudas de interpolación
-        dif_str = "DIF         "
-        for k in cuerpos_orden:
-            t0, t1 = ts.ut1_jd(jd), ts.ut1_jd(jd + 1.0)
-            gha0, dec0, _ = cal_coord_ap(k, t0)
-            gha1, dec1, _ = cal_coord_ap(k, t1)
-            
-            d_gha = gha1 - gha0
-            if d_gha < -180:
-                d_gha += 360 # Normalización del giro
+def formatear_pagina(datos):
+    """
+    Formatea un registro 'DatosPagina' al texto de ancho fijo de la página (.dat).
 
-            val_h = (d_gha * 60.0 * 10.0) /24.0
-            if abs(val_h) > 4500:
-                val_h -= np.sign(val_h) * 9000
-            
-            sh, ah = SIGENT(ROUND(val_h))
+    Returns:
+        str: Contenido completo de la página.
+    """
+    return "".join(linea + "\n" for linea in lineas_pagina(datos))
 
-            d_dec = dec1 - dec0
-            val_d = (d_dec * 60.0 * 10.0) / 24.0
-            sd, ad = SIGENT(ROUND(val_d))
 
-            dif_str += f"      {sh} {ah:2d}      {sd} {ad:2d}"
+def campos_latex(datos):
+    """
+    Formatea un registro 'DatosPagina' directamente a los campos de las macros
+    LaTeX de la página (ver 'pagLatex.CamposLatex'), sin pasar por el texto del .dat.
 
-        f23.write(dif_str + "\n")
-        
-        # Referencia al archivo gráfico de la fase lunar
-        f23.write(f"\\def\\figlun{{FigLuna{nfl+1:02d}.epsf scaled 120}}\n")
-        
-        if return_content:
-            content = f23.getvalue()
-            # f23 se cierra automáticamente por el context manager al salir, 
-            # pero para StringIO a veces queremos el valor antes de cerrar.
-            return content
+    Cada campo toma los caracteres que 'pagLatex' lee en las posiciones fijas de
+    la línea correspondiente de 'lineas_pagina' (CAMPOS_* para las tablas), de
+    modo que el LaTeX es el mismo que el de 'pagtex_bis' sobre el .dat. Esas
+    posiciones son las del .dat de Fortran y no siempre coinciden con los valores
+    que escribe 'lineas_pagina' (p. ej. 'pagtex_bis' lee cada planeta como
+    Mag./PMG y aquí se escribe PMG/Mag.); se reproducen tal cual.
+
+    Args:
+        datos (DatosPagina): Valores numéricos de la página.
+
+    Returns:
+        CamposLatex: Campos de la página.
+    """
+    err = 0.05      # Tolerancia estándar
+
+    # --- Cabecera ---
+    sd_sol = f"{datos.sd_sol:4.1f}"
+    h, m = _pmg_sol(datos)
+    pmg_sol = f"{h:2d} {m:4.1f}"
+    sd_lun = f"{datos.sd_lun:4.1f}"
+    edad = f"{datos.edad_luna:4.1f}"
+    h, m = HOMIEN(datos.pmg_lun)
+    pmg_lun = f"{h:2d} {m:2d}"
+    phe = [f"{p:4.1f}" for p in datos.phe]
+    h, m = HOMI(datos.pmg_ari)
+    pmg_ari = f"{h:2d} {m:4.1f}"
+
+    # Cada planeta ocupa dos líneas del .dat: 'PMG : hh mm' y 'Mag. : sm.m'
+    planetas = []
+    for pmg, val_mag in zip(datos.pmg_pla, datos.mag_pla):
+        h, m = HOMIEN(pmg)
+        pmg_txt = f"{h:2d} {m:2d}"
+        mag_txt = f"{'+' if val_mag > 0 else '-'}{abs(val_mag):4.1f}"
+        planetas.append((pmg_txt[0] + pmg_txt[2:5], " " + mag_txt[0], mag_txt[2:4]))
+
+    # --- Tabla superior: columna inicial de cada valor en la línea del .dat ---
+    horas = [f"{i:2d}" for i in range(25)]
+    gha_sol = [formato_grado_minuto(g, err) for g in datos.gha_sol]
+    dec_sol = [formato_signo_grado_minuto(d, err) for d in datos.dec_sol]
+    gha_lun = [formato_grado_minuto(g, err) for g in datos.gha_lun]
+    dec_lun = [formato_signo_grado_minuto(d, err) for d in datos.dec_lun]
+    var_lun = [_variaciones_luna(datos, i) for i in range(1, 25)]
+
+    arriba = TABLA_ARRIBA.matriz_columnas([
+        (1, horas),
+        (5, [f"{g:3d}" for g, _ in gha_sol]),
+        (9, [f"{m:4.1f}" for _, m in gha_sol]),
+        (14, [s for s, _, _ in dec_sol]),
+        (16, [f"{g:2d}" for _, g, _ in dec_sol]),
+        (19, [f"{m:4.1f}" for _, _, m in dec_sol]),
+        (25, [f"{g:3d}" for g, _ in gha_lun]),
+        (29, [f"{m:4.1f}" for _, m in gha_lun]),
+        (34, [""] + [f"{v:3d}" for v, _ in var_lun]),    # La fila 0 no lleva 'v' ni 'd'
+        (38, [s for s, _, _ in dec_lun]),
+        (40, [f"{g:2d}" for _, g, _ in dec_lun]),
+        (43, [f"{m:4.1f}" for _, _, m in dec_lun]),
+        (48, [""] + [f"{d:3d}" for _, d in var_lun]),
+        (53, LATITUDES_STR),
+        (59, [_texto_fenomenos(datos, i) for i in range(25)]),
+    ])
+
+    # --- Tabla inferior: Aries y un bloque de 20 columnas por planeta ---
+    gha_ari = [formato_grado_minuto(g, err) for g in datos.gha_ari]
+    columnas = [
+        (1, horas),
+        (4, [f"{g:3d}" for g, _ in gha_ari]),
+        (8, [f"{m:4.1f}" for _, m in gha_ari]),
+    ]
+    for k, (gh_arr, dec_arr) in enumerate(zip(datos.gha_pla, datos.dec_pla)):
+        col = 13 + 20 * k
+        gha = [formato_grado_minuto(g, err) for g in gh_arr]
+        dec = [formato_signo_grado_minuto(d, err) for d in dec_arr]
+        columnas += [
+            (col, [f"{g:3d}" for g, _ in gha]),
+            (col + 4, [f"{m:4.1f}" for _, m in gha]),
+            (col + 9, [s for s, _, _ in dec]),
+            (col + 11, [f"{g:2d}" for _, g, _ in dec]),
+            (col + 14, [f"{m:4.1f}" for _, _, m in dec]),
+        ]
+    abajo = TABLA_ABAJO.matriz_columnas(columnas)
+
+    return CamposLatex(
+        fecha=_titulo(datos).ljust(58)[:58],
+        sdsol=(sd_sol[0:2], sd_sol[3]),
+        pmgsol=(pmg_sol[0:2], pmg_sol[3:5], pmg_sol[6]),
+        sdluna=(sd_lun[0:2], sd_lun[3]),
+        edad=(edad[0:2], edad[3]),
+        pmgluna=(pmg_lun[0:2], pmg_lun[3:5]),
+        phe=[(p[0:2], p[3]) for p in phe],
+        ropmg=f"{_retardo_pmg(datos):3d}"[:3],
+        arriba=arriba,
+        pmgaries=(pmg_ari[0:2], pmg_ari[3:5], pmg_ari[6]),
+        planetas=planetas,
+        abajo=abajo,
+        dif=PagTexProcessor.valores_dif(_linea_dif(datos)),
+        figlun=f"FigLuna{_indice_fase(datos.edad_luna) + 1:02d}",
+    )
+
+
+def formatear_latex(datos, procesador=None):
+    """
+    Formatea un registro 'DatosPagina' a las definiciones LaTeX de la página
+    (el mismo texto que 'pagLatex.pagtex_bis' genera a partir del .dat).
+
+    Los campos de las macros se formatean directamente de los números
+    ('campos_latex'), sin componer el texto del .dat ni volver a leerlo.
+
+    Args:
+        datos (DatosPagina): Valores numéricos de la página.
+        procesador (PagTexProcessor): Procesador a reutilizar (opcional).
+
+    Returns:
+        str: Definiciones LaTeX de la página, terminadas en salto de línea.
+    """
+    if procesador is None:
+        procesador = PagTexProcessor()
+    return procesador.latex_campos(campos_latex(datos))
+
+
+def UNAPAG(da, annio, dt, return_content=False, fases=None):
+    """
+    Genera una página completa del Almanaque Náutico (fichero .dat formateado).
+    
+    Args:
+        da (int): Día del Año (1-365/366).
+        annio (int): Año.
+        dt (float): Delta T (diferencia TT - UT1).
+        return_content (bool): Si es True, devuelve el string en lugar de escribir a disco.
+        fases (list): Fechas de las fases lunares del año ya calculadas
+                      (ver 'calcular_edad_luna'). Si es None se leen de Fases{annio}.dat.
+    """
+    contenido = formatear_pagina(calcular_pagina(da, annio, dt, fases))
+
+    if return_content:
+        return contenido
+
+    # Ruta de salida
+    fichero_salida = ruta_data / "data" / "almanaque_nautico" / f"{annio}" / "PAG.dat"
+    fichero_salida.parent.mkdir(parents=True, exist_ok=True)
+    with open(fichero_salida, 'w', encoding='utf-8') as f23:
+        f23.write(contenido)
 
     print(f"Fichero generado: {fichero_salida}")
 
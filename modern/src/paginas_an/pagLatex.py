@@ -1,91 +1,377 @@
 import io
+from dataclasses import dataclass
+from itertools import chain, islice, repeat
 from pathlib import Path
+from string import Formatter
+
+import numpy as np
 
 # --- CONFIGURACIÓN DE RUTAS ---
 BASE_DIR = Path(__file__).resolve().parent.parent
 ROOT_DIR = BASE_DIR.parent.parent
 
 
-class PagTexProcessor:
+# =============================================================================
+# ESPECIFICACIÓN DECLARATIVA DE LAS TABLAS HORARIAS
+# =============================================================================
+# Todas las posiciones son índices de Python (base 0, fin exclusivo) sobre la
+# línea de ancho fijo del .dat. Las tablas se tratan sobre una disposición
+# compacta con sólo esas columnas (CAMPOS_* y COMPARADAS_*, una detrás de otra),
+# que se rellena a partir del .dat ('pagtex_bis') o directamente de los números
+# de la página ('pagEntera.formatear_latex').
+
+# --- Tabla superior (Sol, Luna y fenómenos): 25 filas de 110 caracteres ---
+ANCHO_ARRIBA = 110
+
+# Campos que pasan a la fila LaTeX, en el orden en que se escriben
+CAMPOS_ARRIBA = (
+    (1, 3), (5, 8), (9, 13), (14, 15), (16, 18),        # 0-4   hora, GHA y Dec del Sol
+    (19, 23), (25, 28), (29, 33), (34, 37), (38, 39),   # 5-9   GHA de la Luna, v, signo Dec
+    (40, 42), (43, 47), (48, 51), (53, 55), (56, 57),   # 10-14 Dec de la Luna, d, latitud
+    (59, 61), (62, 64), (66, 68), (69, 71), (73, 75),   # 15-19 fenómenos del Sol
+    (76, 78), (80, 82), (83, 85), (87, 90), (92, 94),   # 20-24 fenómenos de la Luna
+    (95, 97), (99, 102),                                # 25-26
+)
+
+# Columnas que no pasan a LaTeX pero cuentan al comparar los bloques repetidos
+# (separador entre el signo y los grados de cada declinación)
+COMPARADAS_ARRIBA = ((15, 16), (39, 40))
+
+# Bloques que se ocultan cuando coinciden con la fila anterior y la siguiente:
+# (inicio, fin, relleno, valor que nunca se oculta)
+REPETIDOS_ARRIBA = (
+    (14, 18, ' &  ', None),     # Grados de la Dec del Sol
+    (38, 42, ' &  ', None),     # Grados de la Dec de la Luna
+    (59, 61, '  ', '**'),       # Horas de los fenómenos
+    (66, 68, '  ', '**'),
+    (73, 75, '  ', '**'),
+    (80, 82, '  ', '**'),
+    (92, 94, '  ', '**'),
+)
+
+# Filas de separación (cada 6 horas) en las que nunca se ocultan valores
+FILAS_FIJAS_ARRIBA = (5, 6, 11, 12, 17, 18)
+
+# Columnas que no pueden quedar en blanco (se rellenan con '0')
+CEROS_ARRIBA = (9, 19, 29, 43, 62, 69, 76, 83, 95)
+
+# --- Tabla inferior (Aries y planetas): 25 filas recortadas a 97 caracteres ---
+ANCHO_ABAJO = 97
+
+CAMPOS_ABAJO = (
+    (1, 3), (5, 8), (9, 13),                            # 0-2   hora, GHA de Aries
+    (15, 18), (19, 23), (24, 25), (26, 28), (29, 33),   # 3-7   Venus
+    (35, 38), (39, 43), (44, 45), (46, 48), (49, 53),   # 8-12  Marte
+    (55, 58), (59, 63), (64, 65), (66, 68), (69, 73),   # 13-17 Júpiter
+    (75, 78), (79, 83), (84, 85), (86, 88), (89, 93),   # 18-22 Saturno
+)
+
+COMPARADAS_ABAJO = ((25, 26), (45, 46), (65, 66), (85, 86))
+
+REPETIDOS_ABAJO = (
+    (24, 28, ' &  ', None),     # Grados de la Dec de cada planeta
+    (44, 48, ' &  ', None),
+    (64, 68, ' &  ', None),
+    (84, 88, ' &  ', None),
+)
+
+FILAS_FIJAS_ABAJO = (5, 6, 11, 12, 17, 18)
+
+CEROS_ABAJO = (9, 19, 29, 39, 49, 59, 69, 79, 89)
+
+# --- Plantillas de las filas LaTeX (campos en el orden de CAMPOS_*) ---
+# Los huecos de la fila 0 y el separador de la latitud llevan espacios duros
+# (U+00A0) igual que las plantillas originales; se escriben escapados.
+HUECO_CABECERA = " \u00a0" * 15
+HUECO_LATITUD = "&" + " \u00a0" * 2
+
+FILA_CABECERA_ARRIBA = (
+    "\\bf {0}&{1}&{2}&${3}$&{4}&{5}&{6}&{7}&"
+    " &" + HUECO_CABECERA + "{8} &${9}$&{10}&"
+    "{11}&" + HUECO_CABECERA + "{12} & \\bf {13} &\\bf "
+    "{14}&{15}&{16}&{17}&{18}&{19}&{20}&{21}&{22}& "
+    "{23}&{24}&{25}& {26} \\\\")
+
+FILA_ARRIBA = (
+    "\\bf {0}&{1}&{2}&${3}$&{4}&{5}&{6}&{7}&"
+    "\\raisebox{{1ex}}[0pt]{{\\scriptsize {8}}}&${9}$&{10}&"
+    "{11}&\\raisebox{{1ex}}[0pt]{{\\scriptsize {12}}}& \\bf {13} " + HUECO_LATITUD +
+    "{14}&{15}&{16}&{17}&{18}&{19}&{20}&{21}&{22}& "
+    "{23}&{24}&{25}& {26} \\\\")
+
+FILA_ABAJO = (
+    "\\bf {0}&{1}&{2}&{3}&{4}&${5}$&{6}&"
+    "{7}&{8}&{9}&${10}$&{11}&{12}&{13}&{14}&${15}"
+    "$&{16}&{17}&{18}&{19}&${20}$&{21}&{22}\\\\")
+
+# Filas con espacio vertical extra y filas con la latitud en negrita
+FILAS_ESPACIO_ARRIBA = (5, 11, 17)
+FILAS_NEGRITA_ARRIBA = (11, 13, 24)
+FILAS_ESPACIO_ABAJO = (5, 11, 17)
+
+
+# =============================================================================
+# OPERACIONES SOBRE COLUMNAS
+# =============================================================================
+
+ESPACIO, CERO = ord(' '), ord('0')
+
+
+def _codigos(texto):
+    """Códigos de carácter de 'texto' como array uint32 (mismo formato que 'U')."""
+    return np.array([ord(c) for c in texto], dtype=np.uint32)
+
+
+class PlantillaFila:
     """
-    Clase encargada de procesar datos de efemérides (formato de ancho fijo)
-    y convertirlos a tablas formateadas en código LaTeX para el Almanaque Náutico.
+    Plantilla de fila LaTeX compilada sobre una especificación de campos.
+
+    La plantilla (sintaxis de str.format, con los campos numerados como en
+    CAMPOS_*) se traduce una sola vez a un mapa de posiciones: qué carácter
+    literal va en cada posición de la fila de salida y de qué columna de la
+    matriz compacta (ver TablaFija) sale cada carácter de los campos. Como todos
+    los campos son de ancho fijo, las filas de una tabla se generan todas a la vez
+    con una copia por índices.
+    """
+
+    def __init__(self, plantilla, campos):
+        # Posición de cada campo en la disposición compacta (campos seguidos)
+        anchos = [fin - ini for ini, fin in campos]
+        inicios = np.cumsum([0] + anchos[:-1])
+
+        pos_lit, cod_lit, pos_campo, col_campo = [], [], [], []
+        n = 0
+        for literal, campo, _, _ in Formatter().parse(plantilla):
+            pos_lit.extend(range(n, n + len(literal)))
+            cod_lit.extend(ord(c) for c in literal)
+            n += len(literal)
+            if campo is not None:
+                k = int(campo)
+                pos_campo.extend(range(n, n + anchos[k]))
+                col_campo.extend(range(inicios[k], inicios[k] + anchos[k]))
+                n += anchos[k]
+
+        self.longitud = n
+        self.pos_lit = np.array(pos_lit, dtype=np.intp)
+        self.cod_lit = np.array(cod_lit, dtype=np.uint32)
+        self.pos_campo = np.array(pos_campo, dtype=np.intp)
+        self.col_campo = np.array(col_campo, dtype=np.intp)
+
+    def genera(self, matriz):
+        """
+        Genera las filas de texto de una matriz de códigos (ver TablaFija.procesa).
+
+        Returns:
+            list: Una cadena por fila de 'matriz'.
+        """
+        salida = np.empty((matriz.shape[0], self.longitud), dtype=np.uint32)
+        salida[:, self.pos_lit] = self.cod_lit
+        salida[:, self.pos_campo] = matriz[:, self.col_campo]
+        return salida.view(f'U{self.longitud}').ravel().tolist()
 
-    Utiliza un buffer de líneas y una ventana deslizante para detectar valores
-    repetidos y limpiar la presentación visual de la tabla.
+
+class TablaFija:
+    """
+    Especificación de una tabla horaria de ancho fijo, tratada por columnas.
+
+    La tabla se guarda en una matriz compacta de códigos de carácter (filas x
+    columnas de CAMPOS_* y COMPARADAS_*), que se rellena desde las líneas de un
+    .dat ('matriz_lineas') o desde columnas de texto formateadas directamente de
+    los números ('matriz_columnas'). Los índices de los bloques comparables y de
+    las columnas de ceros se traducen una sola vez a esa disposición; 'procesa'
+    aplica después la especificación a la matriz de cada página.
     """
 
-    def __init__(self):
-        # --- Buffers de lectura ---
-        # Almacenan 3 líneas consecutivas para comparar valores (anterior, actual, siguiente)
-        # y determinar si se deben ocultar datos repetitivos.
-        self.fil1 = ""  # Línea anterior (t-1)
-        self.fil2 = ""  # Línea actual (t)
-        self.fil3 = ""  # Línea siguiente (t+1)
-
-        # --- Buffer de almacenamiento diario ---
-        # Array para almacenar las 24 horas del día + cabecera (índices 0 a 24)
-        # Se procesan en memoria antes de escribir al archivo final.
-        self.v = [""] * 25
+    def __init__(self, ancho, campos, comparadas, bloques, filas_fijas, ceros):
+        self.ancho = ancho
 
-        # Manejadores de archivos
-        self.f_in = None   # Archivo de entrada (.dat)
-        self.f_out = None  # Archivo de salida (.tex o .dat)
+        # Columnas del .dat que forman la disposición compacta, en su orden
+        self.columnas = np.concatenate([np.arange(ini, fin)
+                                        for ini, fin in tuple(campos) + tuple(comparadas)])
+        self.ancho_compacto = len(self.columnas)
 
-    # --- Utilitarios de manejo de cadenas y archivos ---
+        # Índice compacto de cada columna del .dat (-1 si no se usa)
+        self.indice = np.full(ancho, -1, dtype=np.intp)
+        self.indice[self.columnas] = np.arange(self.ancho_compacto)
 
-    def read_line(self, length=110):
-        """
-        Lee una línea del archivo de entrada y normaliza su longitud.
+        # Columnas de todos los bloques comparables, una detrás de otra
+        self.cols_bloques = self.indice[np.concatenate([np.arange(ini, fin)
+                                                        for ini, fin, _, _ in bloques])]
+        self.inicio_bloques = np.cumsum([0] + [fin - ini for ini, fin, _, _ in bloques[:-1]])
+        self.relleno = _codigos("".join(b[2] for b in bloques))
 
-        Args:
-            length (int): Longitud fija deseada (por defecto 110 caracteres).
+        # Bloques con un valor que nunca se oculta (p. ej. '**' en los fenómenos)
+        self.respetados = [(k, _codigos(b[3]))
+                           for k, b in enumerate(bloques) if b[3] is not None]
 
-        Returns:
-            str: Línea sin salto de línea y rellena con espacios a la derecha.
-                 Retorna espacios si se alcanza el fin de archivo.
+        # Ancho de cada bloque, para expandir la máscara por bloque a columnas
+        self.anchos_bloques = np.array([fin - ini for ini, fin, _, _ in bloques])
+        self.filas_fijas = list(filas_fijas)
+        self.ceros = self.indice[list(ceros)]
+
+        # Todas las columnas de la especificación deben estar en la disposición
+        if (self.cols_bloques < 0).any() or (self.ceros < 0).any():
+            raise ValueError("Columna de bloque o de ceros fuera de CAMPOS/COMPARADAS.")
+
+    def matriz_lineas(self, lineas):
         """
-        line = self.f_in.readline()
-        if not line:
-            return " " * length
-        return line.replace('\n', '').ljust(length)
+        Matriz compacta de las líneas de ancho fijo de un .dat.
 
-    def write_line(self, text):
-        """Escribe una cadena en el archivo de salida agregando un salto de línea."""
-        self.f_out.write(text + '\n')
+        Returns:
+            np.ndarray: Matriz uint32 (filas x ancho compacto).
+        """
+        n = len(lineas)
+        filas = np.array([linea.ljust(self.ancho)[:self.ancho] for linea in lineas],
+                         dtype=f'U{self.ancho}')
+        # Códigos de carácter (UCS-4) de las columnas usadas
+        return filas.view(np.uint32).reshape(n, self.ancho)[:, self.columnas]
 
-    def modify_str(self, s, start_1_based, end_1_based, value):
+    def matriz_columnas(self, columnas):
         """
-        Emula la asignación de subcadenas de Fortran (s(inicio:fin) = valor).
-        Dado que los strings en Python son inmutables, crea uno nuevo.
+        Matriz compacta a partir de columnas de texto ya formateadas.
 
         Args:
-            s (str): Cadena original.
-            start_1_based (int): Índice de inicio (basado en 1).
-            end_1_based (int): Índice final (basado en 1).
-            value (str): Nuevo valor a insertar.
+            columnas (list): Pares (columna inicial en el .dat, textos de cada fila).
+                             El resto de posiciones quedan en blanco y lo que pase
+                             del ancho de la tabla se descarta, como en el .dat.
 
         Returns:
-            str: Nueva cadena modificada manteniendo la longitud fija (padding si es necesario).
+            np.ndarray: Matriz uint32 (filas x ancho compacto).
+        """
+        n = len(columnas[0][1])
+        matriz = np.full((n, self.ancho_compacto), ESPACIO, dtype=np.uint32)
+        for inicio, textos in columnas:
+            # NumPy rellena con NUL los textos más cortos: pasan a ser espacios
+            codigos = np.array(textos, dtype=str)
+            largo = codigos.itemsize // 4
+            codigos = codigos.view(np.uint32).reshape(n, largo)
+            codigos[codigos == 0] = ESPACIO
+            cols = np.arange(inicio, min(inicio + largo, self.ancho))
+            k = self.indice[cols]
+            usadas = k >= 0
+            matriz[:, k[usadas]] = codigos[:, cols[usadas] - inicio]
+        return matriz
+
+    def procesa(self, matriz):
         """
-        # Asegurar longitud mínima de 110 caracteres para mantener formato tabular
-        if len(s) < 110:
-            s = s.ljust(110)
+        Aplica la especificación a la matriz compacta de una página: oculta los
+        bloques repetidos (reemplazo de ARREGU/ARREGD con COMPA4/COMPA2) y rellena
+        con ceros las columnas críticas. Modifica 'matriz' y la devuelve.
+
+        Returns:
+            np.ndarray: Matriz uint32 (filas x ancho compacto).
+        """
+        n = matriz.shape[0]
+
+        # --- Valores repetidos ---
+        # Un bloque se oculta si coincide carácter a carácter con la fila anterior
+        # y con la siguiente ORIGINALES (como la ventana deslizante de Fortran).
+        # No se toca la primera ni la última fila ni las filas fijas.
+        sub = matriz[:, self.cols_bloques]
+        igual = (sub[:-2] == sub[1:-1]) & (sub[1:-1] == sub[2:])
+        repetido = np.zeros((n, len(self.anchos_bloques)), dtype=bool)
+        repetido[1:-1] = np.logical_and.reduceat(igual, self.inicio_bloques, axis=1)
+
+        for k, valor in self.respetados:
+            ini = self.inicio_bloques[k]
+            bloque = sub[:, ini:ini + len(valor)]
+            repetido[:, k] &= ~(bloque == valor).all(axis=1)
 
-        # Conversión de índices (1-based a 0-based de Python)
-        start = start_1_based - 1
-        end = end_1_based
-        slice_len = end - start
+        repetido[self.filas_fijas] = False
+        mascara = np.repeat(repetido, self.anchos_bloques, axis=1)
+        matriz[:, self.cols_bloques] = np.where(mascara, self.relleno, sub)
 
-        # Ajustar el valor al tamaño exacto del segmento (recortar o rellenar)
-        value_padded = value.ljust(slice_len)[:slice_len]
+        # --- Columnas que no pueden quedar en blanco ---
+        sub = matriz[:, self.ceros]
+        matriz[:, self.ceros] = np.where(sub == ESPACIO, CERO, sub)
 
-        # Reconstrucción de la cadena mediante slicing
-        return s[:start] + value_padded + s[end:]
+        return matriz
+
+
+# Especificaciones de las dos tablas de la página (se preparan una sola vez)
+TABLA_ARRIBA = TablaFija(ANCHO_ARRIBA, CAMPOS_ARRIBA, COMPARADAS_ARRIBA, REPETIDOS_ARRIBA,
+                         FILAS_FIJAS_ARRIBA, CEROS_ARRIBA)
+TABLA_ABAJO = TablaFija(ANCHO_ABAJO, CAMPOS_ABAJO, COMPARADAS_ABAJO, REPETIDOS_ABAJO,
+                        FILAS_FIJAS_ABAJO, CEROS_ABAJO)
+
+PLANTILLA_CABECERA_ARRIBA = PlantillaFila(FILA_CABECERA_ARRIBA, CAMPOS_ARRIBA)
+PLANTILLA_ARRIBA = PlantillaFila(FILA_ARRIBA, CAMPOS_ARRIBA)
+PLANTILLA_ABAJO = PlantillaFila(FILA_ABAJO, CAMPOS_ABAJO)
+
+
+def _cero(texto):
+    """Rellena con '0' el primer carácter de 'texto' si está en blanco."""
+    if texto[:1] == ' ':
+        return '0' + texto[1:]
+    return texto
+
+
+# =============================================================================
+# CAMPOS DE UNA PÁGINA
+# =============================================================================
+
+@dataclass(slots=True)
+class CamposLatex:
+    """
+    Textos de una página tal como entran en las macros LaTeX, ya separados en
+    campos. Se obtienen de las líneas de un .dat ('PagTexProcessor.campos_lineas')
+    o directamente del registro numérico ('pagEntera.campos_latex'); en ambos
+    casos 'PagTexProcessor.latex_campos' genera el mismo LaTeX.
+    """
+    fecha: str              # Cabecera de la página (58 caracteres)
+    sdsol: tuple            # (unidades, décimas)
+    pmgsol: tuple           # (horas, minutos, décimas)
+    sdluna: tuple           # (unidades, décimas)
+    edad: tuple             # (unidades, décimas)
+    pmgluna: tuple          # (horas, minutos)
+    phe: list               # PHE de las 4, 12 y 20 h: (unidades, décimas)
+    ropmg: str
+    arriba: np.ndarray      # Matriz compacta de la tabla superior (TABLA_ARRIBA)
+    pmgaries: tuple         # (horas, minutos, décimas)
+    planetas: list          # Venus, Marte, Júpiter, Saturno: (magnitud, horas, minutos)
+    abajo: np.ndarray       # Matriz compacta de la tabla inferior (TABLA_ABAJO)
+    dif: list               # 8 diferencias (signo y dos cifras)
+    figlun: str             # Nombre de la figura de la fase (9 caracteres)
+
+
+class PagTexProcessor:
+    """
+    Clase encargada de procesar datos de efemérides (formato de ancho fijo)
+    y convertirlos a tablas formateadas en código LaTeX para el Almanaque Náutico.
+
+    Cada tabla horaria se trata de una vez como matriz de caracteres por columnas
+    según la especificación declarativa del módulo (CAMPOS_*, REPETIDOS_*,
+    CEROS_*): los valores repetidos se detectan con comparaciones de arrays y las
+    filas LaTeX se generan en bloque a partir de plantillas.
+    """
+
+    def __init__(self):
+        # Manejadores de archivos
+        self.f_in = None   # Archivo de entrada (.dat)
+        self.f_out = None  # Archivo de salida (.tex o .dat)
+
+    # --- Utilitarios de manejo de cadenas y archivos ---
+
+    def read_page(self, length=110):
+        """
+        Lee de una vez todo el fichero de entrada y cierra el flujo.
+
+        Args:
+            length (int): Longitud fija deseada (por defecto 110 caracteres).
+
+        Returns:
+            iterator: Líneas sin salto de línea y rellenas con espacios a la derecha.
+                      Al agotarse la entrada sigue devolviendo líneas de espacios.
+        """
+        texto = self.f_in.read()
+        self.f_in.close()
+        lineas = [linea.ljust(length) for linea in texto.split('\n')]
+        return chain(lineas, repeat(" " * length))
 
     # --- Lógica Principal PAGTEXBIS ---
 
-    def pagtex_bis(self, da, ano, input_path=None, output_path=None, input_content=None):
+    def pagtex_bis(self, da, ano, input_path=None, output_path=None, input_content=None,
+                   output_stream=None):
         """
         Proceso principal: Lee datos crudos, extrae constantes diarias y genera
         las tablas horarias en formato LaTeX.
@@ -96,21 +382,25 @@ class PagTexProcessor:
             input_path (str): Ruta opcional del archivo de entrada.
             output_path (str): Ruta opcional del archivo de salida.
             input_content (str): Contenido en texto plano (para pruebas sin archivos).
+            output_stream: Flujo de texto ya abierto donde escribir (no se cierra).
+                           Tiene prioridad sobre output_path.
         """
-        self.v = [" " * 110] * 25  # Reinicia el buffer diario
-        ida = da + 9  # Ajuste de índice para el nombre del archivo fuente
-
-        # Construcción dinámica de la ruta de salida basada en la estructura del Almanaque
-        if ida < 100:
-            nombre_archivo = f"AN{ano}{ida:02d}.dat"
-        else:
-            nombre_archivo = f"AN{ano}{ida:03d}.dat"
+        # Ruta de salida por defecto (sólo si no se da ni ruta ni flujo)
+        path = None
+        if output_path is None and output_stream is None:
+            ida = da + 9  # Ajuste de índice para el nombre del archivo fuente
+
+            # Construcción dinámica de la ruta de salida basada en la estructura del Almanaque
+            if ida < 100:
+                nombre_archivo = f"AN{ano}{ida:02d}.dat"
+            else:
+                nombre_archivo = f"AN{ano}{ida:03d}.dat"
 
-        path = ROOT_DIR / "Almanaque Nautico" / \
-            "DATOS" / str(ano) / nombre_archivo
+            path = ROOT_DIR / "Almanaque Nautico" / \
+                "DATOS" / str(ano) / nombre_archivo
 
-        # Crea directorios si no existen
-        path.parent.mkdir(parents=True, exist_ok=True)
+            # Crea directorios si no existen
+            path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
             # Configuración de entrada: buffer de memoria o archivo en disco
@@ -121,265 +411,221 @@ class PagTexProcessor:
                 self.f_in = open(input_path or ROOT_DIR /
                                  'Datos' / 'pag.dat', 'r', encoding='latin-1')
 
-            self.f_out = open(output_path or path, 'w', encoding='latin-1')
+            if output_stream is not None:
+                self.f_out = output_stream
+            else:
+                self.f_out = open(output_path or path, 'w', encoding='latin-1')
         except FileNotFoundError as e:
             print(f"Error abriendo archivos: {e}")
             return
 
-        # ---------------------------------------------------------
-        # FASE 1: Extracción de Cabecera y Definiciones LaTeX
-        # ---------------------------------------------------------
-
-        # 1. Fecha
-        self.fil1 = self.read_line()
-        self.write_line(f"\\def\\fecha{{{self.fil1[:58]}}}")
-
-        # 2. Semidiámetro del Sol (SD)
-        self.fil1 = self.read_line()
-        self.write_line(
-            f"\\def\\sdsol{{{self.fil1[6:8]}.{self.fil1[9]}\\Min}}")
-
-        # 3. Paso por el Meridiano de Greenwich (PMG) del Sol
-        self.fil1 = self.read_line()
-        # Relleno de cero si el dígito de la hora es un espacio
-        if self.fil1[9] == ' ':
-            self.fil1 = self.modify_str(self.fil1, 10, 10, '0')
-        self.write_line(
-            f"\\def\\pmgsol{{{self.fil1[6:8]}\\Hora\\ {self.fil1[9:11]}.{self.fil1[12]}\\Mint}}")
-
-        # 4. Semidiámetro de la Luna
-        self.fil1 = self.read_line()
-        self.write_line(
-            f"\\def\\sdluna{{{self.fil1[6:8]}.{self.fil1[9]}\\Min}}")
-
-        # 5. Edad de la Luna
-        self.fil1 = self.read_line()
-        self.write_line(
-            f"\\def\\edad{{{self.fil1[7:9]}.{self.fil1[10]}\\Diap}}")
-
-        # 6. PMG de la Luna
-        self.fil1 = self.read_line()
-        if self.fil1[9] == ' ':
-            self.fil1 = self.modify_str(self.fil1, 10, 10, '0')
-        self.write_line(
-            f"\\def\\pmgluna{{{self.fil1[6:8]}\\Hora\\ {self.fil1[9:11]}\\Mint}}")
-
-        # 7. Fenómenos: pheu (Salida), phed (Puesta), phet (Crepúsculo)
-        for name in ["pheu", "phed", "phet"]:
-            self.fil1 = self.read_line()
-            self.write_line(
-                f"\\def\\{name}{{{self.fil1[9:11]}.{self.fil1[12]}\\Min}}")
-
-        # 8. Datos de rotación/paso adicional
-        self.fil1 = self.read_line()
-        self.write_line(f"\\def\\ropmg{{{self.fil1[7:10]}\\Mint}}")
-
-        # Inicio del macro para la tabla superior
-        self.write_line(r"\def\arriba{")
+        # La página se lee entera una sola vez y se escribe de una vez
+        self.f_out.write(self.latex_pagina(self.read_page()))
 
-        # ---------------------------------------------------------
-        # FASE 2: Procesamiento Tabla Superior (Sol/Luna/Aries)
-        # Lógica 'ARREGU' (Arreglo Arriba)
-        # ---------------------------------------------------------
+        # Cierre de recursos (el flujo externo lo cierra quien lo abrió)
+        if output_stream is None:
+            self.f_out.close()
 
-        # Carga inicial de la ventana deslizante (3 líneas)
-        self.fil1 = self.read_line()  # Hora 0
-        self.fil2 = self.read_line()  # Hora 1
-        self.fil3 = self.read_line()  # Hora 2
+    def latex_pagina(self, lineas, length=110):
+        """
+        Genera las definiciones LaTeX de una página a partir de las líneas de
+        ancho fijo de un .dat.
 
-        self.v[0] = self.fil1  # La primera línea se guarda tal cual
+        Args:
+            lineas (iterable): Líneas de la página, con o sin relleno a la derecha.
+            length (int): Longitud fija de las líneas (por defecto 110 caracteres).
 
-        # Iteración para las horas 1 a 23
-        for i in range(1, 24):
-            fil4 = self.fil2  # Guarda referencia temporal
+        Returns:
+            str: Definiciones LaTeX de la página, terminadas en salto de línea.
+        """
+        return self.latex_campos(self.campos_lineas(lineas, length))
 
-            # 'arregu_bis' compara la línea actual con la anterior y siguiente
-            # para limpiar datos repetidos (columnas que no cambian)
-            self.fil2 = self.arregu_bis(i, self.fil1, self.fil2, self.fil3)
-            self.v[i] = self.fil2
+    def campos_lineas(self, lineas, length=110):
+        """
+        Separa en campos (CamposLatex) las líneas de ancho fijo de un .dat.
 
-            # Desplazamiento de la ventana
-            self.fil1 = fil4       # La actual pasa a ser la anterior
-            self.fil2 = self.fil3  # La siguiente pasa a ser la actual
+        Args:
+            lineas (iterable): Líneas de la página, con o sin relleno a la derecha.
+            length (int): Longitud fija de las líneas (por defecto 110 caracteres).
 
-            # Leer nueva línea siguiente (si no estamos al final)
-            if i < 23:
-                self.fil3 = self.read_line()
+        Returns:
+            CamposLatex: Campos de la página.
+        """
+        lineas = chain((linea.ljust(length) for linea in lineas), repeat(" " * length))
+
+        # --- Cabecera: fecha, Sol, Luna y PHE ---
+        fecha = next(lineas)[:58]
+        fil = next(lineas)
+        sdsol = (fil[6:8], fil[9])
+        fil = next(lineas)
+        pmgsol = (fil[6:8], fil[9:11], fil[12])
+        fil = next(lineas)
+        sdluna = (fil[6:8], fil[9])
+        fil = next(lineas)
+        edad = (fil[7:9], fil[10])
+        fil = next(lineas)
+        pmgluna = (fil[6:8], fil[9:11])
+        phe = [(fil[9:11], fil[12]) for fil in islice(lineas, 3)]
+        ropmg = next(lineas)[7:10]
+
+        # --- Tabla superior (Sol/Luna/fenómenos) ---
+        arriba = TABLA_ARRIBA.matriz_lineas(list(islice(lineas, 25)))
+
+        # --- Punto de Aries y planetas (Magnitud y PMG de cada uno) ---
+        fil = next(lineas)
+        pmgaries = (fil[12:14], fil[15:17], fil[18])
+        planetas = []
+        for _ in range(4):
+            mag = next(lineas)
+            fil = next(lineas)
+            planetas.append((f"{mag[6]}{mag[8:11]}", fil[6:8], fil[9:11]))
+
+        # --- Tabla inferior (Aries y planetas) ---
+        abajo = TABLA_ABAJO.matriz_lineas(list(islice(lineas, 25)))
+
+        # --- Pie: diferencias (en posiciones fijas 20, 30, ..., 90) y fase lunar ---
+        dif = self.valores_dif(next(lineas))
+        figlun = next(lineas)[12:21]
+
+        return CamposLatex(fecha=fecha, sdsol=sdsol, pmgsol=pmgsol, sdluna=sdluna,
+                           edad=edad, pmgluna=pmgluna, phe=phe, ropmg=ropmg,
+                           arriba=arriba, pmgaries=pmgaries, planetas=planetas,
+                           abajo=abajo, dif=dif, figlun=figlun)
+
+    def latex_campos(self, campos):
+        """
+        Genera las definiciones LaTeX de una página a partir de sus campos.
 
-        self.v[24] = self.fil2  # La última línea (hora 24)
+        Args:
+            campos (CamposLatex): Campos de la página.
 
-        # Limpieza final: Relleno de ceros en columnas específicas si están vacías
-        for i in range(25):
-            line = self.v[i]
-            # Índices de columnas críticas que no pueden quedar vacías
-            indices = [9, 19, 29, 43, 62, 69, 76, 83, 95]
-            for idx in indices:
-                if line[idx] == ' ':
-                    line = self.modify_str(line, idx+1, idx+1, '0')
-            self.v[i] = line
+        Returns:
+            str: Definiciones LaTeX de la página, terminadas en salto de línea.
+        """
+        salida = []
+        escribe = salida.append
 
         # ---------------------------------------------------------
-        # FASE 3: Escritura de Tabla Superior a LaTeX
+        # FASE 1: Definiciones LaTeX de la cabecera
         # ---------------------------------------------------------
-        self.write_line(self.format_211(self.v[0]))  # Encabezado/Fila 0
-
-        for i in range(1, 25):
-            # Selección de formato según índice para agrupamiento visual (cada 6 horas)
-            if i in [5, 17]:
-                self.write_line(self.format_213(self.v[i]))  # Espaciado extra
-            elif i == 11:
-                self.write_line(self.format_214(self.v[i]))  # Mitad del día
-            elif i in [13, 24]:
-                # Negritas específicas
-                self.write_line(self.format_215(self.v[i]))
-            else:
-                self.write_line(self.format_212(self.v[i]))  # Formato estándar
+        escribe(f"\\def\\fecha{{{campos.fecha}}}")
 
-        self.write_line("}")  # Cierre macro \arriba
+        # Semidiámetro y PMG del Sol (relleno de cero en la decena de minutos)
+        uni, dec = campos.sdsol
+        escribe(f"\\def\\sdsol{{{uni}.{dec}\\Min}}")
+        hor, mnt, dec = campos.pmgsol
+        escribe(f"\\def\\pmgsol{{{hor}\\Hora\\ {_cero(mnt)}.{dec}\\Mint}}")
 
-        # ---------------------------------------------------------
-        # FASE 4: Planetas y Punto de Aries (Intermedio)
-        # ---------------------------------------------------------
+        # Semidiámetro, edad y PMG de la Luna
+        uni, dec = campos.sdluna
+        escribe(f"\\def\\sdluna{{{uni}.{dec}\\Min}}")
+        uni, dec = campos.edad
+        escribe(f"\\def\\edad{{{uni}.{dec}\\Diap}}")
+        hor, mnt = campos.pmgluna
+        escribe(f"\\def\\pmgluna{{{hor}\\Hora\\ {_cero(mnt)}\\Mint}}")
 
-        # Punto de Aries
-        self.fil1 = self.read_line()
-        if self.fil1[15] == ' ':
-            self.fil1 = self.modify_str(self.fil1, 16, 16, '0')
-        self.write_line(
-            f"\\def\\pmgaries{{{self.fil1[12:14]}\\Hora\\ {self.fil1[15:17]}.{self.fil1[18]}\\Mint}}")
+        # PHE de las 4, 12 y 20 h
+        for name, (uni, dec) in zip(["pheu", "phed", "phet"], campos.phe):
+            escribe(f"\\def\\{name}{{{uni}.{dec}\\Min}}")
 
-        # Datos de Planetas (Venus, Marte, Júpiter, Saturno)
-        planetas = ["venus", "marte", "jupiter", "saturno"]
-        for p in planetas:
-            # Magnitud
-            self.fil1 = self.read_line()
-            self.write_line(
-                f"\\def\\mag{p}{{{self.fil1[6]}{self.fil1[8:11]}}}")
-            # Paso por el Meridiano (PMG)
-            self.fil1 = self.read_line()
-            if self.fil1[9] == ' ':
-                self.fil1 = self.modify_str(self.fil1, 10, 10, '0')
-            self.write_line(
-                f"\\def\\pmg{p}{{{self.fil1[6:8]}\\Hora\\ {self.fil1[9:11]}\\Mint}}")
-
-        self.write_line(r"\def\abajo{")
+        # Retardo del PMG de la Luna
+        escribe(f"\\def\\ropmg{{{campos.ropmg}\\Mint}}")
 
         # ---------------------------------------------------------
-        # FASE 5: Procesamiento Tabla Inferior (Planetas)
-        # Lógica 'ARREGD' (Arreglo Abajo)
+        # FASE 2-3: Tabla Superior (Sol/Luna/Aries) -> macro \arriba
+        # Lógica 'ARREGU' (Arreglo Arriba) por columnas
         # ---------------------------------------------------------
+        escribe(r"\def\arriba{")
+        for fila in self.filas_arriba(campos.arriba):
+            escribe(fila)
+        escribe("}")  # Cierre macro \arriba
 
-        # Reinicio de lectura para la sección inferior
-        self.fil1 = self.read_line()
-        self.fil2 = self.read_line()
-        self.fil3 = self.read_line()
-
-        # Recorte a 97 caracteres para la tabla inferior
-        self.v[0] = self.fil1[:97].ljust(110)
-
-        # Ventana deslizante para tabla inferior
-        for i in range(1, 24):
-            fil4 = self.fil2
-            self.fil2 = self.arregd_bis(i, self.fil1, self.fil2, self.fil3)
-            self.v[i] = self.fil2[:97].ljust(110)
-
-            self.fil1 = fil4
-            self.fil2 = self.fil3
-
-            if i < 23:
-                self.fil3 = self.read_line()
-
-        self.v[24] = self.fil2[:97].ljust(110)
+        # ---------------------------------------------------------
+        # FASE 4: Planetas y Punto de Aries (Intermedio)
+        # ---------------------------------------------------------
+        hor, mnt, dec = campos.pmgaries
+        escribe(f"\\def\\pmgaries{{{hor}\\Hora\\ {_cero(mnt)}.{dec}\\Mint}}")
 
-        # Limpieza de ceros en tabla inferior
-        for i in range(25):
-            line = self.v[i]
-            # Índices ajustados para la estructura de columnas de planetas
-            indices = [9, 19, 29, 39, 49, 59, 69, 79, 89]
-            for idx in indices:
-                if line[idx] == ' ':
-                    line = self.modify_str(line, idx+1, idx+1, '0')
-            self.v[i] = line
+        # Datos de Planetas (Venus, Marte, Júpiter, Saturno)
+        planetas = ["venus", "marte", "jupiter", "saturno"]
+        for p, (mag, hor, mnt) in zip(planetas, campos.planetas):
+            escribe(f"\\def\\mag{p}{{{mag}}}")
+            escribe(f"\\def\\pmg{p}{{{hor}\\Hora\\ {_cero(mnt)}\\Mint}}")
 
         # ---------------------------------------------------------
-        # FASE 6: Escritura de Tabla Inferior a LaTeX
+        # FASE 5-6: Tabla Inferior (Planetas) -> macro \abajo
+        # Lógica 'ARREGD' (Arreglo Abajo) por columnas
         # ---------------------------------------------------------
-        for i in range(25):
-            # Formatos con espaciado agrupado (filas 5, 11, 17)
-            if i in [5, 11, 17]:
-                self.write_line(self.format_232(self.v[i]))
-            else:
-                self.write_line(self.format_231(self.v[i]))
-
-        self.write_line("}")  # Cierre macro \abajo
+        escribe(r"\def\abajo{")
+        for fila in self.filas_abajo(campos.abajo):
+            escribe(fila)
+        escribe("}")  # Cierre macro \abajo
 
         # ---------------------------------------------------------
         # FASE 7: Pie de Página (Diferencias y Fase Lunar)
         # ---------------------------------------------------------
+        vals = campos.dif
+        diff_str = f"\\def\\dif{{${vals[0]}$ &&& ${vals[1]}$&& ${vals[2]}$ &&& ${vals[3]}$&& ${vals[4]}$ &&& ${vals[5]}$&& ${vals[6]}$ &&& ${vals[7]}$}}"
+        escribe(diff_str)
 
-        # Procesamiento de la línea de "Diferencias"
-        self.fil1 = self.read_line()
-        # Limpieza especial para diferencias
-        self.fil1 = self.arredif(self.fil1)
+        # Ruta de la imagen de la fase lunar
+        escribe(f"\\def\\figlun{{{campos.figlun}.pdf}}")
 
-        # Helper interno para extraer pares de diferencias
-        def get_diff(start):
-            idx = start - 1
-            return f"{self.fil1[idx]}{self.fil1[idx+1:idx+3]}"
+        return "\n".join(salida) + "\n"
 
-        # Extracción en posiciones fijas (20, 30, ..., 90)
-        vals = [get_diff(x) for x in [20, 30, 40, 50, 60, 70, 80, 90]]
+    # --- Tablas horarias (tratamiento por columnas) ---
 
-        # Construcción de la tabla de diferencias LaTeX
-        diff_str = f"\\def\\dif{{${vals[0]}$ &&& ${vals[1]}$&& ${vals[2]}$ &&& ${vals[3]}$&& ${vals[4]}$ &&& ${vals[5]}$&& ${vals[6]}$ &&& ${vals[7]}$}}"
-        self.write_line(diff_str)
+    def tabla_arriba(self, lineas):
+        """
+        Convierte las 25 líneas de la tabla superior de un .dat en sus 25 filas LaTeX.
+        """
+        return self.filas_arriba(TABLA_ARRIBA.matriz_lineas(lineas))
 
-        # Ruta de la imagen de la fase lunar
-        self.fil1 = self.read_line()
-        self.write_line(f"\\def\\figlun{{{self.fil1[12:21]}.pdf}}")
+    def tabla_abajo(self, lineas):
+        """
+        Convierte las 25 líneas de la tabla inferior (Aries y planetas) de un .dat
+        en sus 25 filas LaTeX.
+        """
+        return self.filas_abajo(TABLA_ABAJO.matriz_lineas(lineas))
 
-        # Cierre de recursos
-        self.f_in.close()
-        self.f_out.close()
+    def filas_arriba(self, matriz):
+        """
+        Filas LaTeX de la tabla superior a partir de su matriz compacta.
+        Oculta los valores repetidos, rellena con ceros las columnas críticas y
+        aplica el formato de cada fila (negritas y espaciado cada 6 horas).
+        """
+        matriz = TABLA_ARRIBA.procesa(matriz.copy())
+        filas = PLANTILLA_ARRIBA.genera(matriz)
+        filas[0] = PLANTILLA_CABECERA_ARRIBA.genera(matriz[:1])[0]
 
-    # --- Lógica de Negocio Específica (Limpieza de datos) ---
+        for i in FILAS_NEGRITA_ARRIBA:
+            filas[i] = filas[i].replace(HUECO_LATITUD, r"&\bf ")
+        for i in FILAS_ESPACIO_ARRIBA:
+            filas[i] = filas[i].replace(r" \\", r" \\[1.0ex]")
+        return filas
 
-    def arregu_bis(self, i, f1, f2, f3):
+    def filas_abajo(self, matriz):
         """
-        Lógica 'Arriba': Compara columnas específicas de la parte superior.
-        Si el valor en la fila actual (f2) es igual al de la anterior (f1)
-        y al de la siguiente (f3), se borra en f2 para evitar repetición visual.
-        No se aplica en filas de separación (5, 6, 11, etc.).
+        Filas LaTeX de la tabla inferior a partir de su matriz compacta, con el
+        mismo tratamiento que 'filas_arriba'.
         """
-        if i not in [5, 6, 11, 12, 17, 18]:
-            # Compara bloques de 4 caracteres
-            f2 = self.compa4(15, 18, f1, f2, f3)
-            f2 = self.compa4(39, 42, f1, f2, f3)
-            # Compara bloques de 2 caracteres
-            f2 = self.compa2(60, 61, f1, f2, f3)
-            f2 = self.compa2(67, 68, f1, f2, f3)
-            f2 = self.compa2(74, 75, f1, f2, f3)
-            f2 = self.compa2(81, 82, f1, f2, f3)
-            f2 = self.compa2(93, 94, f1, f2, f3)
-        return f2
-
-    def arregd_bis(self, i, f1, f2, f3):
+        filas = PLANTILLA_ABAJO.genera(TABLA_ABAJO.procesa(matriz.copy()))
+
+        for i in FILAS_ESPACIO_ABAJO:
+            filas[i] = filas[i].replace(r"\\", r"\\[1.0ex]")
+        return filas
+
+    @staticmethod
+    def valores_dif(linea):
         """
-        Lógica 'Abajo': Similar a arregu_bis pero para la tabla de planetas.
-        Incluye una marca especial 'c' en la columna 97 para ciertos índices.
+        Extrae las 8 diferencias (signo y dos cifras) de la línea 'DIF' de la
+        página, en las posiciones fijas 20, 30, ..., 90, tras limpiarla con 'arredif'.
         """
-        if i in [6, 12, 18]:
-            # Marca especial de control
-            f2 = self.modify_str(f2, 97, 97, 'c')
-        elif i not in [5, 11, 17]:
-            # Comparaciones de 4 caracteres en columnas de planetas
-            f2 = self.compa4(25, 28, f1, f2, f3)
-            f2 = self.compa4(45, 48, f1, f2, f3)
-            f2 = self.compa4(65, 68, f1, f2, f3)
-            f2 = self.compa4(85, 88, f1, f2, f3)
-        return f2
-
-    def arredif(self, f1):
+        fil = PagTexProcessor.arredif(linea.ljust(110))
+        return [f"{fil[x - 1]}{fil[x:x + 2]}" for x in [20, 30, 40, 50, 60, 70, 80, 90]]
+
+    @staticmethod
+    def arredif(f1):
         """
         Limpia la línea de diferencias: Si encuentra un ' 0', elimina el dígito anterior
         para mejorar la estética.
@@ -388,102 +634,9 @@ class PagTexProcessor:
         for idx in indices:
             # Detecta patrón "espacio cero"
             if f1[idx-1:idx+1] == ' 0':
-                f1 = self.modify_str(f1, idx-2, idx-2, ' ')
+                f1 = f1[:idx-3] + ' ' + f1[idx-2:]
         return f1
 
-    def compa4(self, i1, i2, f1, f2, f3):
-        """
-        Compara un bloque de 4 caracteres. Si f1, f2 y f3 son iguales en ese rango,
-        reemplaza f2 con '&  ' (sintaxis para celda vacía o especial en la tabla).
-        """
-        start = i1 - 1
-        end = i2
-        if (f1[start:end] == f2[start:end]) and (f2[start:end] == f3[start:end]):
-            f2 = self.modify_str(f2, i1, i2, ' &  ')
-        return f2
-
-    def compa2(self, i1, i2, f1, f2, f3):
-        """
-        Compara bloque de 2 caracteres. Si son iguales y no son asteriscos,
-        limpia f2 con espacios.
-        """
-        start = i1 - 1
-        end = i2
-        if (f1[start:end] == f2[start:end]) and (f2[start:end] == f3[start:end]) and (f2[start:end] != '**'):
-            f2 = self.modify_str(f2, i1, i2, '  ')
-        return f2
-
-    # --- Formateadores de filas para LaTeX ---
-    # Estas funciones mapean posiciones fijas del string a columnas de tabla LaTeX
-
-    def get_parts_upper(self, line):
-        """Trocea la línea superior (110 chars) en una lista de campos de datos."""
-        return [
-            line[1:3], line[5:8], line[9:13], line[14], line[16:18],  # 0-4
-            line[19:23], line[25:28], line[29:33], line[34:37], line[38],  # 5-9
-            line[40:42], line[43:47], line[48:51], line[53:55], line[56],  # 10-14
-            line[59:61], line[62:64], line[66:68], line[69:71], line[73:75],  # 15-19
-            line[76:78], line[80:82], line[83:85], line[87:90], line[92:94],  # 20-24
-            line[95:97], line[99:102]  # 25-26
-        ]
-
-    def format_211(self, line):
-        """Genera fila LaTeX con negrita para encabezados/horas principales."""
-        p = self.get_parts_upper(line)
-        # Construcción del string LaTeX inyectando separadores '&' y comandos de estilo
-        return (f"\\bf {p[0]}&{p[1]}&{p[2]}&${p[3]}$&{p[4]}&{p[5]}&{p[6]}&{p[7]}&"
-                f" &                              {p[8]} &${p[9]}$&{p[10]}&"
-                f"{p[11]}&                              {p[12]} & \\bf {p[13]} &\\bf "
-                f"{p[14]}&{p[15]}&{p[16]}&{p[17]}&{p[18]}&{p[19]}&{p[20]}&{p[21]}&{p[22]}& "
-                f"{p[23]}&{p[24]}&{p[25]}& {p[26]} \\\\")
-
-    def format_212(self, line):
-        """Genera fila LaTeX estándar (texto normal) con ajustes de superíndice (scriptsize)."""
-        p = self.get_parts_upper(line)
-        return (f"\\bf {p[0]}&{p[1]}&{p[2]}&${p[3]}$&{p[4]}&{p[5]}&{p[6]}&{p[7]}&"
-                f"\\raisebox{{1ex}}[0pt]{{\\scriptsize {p[8]}}}&${p[9]}$&{p[10]}&"
-                f"{p[11]}&\\raisebox{{1ex}}[0pt]{{\\scriptsize {p[12]}}}& \\bf {p[13]} &    "
-                f"{p[14]}&{p[15]}&{p[16]}&{p[17]}&{p[18]}&{p[19]}&{p[20]}&{p[21]}&{p[22]}& "
-                f"{p[23]}&{p[24]}&{p[25]}& {p[26]} \\\\")
-
-    def format_213(self, line):
-        """Variante con espacio vertical extra (1.0ex) al final de la fila."""
-        return self.format_212(line).replace(r" \\", r" \\[1.0ex]")
-
-    def format_214(self, line):
-        """Variante mixta: negrita en ciertas columnas y espacio extra."""
-        base = self.format_212(line)
-        base = base.replace(r"&    ", r"&\bf ")
-        base = base.replace(r" \\", r" \\[1.0ex]")
-        return base
-
-    def format_215(self, line):
-        """Variante con negrita en columnas específicas, sin espacio extra."""
-        base = self.format_212(line)
-        base = base.replace(r"&    ", r"&\bf ")
-        return base
-
-    def get_parts_lower(self, line):
-        """Trocea la línea inferior para la tabla de planetas."""
-        return [
-            line[1:3], line[5:8], line[9:13], line[15:18], line[19:23],  # 0-4
-            line[24], line[26:28], line[29:33], line[35:38], line[39:43],  # 5-9
-            line[44], line[46:48], line[49:53], line[55:58], line[59:63],  # 10-14
-            line[64], line[66:68], line[69:73], line[75:78], line[79:83],  # 15-19
-            line[84], line[86:88], line[89:93]  # 20-22
-        ]
-
-    def format_231(self, line):
-        """Formato LaTeX para fila estándar de la tabla de planetas."""
-        p = self.get_parts_lower(line)
-        return (f"\\bf {p[0]}&{p[1]}&{p[2]}&{p[3]}&{p[4]}&${p[5]}$&{p[6]}&"
-                f"{p[7]}&{p[8]}&{p[9]}&${p[10]}$&{p[11]}&{p[12]}&{p[13]}&{p[14]}&${p[15]}"
-                f"$&{p[16]}&{p[17]}&{p[18]}&{p[19]}&${p[20]}$&{p[21]}&{p[22]}\\\\")
-
-    def format_232(self, line):
-        """Formato para tabla de planetas con espacio vertical extra."""
-        return self.format_231(line).replace(r"\\", r"\\[1.0ex]")
-
 
 # --- Bloque de Ejecución (Punto de entrada) ---
 if __name__ == "__main__":
@@ -0,0 +1,377 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+# =============================================================================
+# TABLAS DE PUERTOS: ORTOS, OCASOS Y CREPÚSCULOS PARA MUCHAS LOCALIDADES
+# =============================================================================
+# Propósito: Calcular en una sola pasada vectorizada los fenómenos solares
+#            (crepúsculos náutico/civil, orto, ocaso) y lunares (orto, ocaso)
+#            de una lista de puertos (nombre, latitud, longitud) para un
+#            intervalo de días, y volcarlos a un fichero de tabla compacto.
+#
+# Estrategia: En lugar de llamar a 'fenosol'/'fenoluna' por puerto y día
+#            (cada llamada evalúa las efemérides decenas de veces), se evalúan
+#            el Sol y la Luna UNA sola vez sobre una malla temporal común
+#            (cada 30 min). Las efemérides geocéntricas no dependen del puerto,
+#            así que la altura de todos los puertos se obtiene por difusión
+#            NumPy (puertos x instantes). Los cruces de umbral se localizan por
+#            cambio de signo y se refinan todos a la vez (Illinois) sobre la
+#            interpolación cúbica de AR, Dec y distancia.
+# =============================================================================
+
+# 1. Obtener la ruta base del proyecto para gestionar imports relativos
+try:
+    ruta_base = Path(__file__).resolve().parent.parent
+except NameError:
+    ruta_base = Path.cwd().parent
+
+ruta_paginas_an = ruta_base / "paginas_an"
+
+for ruta in (ruta_base, ruta_paginas_an):
+    if str(ruta) not in sys.path:
+        sys.path.append(str(ruta))
+
+from utils import read_de440 as read
+from utils import coordena as coor
+from utils import funciones
+from subAN import HOMIEN
+from ortoocasol import EVENTOS_DZ, EVENTO_SUBIDA
+from ortoocasoluna import DZ0_LUNA, RET_AU_RATIO, REL_AU_RATIO
+
+# =============================================================================
+# CONSTANTES
+# =============================================================================
+# Orden de las columnas de la tabla (sol) y de la luna
+EVENTOS_SOL = ['pcn', 'pcc', 'ort', 'oca', 'fcc', 'fcn']
+EVENTOS_LUNA = ['ort', 'oca']
+
+PASOS_DIA = 48              # Malla de 30 minutos (igual que la de 'fenoluna')
+VENTANA_LUNA = 1.05         # Fracción de día en la que 'fenoluna' acepta el fenómeno
+DIAS_POR_BLOQUE = 32        # Días por bloque de cálculo (acota la memoria)
+ITER_REFINO = 12            # Iteraciones del refinamiento (Illinois)
+
+SIN_FENOMENO = 9999.0       # Mismo centinela que 'fenosol' y 'fenoluna'
+
+# =============================================================================
+# LECTURA DE LA LISTA DE PUERTOS
+# =============================================================================
+
+def cargar_puertos(ruta):
+    """
+    CABECERA:       cargar_puertos(ruta)
+    DESCRIPCIÓN:    Lee una lista de puertos en texto plano. Cada línea contiene
+                    'nombre; latitud; longitud' (separador ';' o ',').
+                    Las líneas vacías o que empiezan por '#' se ignoran.
+
+    PRECONDICIÓN:   'ruta': Path o str del fichero. Latitud en grados (+N),
+                    longitud en grados (+E, -W).
+
+    POSTCONDICIÓN:  Devuelve una lista de tuplas (nombre, lat, lon).
+                    Lanza ValueError indicando la línea si el formato es incorrecto.
+    """
+    puertos = []
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for num_linea, linea in enumerate(f, start=1):
+            linea = linea.strip()
+            if not linea or linea.startswith('#'):
+                continue
+            campos = [c.strip() for c in linea.replace(';', ',').rsplit(',', 2)]
+            try:
+                nombre, lat, lon = campos[0], float(campos[1]), float(campos[2])
+            except (IndexError, ValueError):
+                raise ValueError(f"Línea {num_linea} de '{ruta}' mal formada: {linea!r}")
+            puertos.append((nombre, lat, lon))
+    return puertos
+
+# =============================================================================
+# FUNCIONES AUXILIARES VECTORIZADAS
+# =============================================================================
+
+def _interp_cubica(y, k, u):
+    """
+    Interpolación de Lagrange de 4 puntos (k-1, k, k+1, k+2) evaluada en la
+    fracción 'u' (0..1) del intervalo [k, k+1]. 'y' es 1-D y 'k', 'u' arrays.
+    La malla lleva un punto de margen por cada lado, así que k-1 y k+2 existen.
+    """
+    y0, y1, y2, y3 = y[k - 1], y[k], y[k + 1], y[k + 2]
+    return (y1
+            + u * (-y0 / 3.0 - y1 / 2.0 + y2 - y3 / 6.0)
+            + u**2 * (y0 / 2.0 - y1 + y2 / 2.0)
+            + u**3 * (-y0 / 6.0 + y1 / 2.0 - y2 / 2.0 + y3 / 6.0))
+
+
+def _alturas(fi, lon, ra, de, gast_rad):
+    """
+    Seno de la altura geocéntrica por difusión (puertos x instantes).
+    'fi', 'lon' en radianes con forma (P, 1) o (N,); el resto (G,) o (N,).
+    """
+    ha = gast_rad + lon - ra
+    return np.sin(fi) * np.sin(de) + np.cos(fi) * np.cos(de) * np.cos(ha)
+
+
+def _funcion_sol(fi, lon, ra, de, gast_rad, dist, h0):
+    """Altura del Sol menos la altura objetivo (positiva = por encima)."""
+    return np.arcsin(np.clip(_alturas(fi, lon, ra, de, gast_rad), -1.0, 1.0)) - h0
+
+
+def _funcion_luna(fi, lon, ra, de, gast_rad, dist, h0):
+    """
+    Distancia cenital objetivo menos la calculada, como en 'fenoluna':
+    dz0 + SD - PI - z (positiva = Luna por encima del horizonte efectivo).
+    """
+    z = np.arccos(np.clip(_alturas(fi, lon, ra, de, gast_rad), -1.0, 1.0))
+    return (DZ0_LUNA + np.arctan(REL_AU_RATIO / dist) - np.arcsin(RET_AU_RATIO / dist)) - z
+
+
+def _efemerides_malla(id_cuerpo, t):
+    """
+    Evalúa el cuerpo sobre toda la malla 't' (Time UT1) en UNA llamada a Skyfield.
+    Devuelve AR desenrollada, Dec, distancia y GAST desenrollado (radianes).
+    La matriz de nutación y el GAST quedan en caché dentro de 't', así que el
+    segundo cuerpo evaluado sobre la misma malla no los recalcula.
+    """
+    ra, de, dist = coor.equatorial_apparent(id_cuerpo, t)
+    gast_rad = np.unwrap(np.radians(t.gast * 15.0))
+    return np.unwrap(ra), de, dist, gast_rad
+
+
+def _refina(funcion, fi, lon, malla, p, k, fa, fb, h0):
+    """
+    Refinamiento simultáneo de todos los cruces (regula falsi, variante Illinois)
+    sobre la interpolación cúbica de la malla. Se trabaja con la fracción 'u'
+    del intervalo [k, k+1], siempre acotada en [0, 1]. Devuelve 'u'.
+    """
+    ra, de, dist, gast = malla
+
+    def evalua(u):
+        return funcion(fi[p], lon[p],
+                       _interp_cubica(ra, k, u), _interp_cubica(de, k, u),
+                       _interp_cubica(gast, k, u), _interp_cubica(dist, k, u), h0)
+
+    def secante(a, b, fa, fb):
+        denom = fb - fa
+        seguro = np.where(denom != 0.0, denom, 1.0)
+        return np.where(denom != 0.0, (a * fb - b * fa) / seguro, 0.5 * (a + b))
+
+    a = np.zeros(p.size)
+    b = np.ones(p.size)
+    lado = np.zeros(p.size, dtype=int)
+    for _ in range(ITER_REFINO):
+        c = secante(a, b, fa, fb)
+        fc = evalua(c)
+        mismo_a = np.sign(fc) == np.sign(fa)
+
+        # Sustituimos el extremo con el mismo signo y dividimos el otro si se repite
+        a = np.where(mismo_a, c, a)
+        fa = np.where(mismo_a, fc, fa)
+        fb = np.where(mismo_a & (lado == 1), 0.5 * fb, fb)
+        b = np.where(~mismo_a, c, b)
+        fb = np.where(~mismo_a, fc, fb)
+        fa = np.where(~mismo_a & (lado == -1), 0.5 * fa, fa)
+        lado = np.where(mismo_a, 1, -1)
+
+    return secante(a, b, fa, fb)
+
+
+def _cruces(funcion, fi, lon, malla, jd_malla, h0):
+    """
+    Localiza y refina todos los cruces del umbral 'h0' en ambas direcciones
+    con una sola evaluación de la malla (puertos x instantes).
+
+    Devuelve {True: (puerto, jd_ut1), False: (puerto, jd_ut1)} para las subidas
+    y las bajadas, ordenados por puerto y tiempo.
+    """
+    ra, de, dist, gast = malla
+    valores = funcion(fi[:, None], lon[:, None], ra, de, gast, dist, h0)
+    f0 = valores[:, :-1]
+    f1 = valores[:, 1:]
+    paso = jd_malla[1] - jd_malla[0]
+
+    resultado = {}
+    for subida in (True, False):
+        if subida:
+            mascara = (f0 < 0) & (f1 >= 0)
+        else:
+            mascara = (f0 >= 0) & (f1 < 0)
+        # El primer y último intervalo son margen de la interpolación cúbica
+        mascara[:, 0] = False
+        mascara[:, -1] = False
+
+        p, k = np.nonzero(mascara)
+        if p.size == 0:
+            resultado[subida] = (p, np.empty(0))
+            continue
+        u = _refina(funcion, fi, lon, malla, p, k, f0[p, k], f1[p, k], h0)
+        resultado[subida] = (p, jd_malla[k] + u * paso)
+    return resultado
+
+
+def _primer_evento(p_ev, jd_ev, n_puertos, jd_dias, ventana):
+    """
+    Para cada (puerto, día) devuelve la hora (0-24+) del primer cruce con
+    jd >= inicio del día y jd < inicio + ventana; SIN_FENOMENO si no hay.
+    """
+    n_dias = jd_dias.size
+    horas = np.full((n_puertos, n_dias), SIN_FENOMENO)
+    if p_ev.size == 0:
+        return horas
+
+    # Clave ordenable (puerto, tiempo relativo) para una única búsqueda binaria
+    base = jd_dias[0]
+    escala = 4.0 * (jd_dias[-1] - base + 2.0)
+    claves = p_ev * escala + (jd_ev - base)
+    orden = np.argsort(claves, kind='stable')
+    claves = claves[orden]
+    jd_ev = jd_ev[orden]
+    p_ev = p_ev[orden]
+
+    pq, dq = np.meshgrid(np.arange(n_puertos), np.arange(n_dias), indexing='ij')
+    consulta = pq * escala + (jd_dias[dq] - base)
+    idx = np.searchsorted(claves, consulta, side='left')
+    valido = idx < claves.size
+    idx_c = np.where(valido, idx, 0)
+    valido &= (p_ev[idx_c] == pq) & (jd_ev[idx_c] < jd_dias[dq] + ventana)
+
+    horas[valido] = (jd_ev[idx_c][valido] - jd_dias[dq][valido]) * 24.0
+    return horas
+
+# =============================================================================
+# CÁLCULO PRINCIPAL
+# =============================================================================
+
+def calcular_fenomenos_puertos(latitudes, longitudes, jd_inicio, n_dias,
+                               dias_por_bloque=DIAS_POR_BLOQUE):
+    """
+    CABECERA:       calcular_fenomenos_puertos(latitudes, longitudes, jd_inicio, n_dias)
+    DESCRIPCIÓN:    Calcula, para todos los puertos y días a la vez, las horas UT
+                    de los fenómenos solares de EVENTOS_SOL y lunares de EVENTOS_LUNA.
+                    Los umbrales son los de 'fenosol' (EVENTOS_DZ) y 'fenoluna'
+                    (dz0 + SD - PI), con la misma selección de evento por día:
+                    - Sol: primer cruce en la dirección del fenómeno dentro del día UT.
+                    - Luna: primer cruce a partir de 0h, hasta 1.05 días (puede
+                      dar horas > 24, como 'fenoluna').
+
+    PRECONDICIÓN:   - latitudes, longitudes: secuencias en grados (+N, +E).
+                    - jd_inicio: Fecha Juliana UT1 a las 0h del primer día.
+                    - n_dias: número de días consecutivos (>= 1).
+                    - dias_por_bloque: días por bloque de malla (acota la memoria).
+
+    POSTCONDICIÓN:  Devuelve un diccionario {'sol': {evt: array}, 'luna': {evt: array}}
+                    con arrays (puertos x días) de horas decimales;
+                    SIN_FENOMENO (9999.0) cuando el fenómeno no ocurre.
+    """
+    fi = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    n_puertos = fi.size
+    paso = 1.0 / PASOS_DIA
+
+    resultado = {
+        'sol': {evt: np.full((n_puertos, n_dias), SIN_FENOMENO) for evt in EVENTOS_SOL},
+        'luna': {evt: np.full((n_puertos, n_dias), SIN_FENOMENO) for evt in EVENTOS_LUNA},
+    }
+
+    for d0 in range(0, n_dias, dias_por_bloque):
+        d1 = min(d0 + dias_por_bloque, n_dias)
+        jd_dias = jd_inicio + np.arange(d0, d1, dtype=float)
+
+        # Malla del bloque con un punto de margen antes del primer día y
+        # cubriendo la ventana lunar del último día (más el margen cúbico).
+        n_pasos = int(np.ceil((d1 - d0 - 1 + VENTANA_LUNA) * PASOS_DIA)) + 3
+        jd_malla = jd_dias[0] + (np.arange(n_pasos) - 1) * paso
+
+        t_malla = read.get_time_obj(jd_malla, scale='ut1')
+        malla_sol = _efemerides_malla(11, t_malla)
+        malla_luna = _efemerides_malla(10, t_malla)
+
+        # --- Sol: una evaluación por distancia cenital (orto/ocaso, pcc/fcc y
+        #     pcn/fcn la comparten; sólo cambia la dirección del cruce)
+        cruces_sol = {}
+        for evt in EVENTOS_SOL:
+            dz = EVENTOS_DZ[evt]
+            if dz not in cruces_sol:
+                h0 = np.radians(90.0 - dz)
+                cruces_sol[dz] = _cruces(_funcion_sol, fi, lon, malla_sol, jd_malla, h0)
+            p_ev, jd_ev = cruces_sol[dz][EVENTO_SUBIDA[evt]]
+            resultado['sol'][evt][:, d0:d1] = _primer_evento(p_ev, jd_ev, n_puertos, jd_dias, 1.0)
+
+        # --- Luna: orto (subida) y ocaso (bajada) de una sola evaluación
+        cruces_luna = _cruces(_funcion_luna, fi, lon, malla_luna, jd_malla, 0.0)
+        for evt in EVENTOS_LUNA:
+            p_ev, jd_ev = cruces_luna[evt == 'ort']
+            resultado['luna'][evt][:, d0:d1] = _primer_evento(p_ev, jd_ev, n_puertos, jd_dias, VENTANA_LUNA)
+
+    return resultado
+
+
+def _hhmm(hora):
+    """Formatea una hora decimal como 'HHMM' (HOMIEN) o '----' si no hay fenómeno."""
+    h, m = HOMIEN(hora)
+    if h == 9999:
+        return '----'
+    return f"{h:02d}{m:02d}"
+
+
+def generar_tablas_puertos(puertos, dia, mes, anio, n_dias, ruta_salida=None):
+    """
+    CABECERA:       generar_tablas_puertos(puertos, dia, mes, anio, n_dias, ruta_salida)
+    DESCRIPCIÓN:    Genera el fichero de tablas de puertos para el intervalo pedido.
+                    Formato compacto de ancho fijo, un bloque por puerto:
+                      '# nombre  lat  lon'
+                      'dd mm aaaa pcn  pcc  ort  oca  fcc  fcn  lort loca'
+                    con las horas UT en 'HHMM' y '----' si el fenómeno no ocurre.
+
+    PRECONDICIÓN:   - puertos: lista de (nombre, lat, lon) o ruta a un fichero
+                      legible por 'cargar_puertos'.
+                    - dia, mes, anio: fecha inicial (UT).
+                    - n_dias: número de días.
+                    - ruta_salida: Path del fichero; por defecto
+                      data/almanaque_nautico/{anio}/Puertos{anio}{mes}{dia}.dat
+
+    POSTCONDICIÓN:  Escribe el fichero y devuelve su ruta como cadena.
+    """
+    if isinstance(puertos, (str, Path)):
+        puertos = cargar_puertos(puertos)
+    if not puertos:
+        raise ValueError("La lista de puertos está vacía.")
+
+    nombres = [p[0] for p in puertos]
+    latitudes = [p[1] for p in puertos]
+    longitudes = [p[2] for p in puertos]
+
+    # 0h UT1 del día inicial (escala de los fenómenos, como en 'fenosol').
+    # UT1 - UTC puede ser negativo, así que se redondea al '.5' más próximo:
+    # truncar llevaría a las 0h del día anterior.
+    jd_inicio = read.get_time_obj(funciones.DiaJul(dia, mes, anio, 0.0), scale='tt').ut1
+    jd_inicio = np.round(jd_inicio - 0.5) + 0.5
+
+    res = calcular_fenomenos_puertos(latitudes, longitudes, jd_inicio, n_dias)
+
+    if ruta_salida is None:
+        ruta_salida = (ruta_base.parent.parent / "data" / "almanaque_nautico" / str(anio)
+                       / f"Puertos{anio:04d}{mes:02d}{dia:02d}.dat")
+    ruta_salida = Path(ruta_salida)
+    ruta_salida.parent.mkdir(parents=True, exist_ok=True)
+
+    # Fechas civiles de cada fila (una sola conversión vectorizada)
+    fechas = read.get_time_obj(jd_inicio + np.arange(n_dias) + 0.5, scale='ut1').ut1_calendar()
+    anios, meses, dias = fechas[0], fechas[1], fechas[2]
+
+    with open(ruta_salida, 'w', encoding='utf-8') as f:
+        f.write("#  dd mm aaaa  pcn  pcc  ort  oca  fcc  fcn lort loca   (UT, HHMM)\n")
+        for ip, nombre in enumerate(nombres):
+            f.write(f"# {nombre}  {latitudes[ip]:+8.4f} {longitudes[ip]:+9.4f}\n")
+            for d in range(n_dias):
+                horas = [res['sol'][evt][ip, d] for evt in EVENTOS_SOL]
+                horas += [res['luna'][evt][ip, d] for evt in EVENTOS_LUNA]
+                celdas = " ".join(_hhmm(h) for h in horas)
+                f.write(f"{int(dias[d]):02d} {int(meses[d]):02d} {int(anios[d]):4d} {celdas}\n")
+
+    return str(ruta_salida)
+
+# =============================================================================
+# BLOQUE PRINCIPAL (PRUEBA)
+# =============================================================================
+if __name__ == "__main__":
+    ejemplo = [("Cadiz", 36.533, -6.300), ("A Coruna", 43.367, -8.400), ("Las Palmas", 28.133, -15.417)]
+    print(generar_tablas_puertos(ejemplo, 1, 1, 2025, 31))
@@ -1,5 +1,5 @@
 import numpy as np
-import sys, math
+import sys
 from pathlib import Path
 
 """""
@@ -49,91 +49,68 @@ try:
     # fun: utilidades de fecha (Conversión Gregoriano <-> Juliano)
     # _ts: escala de tiempo para posiciones planetarias
     from utils import funciones 
-    from utils import read_de440
+    from utils import tabla_cambios
 except ImportError as e:
     # Si faltan las librerías, el programa fallará al llamar a las funciones de cálculo,
     # pero permite cargar el script para revisión de código.
     pass
 
-#vamos a crear dos funciones que nos ayudarán a mantener el formato de escritura que realiza el archivo FORTRAN original
-"""""
-Cabecera: valores_A_string(agMarte1, agMarte2, agMarte3, agVenus) -> string
-Precondición: recoge las alturas medias de marte y venus
-Postcondición: devuelve los cuatro valores en forma de cadena para realizar su comparación posteriormente
-Esto es debido a que en el formato que lo realiza fortran es de 4 caracteres por número, por ejemplo:
-1.2 = ' 1.2'
-"""""
-def valores_A_string(agMarte1, agMarte2, agMarte3, agVenus):
-
-    #transformamos los valores a string con el formato de 4 caracteres por número
-    s1 = f"{agMarte1:4.1f}"[-4:]
-    s2 = f"{agMarte2:4.1f}"[-4:]
-    s3 = f"{agMarte3:4.1f}"[-4:]
-    s4 = f"{agVenus:4.1f}"[-4:]
+from utils.salida import SalidaDirectorio
 
-    return s1 + s2 + s3 + s4        #devolvemos una cadena con todos los valores ya pasados a cadena
+#radio de la Tierra en UA
+RADIO_TIERRA = 4.263523270752451e-05
 
+#alturas medias (en grados) de las cuatro columnas: Marte a 20, 45 y 70 grados y Venus a 25 grados
+ALTURAS_GRADOS = np.array([20.0, 45.0, 70.0, 25.0], dtype=np.float64)
 
-"""""
-Cabercera: signo_pos_A_string(cadena_valores) -> string
-Precondición: recibe una cadena de valores de ángulos
-Postcondición: devuelve la cadena pero añadiéndole el símbolo '+' a aquellos valores positivos que no sean 0.0
-Tendremos que recorrer 16 "posiciones", pues la cadena es de 16 caracteres como indica el formato establecido
-por los ficheros FORTRAN
-"""""
-def signo_pos_A_string(cadena_valores):
-
-    """""
-    convertimos la cadena de valores en una lista, para poder alterar los simbolos con mayor facilidad
-    esto hará que, por ejemplo, si tenemos la siguiente cadena: ' 1.2-2.0', se convierta en:
-    [' ','1','.','2','-','2','0']. Gracias a esto, vemos que 1.2 es positivo, pues podremos acceder a la posición
-    lista[0] para cambiarlo por '+', resultando en: ['+','1','.','2','-','2','0']
-    """""
-    lista_simbolos = list(cadena_valores)
+#orden de las columnas en el .dat: Venus primero y después Marte a 20, 45 y 70 grados
+ORDEN_COLUMNAS = [3, 0, 1, 2]
 
-    #Comprobamos bloque a bloque si cada número es negativo (su primera posición es '-'), o si las tres siguientes
-    #posiciones son igual a 0.0
-    if cadena_valores[0] != '-' and cadena_valores[1:4] != '0.0':
-        lista_simbolos[0] = '+'
+#identificadores de los cuerpos para read_de440.GeoDista
+ID_MARTE = 4
+ID_VENUS = 2
 
-    if cadena_valores[4] != '-' and cadena_valores[5:8] != '0.0':
-        lista_simbolos[4] = '+'
 
-    if cadena_valores[8] != '-' and cadena_valores[9:12] != '0.0':
-        lista_simbolos[8] = '+'
+"""""
+Cabecera: calcular_paralajes(anio, dT) -> (array, array)
+Precondición: recibe el año y Delta T en segundos
+Postcondición: devuelve las fechas julianas de tabla_cambios.fechas_tabla y una matriz (días x 4) con los paralajes,
+en minutos de arco, corregidos por altura: Marte a 20, 45 y 70 grados y Venus a 25 grados (orden de ALTURAS_GRADOS).
+Las distancias de todos los días son las series compartidas de tabla_cambios.distancias_tabla (una sola llamada
+vectorial a read_de440.GeoDista por planeta)
+"""""
+def calcular_paralajes(anio: int, dT: float):
 
-    if cadena_valores[12] != '-' and cadena_valores[13:16] != '0.0':
-        lista_simbolos[12] = '+'
+    dJuliano = tabla_cambios.fechas_tabla(anio, dT)
 
+    #geodistancias de Marte y Venus de todo el año
+    rMarte = tabla_cambios.distancias_tabla(anio, float(dT), ID_MARTE)
+    rVenus = tabla_cambios.distancias_tabla(anio, float(dT), ID_VENUS)
 
     """""
-    devolvemos el resultado de nuevo en formato string, uniendo "", que seria como un caracter vacío, con
-    la lista que hemos creado con todos los símbolos ya puestos, quedándonos el resultado que buscamos:
-    '+1.2-2.0' (según el ejemplo que hemos usado)
+    Matriz de distancias (días x 4): las tres primeras columnas son de Marte y la última de Venus.
+    El programa original sólo usa la distancia de Venus el primer día; en el resto del año la columna de Venus
+    se calcula con la distancia de Marte. Se conserva para que el fichero .dat sea el mismo
     """""
-    return "".join(lista_simbolos)
+    distancias = np.repeat(rMarte[:, None], 4, axis=1)
+    distancias[0, 3] = rVenus[0]
+
+    #paralajes de todos los días y alturas en una sola expresión
+    paralajes = funciones.Rad2MArc(np.arcsin(RADIO_TIERRA / distancias * np.cos(np.radians(ALTURAS_GRADOS))))
+
+    return dJuliano, paralajes
 
 
 """""
-Cabecera: calculo_paralaje() -> fichero .dat
+Cabecera: calculo_paralaje(anio, dT, salida = None) -> fichero .dat
 Precondición: Requiere que las funciones utilizadas dentro de esta estén implementadas, además de las funciones del 
-fichero "funciones.py", que se encuentra en la carpeta "Comun"
+fichero "funciones.py", que se encuentra en la carpeta "Comun". 'salida' es opcional: destino de utils/salida.py
+(directorio o ZIP); por defecto data/almanaque_nautico/AAAA
 Postcondición: Crea el fichero .dat en el que se recopilan los datos sobre el paralaje de Venus y Marte en el año y
-con la variable Delta dada por el usuario
+con la variable Delta dada por el usuario. Sólo se escribe una entrada el primer día y cada día en que cambia
+alguno de los cuatro valores redondeados a la décima de minuto (utils/tabla_cambios.py)
 """""
-def calculo_paralaje(anio:int, dT: float):
-
-    dT = float(dT)
-    dT = dT/86400.0     #transformamos de segundos a días
-
-    #creamos una variable para el radio de la Tierra en UA
-    RadioTierra = 4.263523270752451e-05
-
-    #creamos un vector que almacene las alturas medias de Marte y Venus
-    AlturasGrados = np.array([20.0, 45.0, 70.0, 25.0], dtype=np.float64)       #indicamos que son de tipo flotante de 64 bits
-
-    #creamos un vector auxiliar para almacenar las alturas medias en radianes
-    AlturasRadianes = np.zeros(4, dtype=np.float64)
+def calculo_paralaje(anio:int, dT: float, salida=None):
 
     #pasamos a string el año para poder ponerlo en el nombre
     anio_str = str(anio)
@@ -142,124 +119,20 @@ def calculo_paralaje(anio:int, dT: float):
     vamos a buscar el directorio de datos/paralaje, para almacenar ahi el fichero .dat
     Para ello buscaremos las rutas
     """""
-    ruta_carpeta_datos = ruta_Padre.parent.parent / "data" / "almanaque_nautico" / anio_str
-
-    ruta_carpeta_datos.mkdir(parents=True, exist_ok=True) #en caso de que no exista la carpeta, la crea, si no sigue
+    if salida is None:
+        #en caso de que no exista la carpeta, la crea, si no sigue
+        salida = SalidaDirectorio(ruta_Padre.parent.parent / "data" / "almanaque_nautico" / anio_str)
     
     #creamos el fichero .dat
-    archivo_datos = ruta_carpeta_datos / f"AN{anio_str}387.dat"
-
-    with open(archivo_datos, 'w', encoding='utf8') as archivo_salida:
-        
-        #convertimos de grados a radianes   
-        AlturasRadianes[0] = math.radians(AlturasGrados[0])
-        AlturasRadianes[1] = math.radians(AlturasGrados[1])
-        AlturasRadianes[2] = math.radians(AlturasGrados[2])
-        AlturasRadianes[3] = math.radians(AlturasGrados[3])
-
-        #calculamos el número de días en el año
-        JulianoAnioActual = funciones.DiaJul(1,1,anio,0.0)
-        JulianoAnioSiguiente = funciones.DiaJul(1,1,anio+1,0.0)
-        diasTotales = int(JulianoAnioSiguiente - JulianoAnioActual + 0.5)
-
-        dJuliano = funciones.DiaJul(2,1,anio,0.0)
-
-        #calculamos la geodistancia entre de marte y venus
-
-        rMarte = read_de440.GeoDista(dJuliano, 4)      # 4 corresponde a Marte
-        rVenus = read_de440.GeoDista(dJuliano, 2)      # 2 corresponde a Venus
-        
-
-        #calculamos los valores angulares
-        angMarte1 = funciones.Rad2MArc(math.asin(RadioTierra / rMarte * math.cos(AlturasRadianes[0])))
-        angMarte2 = funciones.Rad2MArc(math.asin(RadioTierra / rMarte * math.cos(AlturasRadianes[1])))
-        angMarte3 = funciones.Rad2MArc(math.asin(RadioTierra / rMarte * math.cos(AlturasRadianes[2])))
-        angVenus = funciones.Rad2MArc(math.asin(RadioTierra / rVenus * math.cos(AlturasRadianes[3])))
-
-        #formateamos los valores a string para seguir el formato del .dat
-        #guardamos los datos del dia anterior para realizar comparaciones
-        diaPrevio = valores_A_string(angMarte1,angMarte2,angMarte3,angVenus)
-
-        #añadimos los simbolos positivos
-        diaPrevioSimb = signo_pos_A_string(diaPrevio)
-
-        #creamos las dos primeras lineas del .dat en el formato requerido
-        linea1 = f" Ene.&{1:2d}&           &           &           &           \\\\"
-        linea2 = (
-
-            f"     &  &$"
-            f"{diaPrevioSimb[12]}${diaPrevioSimb[13]}\\Minp "
-            f"{diaPrevioSimb[15]}&${diaPrevioSimb[0]}${diaPrevioSimb[1]}\\Minp "
-            f"{diaPrevioSimb[3]}&${diaPrevioSimb[4]}${diaPrevioSimb[5]}\\Minp "
-            f"{diaPrevioSimb[7]}&${diaPrevioSimb[8]}${diaPrevioSimb[9]}\\Minp "
-            f"{diaPrevioSimb[11]}\\\\"
-        )
-
-        #escribimos las lineas en el fichero
-        archivo_salida.write(linea1 + "\n")
-        archivo_salida.write(linea2 + "\n")
-
-        #realizamos un bucle for para el resto de días
-        for dia_del_anio in range(1, diasTotales):
-
-            #obtenemos el valor del dia juliano
-            dJuliano = JulianoAnioActual + dia_del_anio + dT
-
-            #recalculamos las geodistancias
-            rMarte = read_de440.GeoDista(dJuliano, 4)      
-            rVenus = read_de440.GeoDista(dJuliano, 2) 
-
-            #recalculamos los 4 angulos
-            angMarte1 = funciones.Rad2MArc(math.asin(RadioTierra / rMarte * math.cos(AlturasRadianes[0])))
-            angMarte2 = funciones.Rad2MArc(math.asin(RadioTierra / rMarte * math.cos(AlturasRadianes[1])))
-            angMarte3 = funciones.Rad2MArc(math.asin(RadioTierra / rMarte * math.cos(AlturasRadianes[2])))
-            angVenus = funciones.Rad2MArc(math.asin(RadioTierra / rMarte * math.cos(AlturasRadianes[3])))
-
-            #guardamos los valores del día actual
-            diaActual = valores_A_string(angMarte1,angMarte2,angMarte3,angVenus)
-
-            """""
-            Comparamos entre los datos del día previo y el actual
-            Si entramos en este if, indica que los valores han cambiado, luego hay que escribir una nueva línea en el .dat 
-            """""
-            if diaActual != diaPrevio:
-
-                #convertimos el Día juliano anterior a fecha legible
-                dia, mes, _anioCalculado, _hora = funciones.DJADia(dJuliano - 1)
-
-                #actualizamos el valor de diaPrevio con el valor de diaActual para la siguiente iteración
-                diaPrevio = diaActual
-
-                #añadimos los simbolos
-                diaPrevioSimb = signo_pos_A_string(diaPrevio)
-
-                #escribimos la nueva línea con la información obtenida
-                linea1 =( 
-                    f" {funciones.MesNom(mes)}&{dia:2d}&           &           "
-                    f"&           &           \\\\"
-                )
-
-                linea2 =(
-                    f"     &  &$"
-                    f"{diaPrevioSimb[12]}${diaPrevioSimb[13]}\\Minp "
-                    f"{diaPrevioSimb[15]}&${diaPrevioSimb[0]}${diaPrevioSimb[1]}\\Minp "
-                    f"{diaPrevioSimb[3]}&${diaPrevioSimb[4]}${diaPrevioSimb[5]}\\Minp "
-                    f"{diaPrevioSimb[7]}&${diaPrevioSimb[8]}${diaPrevioSimb[9]}\\Minp "
-                    f"{diaPrevioSimb[11]}\\\\"            
-                )
+    archivo_datos = f"AN{anio_str}387.dat"
 
-                archivo_salida.write(linea1 + "\n")
-                archivo_salida.write(linea2 + "\n")
-            
-        #finalmente, escribimos la última línea (que correspondería al 31 de Diciembre)
-        lineaFinal = (
-            f" Dic.&{31:2d}&           &           "
-            f"&           &           \\\\"
-        )
+    dJuliano, paralajes = calcular_paralajes(anio, dT)
+    lineas = tabla_cambios.tabla_cambios(dJuliano, paralajes[:, ORDEN_COLUMNAS])
 
-        archivo_salida.write(lineaFinal + "\n")
+    with salida.abrir(archivo_datos, encoding='utf8') as archivo_salida:
+        archivo_salida.write("\n".join(lineas) + "\n")
 
-    return str(ruta_carpeta_datos)      #devolvemos, en formato cadena, el directorio del .dat generado
+    return str(salida)      #devolvemos, en formato cadena, el directorio (o ZIP) del .dat generado
 
 """""
 #Prueba de generación
@@ -1,9 +1,15 @@
+import calendar
 import math
 import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+
+import numpy as np
 from skyfield.api import Star
 # Importamos la utilidad de Skyfield compartida
 from utils import read_de440
+from utils.salida import SalidaDirectorio
 # =============================================================================
 # 1. CONFIGURACIÓN DE RUTAS
 # =============================================================================
@@ -41,352 +47,282 @@ def crear_carpeta_resultados(ano):
         print(f"Error creando directorio {ano_dir}: {e}")
         sys.exit(1)
 
-def generar_datos_polar(ano, valor_delta_t):
+# Estrella de Skyfield de la Polar (conversión de unidades de POLAR_J2000)
+# Movimientos propios: s/siglo -> mas/año  (1 s = 15000 mas.  1 " = 1000 mas.)
+POLARIS = Star(
+    ra_hours=POLAR_J2000['ra_rad'] * 12.0 / PI,
+    dec_degrees=POLAR_J2000['dec_rad'] * 180.0 / PI,
+    ra_mas_per_year=(19.877 * 15000.0) / 100.0,
+    dec_mas_per_year=(-1.52 * 1000.0) / 100.0,
+    parallax_mas=0.0
+)
+
+# Rejillas de las tablas: medias horas de la Tabla I (filas) y columnas de 26°,
+# ángulos horarios de las Tablas II-III (20°) y de los azimutes (10°) y alturas
+# de 10° a 65° de 5 en 5.
+MEDIAS_HORAS_TABLA_I = np.arange(53)
+COLUMNAS_TABLA_I = 26 * np.arange(7)
+INICIO_382 = 0
+INICIO_383 = 364
+FILAS_VACIAS_383 = 44       # A partir de esta fila la última columna de 383 va vacía
+ANGULOS_TABLA_II = 20.0 * np.arange(19)
+ANGULOS_AZIMUT = 10.0 * np.arange(37)
+ALTURAS = 5.0 * np.arange(2, 14)
+
+CELDA_VACIA_TABLA_I = "   &  &   &     "
+
+
+def calcular_posiciones_polar(ano):
     """
-    Genera los cálculos de la Polar para el almanaque.
-    Retorna: str (ruta del directorio de salida)
+    CABECERA:       calcular_posiciones_polar(ano)
+    DESCRIPCIÓN:    Posición aparente de la Polar (ecuador y equinoccio
+                    verdaderos de la fecha) el día 1 de cada mes del año y el
+                    1 de enero del siguiente, en una sola llamada a Skyfield.
+
+    PRECONDICIÓN:   'ano': año del almanaque. Efemérides cargadas en read_de440.
+
+    POSTCONDICIÓN:  (al, de): arrays de 13 valores con la ascensión recta y la
+                    declinación en radianes.
     """
-    print("*" * 70)
-    print("PÁGINAS 382-385\n") 
+    if hasattr(read_de440, 'load_data'):
+        read_de440.load_data()
+
+    ts = read_de440._ts
+    earth = read_de440._planets['earth']
 
+    # Mes 13 = enero del año siguiente
+    anios = np.full(13, ano)
+    anios[12] = ano + 1
+    meses = np.r_[1:13, 1]
+    t = ts.ut1(anios, meses, 1)
 
-    resultados_dir = crear_carpeta_resultados(ano)
-    can = str(ano)
-    print(f"Guardando en: {resultados_dir}")
+    ra, dec, _ = earth.at(t).observe(POLARIS).apparent().radec(epoch='date')
+    return ra.radians, dec.radians
+
+
+def _tabla_i(a0, cd, inicio):
+    """Ángulos (grados) y correcciones (minutos) de la Tabla I desde la media hora 'inicio'."""
+    angulos = 0.5 * (inicio + MEDIAS_HORAS_TABLA_I[:, None]) + COLUMNAS_TABLA_I
+    valores = -cd * np.cos(angulos * DEG - a0) * 60.0 / DEG
+    return angulos, valores
+
+
+def _tabla_ii(a0, cd):
+    """Corrección por altura (Tabla II): ángulos horarios x alturas."""
+    t_val = ANGULOS_TABLA_II[:, None] * DEG - a0
+    return 0.5 * (cd**2) * (np.sin(t_val)**2) * np.tan(ALTURAS * DEG) * (60.0 / DEG)
+
+
+def _tabla_iii(a0, d0, cd, al, de):
+    """Corrección por fecha (Tabla III): ángulos horarios x meses."""
+    t_val = ANGULOS_TABLA_II[:, None] * DEG - a0
+    term1 = (de - d0) * np.cos(t_val)
+    term2 = cd * np.sin(al - a0) * np.sin(t_val)
+    return (term1 - term2) * (60.0 / DEG)
+
+
+def _azimutes(a0, d0):
+    """Azimut de la Polar (grados): ángulos horarios x alturas."""
+    t_val = ANGULOS_AZIMUT[:, None] * DEG - a0
+    denom = math.tan(d0) * np.cos(ALTURAS * DEG)
+    return np.arctan(-np.sin(t_val) / denom) / DEG
+
+
+# =============================================================================
+# CONSULTA DE CORRECCIONES PARA UN INSTANTE CUALQUIERA
+# =============================================================================
+@dataclass(slots=True)
+class CorreccionPolar:
+    """
+    Correcciones de la Polar para uno o varios instantes, con las mismas
+    magnitudes que las Tablas I-III (páginas 382-384) y los azimutes de la 385,
+    pero calculadas con la posición del día en lugar de la del día 1 del mes.
+    """
+    q1: np.ndarray          # Tabla I (minutos de arco)
+    q2: np.ndarray          # Tabla II (minutos de arco)
+    q3: np.ndarray          # Tabla III (minutos de arco)
+    latitud: np.ndarray     # Altura + Q1 + Q2 + Q3 (grados)
+    azimut: np.ndarray      # Grados, con el signo de la página 385
 
-    # --- Cargar Efemérides (Lazy Loading) ---
+
+@lru_cache(maxsize=8)
+def efemeride_diaria_polar(ano):
+    """
+    CABECERA:       efemeride_diaria_polar(ano)
+    DESCRIPCIÓN:    Posición aparente de la Polar a 0h UT1 de cada día del año
+                    (y del 1 de enero del siguiente) junto con las medias
+                    anuales de las tablas. Se calcula una sola vez por año y se
+                    guarda en memoria para las consultas de 'polaris_correction'.
+
+    PRECONDICIÓN:   'ano': año (entero).
+
+    POSTCONDICIÓN:  (jd, al, de, a0, d0): días julianos UT1, ascensión recta y
+                    declinación diarias (radianes, arrays de sólo lectura) y
+                    medias anuales a0, d0 (radianes) de 'calcular_posiciones_polar'.
+    """
     if hasattr(read_de440, 'load_data'):
         read_de440.load_data()
-    
+
     ts = read_de440._ts
     earth = read_de440._planets['earth']
 
-    # --- CREAR OBJETO ESTRELLA (CON PROTECCIÓN DE VERSIÓN) ---
-    
-    # 1. Conversión de unidades a Skyfield
-    ra_hours = POLAR_J2000['ra_rad'] * 12.0 / PI
-    dec_deg = POLAR_J2000['dec_rad'] * 180.0 / PI
-    
-    # Movimientos propios: s/siglo -> mas/año
-    # 1 s = 15000 mas.  1 " = 1000 mas.
-    pm_ra_mas = (19.877 * 15000.0) / 100.0
-    pm_dec_mas = (-1.52 * 1000.0) / 100.0
-        
-    polaris = Star(
-        ra_hours=ra_hours,
-        dec_degrees=dec_deg,
-        ra_mas_per_year=pm_ra_mas,
-        dec_mas_per_year=pm_dec_mas,
-        parallax_mas=0.0
-    )
-
-    # Arrays
-    al = [0.0] * 13
-    de = [0.0] * 13
-    a0 = 0.0
-    d0 = 0.0
-
-    #print("\nCalculando posiciones mensuales...")
-
-    # --- BUCLE MENSUAL (1 a 13) ---
-    for k in range(1, 14):
-        # Gestionar fecha (Mes 13 es Enero del año siguiente)
-        mes_calc = k
-        anio_calc = ano
-        if k == 13:
-            mes_calc = 1
-            anio_calc = ano + 1
-            
-        # Calcular Tiempos (usará el Delta T configurado en _ts)
-        t = ts.ut1(anio_calc, mes_calc, 1)
-        
-        # Observación con Skyfield
-        astrometric = earth.at(t).observe(polaris)
-        apparent = astrometric.apparent()
-        
-        # Obtener coordenadas a la fecha (True Equator & Equinox of Date)
-        ra, dec, _ = apparent.radec(epoch='date')
-        
-        al[k-1] = ra.radians
-        de[k-1] = dec.radians
-        
-        a0 += ra.radians
-        d0 += dec.radians
-
-        # Debug visual (Grados Min Seg)
-        ase = al[k-1] / DEG
-        agr = int(ase); ase = 60.0 * (ase - agr); ami = int(ase); ase = 60.0 * (ase - ami)
-        dse = de[k-1] / DEG
-        dgr = int(dse); dse = 60.0 * (dse - dgr); dmi = int(dse); dse = 60.0 * (dse - dmi)
-        #print(f"{k:2d} {agr:3d} {ami:2d} {ase:5.2f} {dgr:2d} {dmi:2d} {dse:5.2f}")
-
-    # Medias
-    a0 = a0 / 13.0
-    d0 = d0 / 13.0
+    dias = 366 if calendar.isleap(ano) else 365
+    t = ts.ut1(ano, 1, np.arange(1, dias + 2))
+    ra, dec, _ = earth.at(t).observe(POLARIS).apparent().radec(epoch='date')
+
+    al_mes, de_mes = calcular_posiciones_polar(ano)
+
+    jd = t.ut1
+    al = np.unwrap(ra.radians)
+    de = dec.radians
+    for array in (jd, al, de):
+        array.setflags(write=False)
+    return jd, al, de, float(np.mean(al_mes)), float(np.mean(de_mes))
+
+
+def polaris_correction(jd, lha, altitude):
+    """
+    CABECERA:       polaris_correction(jd, lha, altitude)
+    DESCRIPCIÓN:    Correcciones de latitud y azimut de la Polar para cualquier
+                    instante, sin interpolar en las tablas impresas. Q1 y Q2
+                    usan las medias anuales de las Tablas I y II; Q3 y el
+                    azimut usan la posición del instante, interpolada
+                    linealmente en la efeméride diaria del año.
+
+    PRECONDICIÓN:   'jd': día juliano UT1 (escalar o array).
+                    'lha': horario local de Aries en grados.
+                    'altitude': altura verdadera de la Polar en grados.
+                    Los tres argumentos se combinan por broadcasting.
+
+    POSTCONDICIÓN:  CorreccionPolar con Q1, Q2, Q3 (minutos de arco), latitud
+                    (grados) y azimut (grados); escalares si las entradas lo son.
+    """
+    jd, lha, altitude = np.broadcast_arrays(np.asarray(jd, dtype=float),
+                                            np.asarray(lha, dtype=float),
+                                            np.asarray(altitude, dtype=float))
+
+    if hasattr(read_de440, 'load_data'):
+        read_de440.load_data()
+    anos = np.asarray(read_de440._ts.ut1_jd(jd).ut1_calendar()[0])
+
+    # Posición del instante y medias anuales, año a año
+    al = np.empty(jd.shape)
+    de = np.empty(jd.shape)
+    a0 = np.empty(jd.shape)
+    d0 = np.empty(jd.shape)
+    for ano in np.unique(anos):
+        sel = anos == ano
+        jd_dia, al_dia, de_dia, a0[sel], d0[sel] = efemeride_diaria_polar(int(ano))
+        al[sel] = np.interp(jd[sel], jd_dia, al_dia)
+        de[sel] = np.interp(jd[sel], jd_dia, de_dia)
+
     cd = PI / 2.0 - d0
-    
-    #print('\nGenerando TABLA I...')
+    t_val = lha * DEG - a0
+    alt = altitude * DEG
 
-    # =========================================================================
-    # TABLA I (382.DAT y 383.DAT)
-    # =========================================================================
-    
-    u = [""] * 53
-
-    # Generación de datos brutos PARTE 1 (0 a 52)
-    for k in range(0, 53):
-        line_segments = [] 
-        for j in range(0, 7):
-            # CORRECCIÓN: Calcular valor numérico exacto para el entero
-            # Evitamos (val * DEG) / DEG que causa errores de flotante (15.0 -> 14.999)
-            angle_float = 0.5 * k + 26 * j
-            
-            # Usamos este valor 'limpio' para los cálculos trigonométricos
-            h_val = angle_float * DEG 
-            t_val = h_val - a0
-            val = -cd * math.cos(t_val) * 60.0 / DEG
-            
-            # Usamos el valor 'limpio' para el entero (truncar)
-            angle_int = int(angle_float)
-            
-            sign_char = '+' if val >= 0 else '-'
-            value = abs(val)
-            
-            angle_str = f"{angle_int:6d}"
-            sign_str  = f"{sign_char:3s}"
-            value_str = f"{value:5.1f}"
-            
-            line_segments.append(f"{angle_str}{sign_str}{value_str}")
-            
-        u[k] = "".join(line_segments)
-        
-        # Limpieza
-        if len(u[k]) >= 98:
-            u_list = list(u[k])
-            positions = [6, 20, 34, 48, 62, 76, 90]
-            for pos in positions:
-                if pos < len(u_list) and u_list[pos] == ' ': u_list[pos] = '+'
-            
-            zero_positions = [(10, 14), (24, 28), (38, 42), (52, 56), (66, 70), (80, 84), (94, 98)]
-            zero_indicators = [6, 20, 34, 48, 62, 76, 90]
-            for (start, end), indicator_pos in zip(zero_positions, zero_indicators):
-                if start < len(u[k]) and end <= len(u[k]):
-                    if "".join(u_list[start:end]) == '  0.0':
-                        u_list[indicator_pos] = ' '
-            u[k] = "".join(u_list)
-
-    # --- ESCRIBIR 382.DAT ---
-    archivo_382 = resultados_dir / f'AN{can}382.DAT'
-    with open(archivo_382, 'w', encoding='utf-8') as f:
-        for k in range(0, 53):
-            if len(u[k]) != 98: continue
-            
-            segments = [u[k][i*14 : (i+1)*14] for i in range(7)]
-            minutes = "00" if k % 2 == 0 else "30"
-            
-            latex_cols = []
-            for seg in segments:
-                ang = seg[0:6].strip()
-                sig = seg[6:9].strip()
-                val = seg[9:14]
-                
-                ang_fmt = f"{int(ang):3d}"
-                sig_tex = f"${sig}$" if sig else "   "
-                
-                latex_cols.append(f"{ang_fmt}&{minutes}&{sig_tex}&{val}")
-            
-            line = "&".join(latex_cols) + "\\\\"
-            if k % 2 == 1 and (k // 2) % 3 == 2:
-                line = line.replace("\\\\", "\\\\[1ex]")
-            f.write(line + '\n')
-            
-    #print(f"-> {archivo_382.name} generado.")
+    q1 = -cd * np.cos(t_val) * 60.0 / DEG
+    q2 = 0.5 * (cd**2) * (np.sin(t_val)**2) * np.tan(alt) * (60.0 / DEG)
+    q3 = ((de - d0) * np.cos(t_val) - cd * np.sin(al - a0) * np.sin(t_val)) * (60.0 / DEG)
+    azimut = np.arctan(-np.sin(lha * DEG - al) / (np.tan(de) * np.cos(alt))) / DEG
 
-    # --- GENERAR SEGUNDA PARTE (383.DAT) ---    
-    u = [""] * 53 
-    offset_k = 364
+    latitud = altitude + (q1 + q2 + q3) / 60.0
+    return CorreccionPolar(q1[()], q2[()], q3[()], latitud[()], azimut[()])
 
-    for k in range(offset_k, 52 + offset_k + 1):
-        m = k - offset_k 
-        if m > 52: break
-        
-        line_segments = [] 
-        for j in range(7):
-            # Cálculo del ángulo y valor
-            angle_float = 0.5 * k + 26 * j
-            h_val = angle_float * DEG
-            t_val = h_val - a0
-            val = -cd * math.cos(t_val) * 60.0 / DEG
-            
-            angle_int = int(angle_float)
-            
-            signo = '+' if val >= 0 else '-'
-            val_abs = abs(val)
-            
-            # FORMATO CORREGIDO: Mantener 6 caracteres para el ángulo pero alineado a la derecha
-            angle_str = f"{angle_int:6d}"      # ← VOLVEMOS A 6d para mantener 14 chars
-            sign_str = f"{signo:3s}"           # 3 caracteres para signo
-            value_str = f"{val_abs:5.1f}"      # 5 caracteres para valor
-            
-            # Segmento de 14 caracteres exactos
-            seg = f"{angle_str}{sign_str}{value_str}"
-            line_segments.append(seg)
-            
-        raw_line = "".join(line_segments)
-        
-        # Limpieza de signos (igual que en 382)
-        if len(raw_line) >= 98:
-            u_list = list(raw_line)
-            
-            # Poner '+' en huecos
-            positions = [6, 20, 34, 48, 62, 76, 90]
-            for pos in positions:
-                if pos < len(u_list) and u_list[pos] == ' ': 
-                    u_list[pos] = '+'
-            
-            # Quitar signo si es 0.0
-            zero_positions = [(10, 14), (24, 28), (38, 42), (52, 56), (66, 70), (80, 84), (94, 98)]
-            zero_indicators = [6, 20, 34, 48, 62, 76, 90]
-            for (start, end), indicator_pos in zip(zero_positions, zero_indicators):
-                if start < len(raw_line) and end <= len(raw_line):
-                    if raw_line[start:end] == '  0.0':
-                        u_list[indicator_pos] = ' '
-            
-            # Limpiar últimas columnas si m > 44
-            if m > 44 and len(u_list) >= 98:
-                u_list[84:98] = list('              ')
-                
-            u[m] = "".join(u_list)
-        else:
-            u[m] = raw_line
-
-    # --- ESCRIBIR 383.DAT ---
-    archivo_383 = resultados_dir / f'AN{can}383.DAT'
-    with open(archivo_383, 'w', encoding='utf-8') as f:
-        for k in range(0, 53):
-            if len(u[k]) < 98: 
-                continue
-                
-            minutes = "00" if k % 2 == 0 else "30"
-            latex_cols = []
-            segments = [u[k][i*14 : (i+1)*14] for i in range(7)]
-            
-            for seg in segments:
-                if not seg.strip():
-                    latex_cols.append("   &  &   &     ")
-                    continue
-                    
-                # Parseo CORREGIDO: Extraer partes y limpiar espacios
-                ang = seg[0:6].strip()    # "   182" -> "182"
-                sig = seg[6:9].strip()    # "  +" -> "+"  
-                val = seg[9:14]           # " 31.0" (sin strip para mantener espacios)
-                
-                # Formatear para LaTeX - ÁNGULO SIN ESPACIOS EXTRAS
-                ang_fmt = f"{int(ang):3d}" if ang.strip() else "   "
-                sig_tex = f"${sig}$" if sig else "   "
-                
-                latex_cols.append(f"{ang_fmt}&{minutes}&{sig_tex}&{val}")
-                
-            line = "&".join(latex_cols) + "\\\\"
-            
-            # Salto extra
-            if k % 2 == 1 and (k // 2) % 3 == 2:
-                line = line.replace("\\\\", "\\\\[1ex]")
-            
-            f.write(line + '\n')                
+
+def _celdas_tabla_i(angulos, valores, minutos):
+    """Celdas 'ángulo&minutos&$signo$&valor' de una fila de la Tabla I."""
+    return [f"{int(ang):3d}&{minutos}&${'+' if val >= 0 else '-'}$&{abs(val):5.1f}"
+            for ang, val in zip(angulos, valores)]
+
+
+def _celdas_signo(valores, separador=""):
+    """Celdas '$signo$valor' (sin signo si el valor redondea a cero)."""
+    return [f"$ ${separador}0.0" if abs(val) < 0.05
+            else f"${'+' if val >= 0 else '-'}${separador}{abs(val):.1f}"
+            for val in valores]
+
+
+def _fin_linea(espacio):
+    return "\\\\[" + espacio + "]" if espacio else "\\\\"
+
+
+def _escribir_tabla_i(f, angulos, valores, filas_vacias=None):
+    """Escribe 382/383: 53 medias horas, con la última columna vacía desde 'filas_vacias'."""
+    for k in range(len(MEDIAS_HORAS_TABLA_I)):
+        minutos = "00" if k % 2 == 0 else "30"
+        celdas = _celdas_tabla_i(angulos[k].tolist(), valores[k].tolist(), minutos)
+        if filas_vacias is not None and k > filas_vacias:
+            celdas[-1] = CELDA_VACIA_TABLA_I
+        espacio = "1ex" if k % 2 == 1 and (k // 2) % 3 == 2 else ""
+        f.write("&".join(celdas) + _fin_linea(espacio) + '\n')
+
+
+def generar_datos_polar(ano, valor_delta_t, salida=None):
+    """
+    Genera los cálculos de la Polar para el almanaque.
+    'valor_delta_t': no se usa; se mantiene por compatibilidad con los demás
+    generadores. Las posiciones se calculan en UT1 con el Delta T de la escala
+    de tiempo de Skyfield (read_de440._ts), como en las versiones anteriores.
+    'salida': destino de utils/salida.py (por defecto data/almanaque_nautico/AAAA).
+    Retorna: str (ruta del directorio o ZIP de salida)
+    """
+    print("*" * 70)
+    print("PÁGINAS 382-385\n") 
+
+
+    if salida is None:
+        salida = SalidaDirectorio(crear_carpeta_resultados(ano))
+    can = str(ano)
+    print(f"Guardando en: {salida}")
+
+    # --- Posiciones mensuales (1 a 13) y medias ---
+    al, de = calcular_posiciones_polar(ano)
+    a0 = float(np.mean(al))
+    d0 = float(np.mean(de))
+    cd = PI / 2.0 - d0
 
     # =========================================================================
-    # TABLA II (384A.DAT)
+    # TABLA I (382.DAT y 383.DAT)
     # =========================================================================
-    #print('\nGenerando TABLA II...')
-    archivo_384a = resultados_dir / f'AN{can}384A.DAT'
-    
-    with open(archivo_384a, 'w', encoding='utf-8') as f:
-        for j in range(19):
-            ha = 20.0 * j * DEG
-            t_val = ha - a0
-            cols = []
-            cols.append(f"{int(ha/DEG+0.5):3d}")
-            
-            for k in range(2, 14):
-                alt = 5.0 * k * DEG
-                val = 0.5 * (cd**2) * (math.sin(t_val)**2) * math.tan(alt) * (60.0 / DEG)
-                cols.append(f"{val:3.1f}")
-            
-            line = "&".join(cols) + "\\\\"
-            if j != 0 and (j % 5 == 0 or j == 18):
-                line = line.replace("\\\\", "\\\\[2ex]")
-            f.write(line + '\n')
-    #print(f"-> {archivo_384a.name} generado.")
+    with salida.abrir(f'AN{can}382.DAT', encoding='utf-8') as f:
+        _escribir_tabla_i(f, *_tabla_i(a0, cd, INICIO_382))
+
+    with salida.abrir(f'AN{can}383.DAT', encoding='utf-8') as f:
+        _escribir_tabla_i(f, *_tabla_i(a0, cd, INICIO_383), filas_vacias=FILAS_VACIAS_383)
 
     # =========================================================================
-    # TABLA III (384B.DAT)
+    # TABLA II (384A.DAT) y TABLA III (384B.DAT)
     # =========================================================================
-    #print(' TABLA III')
-    archivo_384b = resultados_dir / f'AN{can}384B.DAT'
-    
-    with open(archivo_384b, 'w', encoding='utf-8') as f:
-        for j in range(19):
-            ha = 20.0 * j * DEG
-            t_val = ha - a0
-            cols = [f"{int(ha/DEG+0.5):3d}"]
-            
-            for k in range(1, 14):
-                term1 = (de[k-1] - d0) * math.cos(t_val)
-                term2 = cd * math.sin(al[k-1] - a0) * math.sin(t_val)
-                val = (term1 - term2) * (60.0 / DEG)
-                
-                if abs(val) < 0.05:
-                    sig = " "
-                    num = "0.0"
-                else:
-                    sig = "+" if val >= 0 else "-"
-                    num = f"{abs(val):.1f}"
-                cols.append(f"${sig}$&{num}")
-            
-            line = "&".join(cols) + "\\\\"
-            if j % 5 == 0 and j != 0:
-                line = line.replace("\\\\", "\\\\[2ex]")
-            f.write(line + '\n')
-    #print(f"-> {archivo_384b.name} generado.")
+    angulos = (ANGULOS_TABLA_II * DEG / DEG + 0.5).astype(int).tolist()
+    tabla_ii = _tabla_ii(a0, cd).tolist()
+    tabla_iii = _tabla_iii(a0, d0, cd, al, de).tolist()
+
+    with salida.abrir(f'AN{can}384A.DAT', encoding='utf-8') as f:
+        for j, (ang, fila) in enumerate(zip(angulos, tabla_ii)):
+            celdas = [f"{ang:3d}"] + [f"{val:3.1f}" for val in fila]
+            espacio = "2ex" if j != 0 and (j % 5 == 0 or j == 18) else ""
+            f.write("&".join(celdas) + _fin_linea(espacio) + '\n')
+
+    with salida.abrir(f'AN{can}384B.DAT', encoding='utf-8') as f:
+        for j, (ang, fila) in enumerate(zip(angulos, tabla_iii)):
+            celdas = [f"{ang:3d}"] + _celdas_signo(fila, separador="&")
+            espacio = "2ex" if j % 5 == 0 and j != 0 else ""
+            f.write("&".join(celdas) + _fin_linea(espacio) + '\n')
 
     # =========================================================================
     # AZIMUTES (385.DAT)
     # =========================================================================
-    #print(' AZIMUTES')
-    archivo_385 = resultados_dir / f'AN{can}385.DAT'
-    
-    with open(archivo_385, 'w', encoding='utf-8') as f:
-        for j in range(37):
-            ha = 10.0 * j * DEG
-            t_val = ha - a0
+    with salida.abrir(f'AN{can}385.DAT', encoding='utf-8') as f:
+        for j, fila in enumerate(_azimutes(a0, d0).tolist()):
             ha_val = 10 * j
-            
-            line = f"\\bf {ha_val:3d}"
-            for k in range(2, 14):
-                alt = 5.0 * k * DEG
-                denom = math.tan(d0) * math.cos(alt)
-                val = math.atan(-math.sin(t_val) / denom) / DEG
-                
-                if abs(val) < 0.05:
-                    sig = " "
-                    num = "0.0"
-                else:
-                    sig = "+" if val >= 0 else "-"
-                    num = f"{abs(val):3.1f}"
-                
-                line += f"&${sig}${num}"
-            
-            line += f"&\\bf {ha_val:3d}"
-            eol = "\\\\"
-            if j % 4 == 3: eol = "\\\\[2ex]"
-            f.write(line + eol + '\n')
+            celdas = [f"\\bf {ha_val:3d}"] + _celdas_signo(fila) + [f"\\bf {ha_val:3d}"]
+            espacio = "2ex" if j % 4 == 3 else ""
+            f.write("&".join(celdas) + _fin_linea(espacio) + '\n')
     
-    return str(resultados_dir)
+    return str(salida)
 
 def main():
-    print("*" * 70)
-    print("PÁGINAS 382-385\n")
+    val_dt = None
     try:
         
         while True: 
@@ -394,7 +330,6 @@ def main():
                 ano = input("Introduzca año (XXXX): ")                
                 ano_int = int(ano)
                 if 1550 <= ano_int <= 2650:
-                    can = str(ano_int)                    
                     ano = ano_int
                     break
                 else: 
@@ -423,6 +358,7 @@ def main():
                 try:
                     val_dt = float(input(" Introduzca valor de Delta T (segundos): "))                    
                     print(f" -> Delta T fijado manualmente a: {val_dt:.2f} s")
+                    print("    (las páginas de la Polar usan el Delta T de la escala de tiempo)")
                     seleccionado = True
                 except ValueError:
                     print(" [!] Valor numérico no válido. Inténtelo de nuevo.")
@@ -431,339 +367,7 @@ def main():
     except ValueError:
         return
 
-    resultados_dir = crear_carpeta_resultados(ano)
-    print(f"Guardando en: {resultados_dir}")
-
-    # --- Cargar Efemérides (Lazy Loading) ---
-    if hasattr(read_de440, 'load_data'):
-        read_de440.load_data()
-    
-    ts = read_de440._ts
-    earth = read_de440._planets['earth']
-
-    # --- CREAR OBJETO ESTRELLA (CON PROTECCIÓN DE VERSIÓN) ---
-    
-    # 1. Conversión de unidades a Skyfield
-    ra_hours = POLAR_J2000['ra_rad'] * 12.0 / PI
-    dec_deg = POLAR_J2000['dec_rad'] * 180.0 / PI
-    
-    # Movimientos propios: s/siglo -> mas/año
-    # 1 s = 15000 mas.  1 " = 1000 mas.
-    pm_ra_mas = (19.877 * 15000.0) / 100.0
-    pm_dec_mas = (-1.52 * 1000.0) / 100.0
-        
-    polaris = Star(
-        ra_hours=ra_hours,
-        dec_degrees=dec_deg,
-        ra_mas_per_year=pm_ra_mas,
-        dec_mas_per_year=pm_dec_mas,
-        parallax_mas=0.0
-    )
-
-    # Arrays
-    al = [0.0] * 13
-    de = [0.0] * 13
-    a0 = 0.0
-    d0 = 0.0
-
-    #print("\nCalculando posiciones mensuales...")
-
-    # --- BUCLE MENSUAL (1 a 13) ---
-    for k in range(1, 14):
-        # Gestionar fecha (Mes 13 es Enero del año siguiente)
-        mes_calc = k
-        anio_calc = ano
-        if k == 13:
-            mes_calc = 1
-            anio_calc = ano + 1
-            
-        # Calcular Tiempos (usará el Delta T configurado en _ts)
-        t = ts.ut1(anio_calc, mes_calc, 1)
-        
-        # Observación con Skyfield
-        astrometric = earth.at(t).observe(polaris)
-        apparent = astrometric.apparent()
-        
-        # Obtener coordenadas a la fecha (True Equator & Equinox of Date)
-        ra, dec, _ = apparent.radec(epoch='date')
-        
-        al[k-1] = ra.radians
-        de[k-1] = dec.radians
-        
-        a0 += ra.radians
-        d0 += dec.radians
-
-        # Debug visual (Grados Min Seg)
-        ase = al[k-1] / DEG
-        agr = int(ase); ase = 60.0 * (ase - agr); ami = int(ase); ase = 60.0 * (ase - ami)
-        dse = de[k-1] / DEG
-        dgr = int(dse); dse = 60.0 * (dse - dgr); dmi = int(dse); dse = 60.0 * (dse - dmi)
-        #print(f"{k:2d} {agr:3d} {ami:2d} {ase:5.2f} {dgr:2d} {dmi:2d} {dse:5.2f}")
-
-    # Medias
-    a0 = a0 / 13.0
-    d0 = d0 / 13.0
-    cd = PI / 2.0 - d0
-    
-    #print('\nGenerando TABLA I...')
-
-    # =========================================================================
-    # TABLA I (382.DAT y 383.DAT)
-    # =========================================================================
-    
-    u = [""] * 53
-
-    # Generación de datos brutos PARTE 1 (0 a 52)
-    for k in range(0, 53):
-        line_segments = [] 
-        for j in range(0, 7):
-            # CORRECCIÓN: Calcular valor numérico exacto para el entero
-            # Evitamos (val * DEG) / DEG que causa errores de flotante (15.0 -> 14.999)
-            angle_float = 0.5 * k + 26 * j
-            
-            # Usamos este valor 'limpio' para los cálculos trigonométricos
-            h_val = angle_float * DEG 
-            t_val = h_val - a0
-            val = -cd * math.cos(t_val) * 60.0 / DEG
-            
-            # Usamos el valor 'limpio' para el entero (truncar)
-            angle_int = int(angle_float)
-            
-            sign_char = '+' if val >= 0 else '-'
-            value = abs(val)
-            
-            angle_str = f"{angle_int:6d}"
-            sign_str  = f"{sign_char:3s}"
-            value_str = f"{value:5.1f}"
-            
-            line_segments.append(f"{angle_str}{sign_str}{value_str}")
-            
-        u[k] = "".join(line_segments)
-        
-        # Limpieza
-        if len(u[k]) >= 98:
-            u_list = list(u[k])
-            positions = [6, 20, 34, 48, 62, 76, 90]
-            for pos in positions:
-                if pos < len(u_list) and u_list[pos] == ' ': u_list[pos] = '+'
-            
-            zero_positions = [(10, 14), (24, 28), (38, 42), (52, 56), (66, 70), (80, 84), (94, 98)]
-            zero_indicators = [6, 20, 34, 48, 62, 76, 90]
-            for (start, end), indicator_pos in zip(zero_positions, zero_indicators):
-                if start < len(u[k]) and end <= len(u[k]):
-                    if "".join(u_list[start:end]) == '  0.0':
-                        u_list[indicator_pos] = ' '
-            u[k] = "".join(u_list)
-
-    # --- ESCRIBIR 382.DAT ---
-    archivo_382 = resultados_dir / f'AN{can}382.DAT'
-    with open(archivo_382, 'w', encoding='utf-8') as f:
-        for k in range(0, 53):
-            if len(u[k]) != 98: continue
-            
-            segments = [u[k][i*14 : (i+1)*14] for i in range(7)]
-            minutes = "00" if k % 2 == 0 else "30"
-            
-            latex_cols = []
-            for seg in segments:
-                ang = seg[0:6].strip()
-                sig = seg[6:9].strip()
-                val = seg[9:14]
-                
-                ang_fmt = f"{int(ang):3d}"
-                sig_tex = f"${sig}$" if sig else "   "
-                
-                latex_cols.append(f"{ang_fmt}&{minutes}&{sig_tex}&{val}")
-            
-            line = "&".join(latex_cols) + "\\\\"
-            if k % 2 == 1 and (k // 2) % 3 == 2:
-                line = line.replace("\\\\", "\\\\[1ex]")
-            f.write(line + '\n')
-            
-    #print(f"-> {archivo_382.name} generado.")
-
-    # --- GENERAR SEGUNDA PARTE (383.DAT) ---    
-    u = [""] * 53 
-    offset_k = 364
-
-    for k in range(offset_k, 52 + offset_k + 1):
-        m = k - offset_k 
-        if m > 52: break
-        
-        line_segments = [] 
-        for j in range(7):
-            # Cálculo del ángulo y valor
-            angle_float = 0.5 * k + 26 * j
-            h_val = angle_float * DEG
-            t_val = h_val - a0
-            val = -cd * math.cos(t_val) * 60.0 / DEG
-            
-            angle_int = int(angle_float)
-            
-            signo = '+' if val >= 0 else '-'
-            val_abs = abs(val)
-            
-            # FORMATO CORREGIDO: Mantener 6 caracteres para el ángulo pero alineado a la derecha
-            angle_str = f"{angle_int:6d}"      # ← VOLVEMOS A 6d para mantener 14 chars
-            sign_str = f"{signo:3s}"           # 3 caracteres para signo
-            value_str = f"{val_abs:5.1f}"      # 5 caracteres para valor
-            
-            # Segmento de 14 caracteres exactos
-            seg = f"{angle_str}{sign_str}{value_str}"
-            line_segments.append(seg)
-            
-        raw_line = "".join(line_segments)
-        
-        # Limpieza de signos (igual que en 382)
-        if len(raw_line) >= 98:
-            u_list = list(raw_line)
-            
-            # Poner '+' en huecos
-            positions = [6, 20, 34, 48, 62, 76, 90]
-            for pos in positions:
-                if pos < len(u_list) and u_list[pos] == ' ': 
-                    u_list[pos] = '+'
-            
-            # Quitar signo si es 0.0
-            zero_positions = [(10, 14), (24, 28), (38, 42), (52, 56), (66, 70), (80, 84), (94, 98)]
-            zero_indicators = [6, 20, 34, 48, 62, 76, 90]
-            for (start, end), indicator_pos in zip(zero_positions, zero_indicators):
-                if start < len(raw_line) and end <= len(raw_line):
-                    if raw_line[start:end] == '  0.0':
-                        u_list[indicator_pos] = ' '
-            
-            # Limpiar últimas columnas si m > 44
-            if m > 44 and len(u_list) >= 98:
-                u_list[84:98] = list('              ')
-                
-            u[m] = "".join(u_list)
-        else:
-            u[m] = raw_line
-
-    # --- ESCRIBIR 383.DAT ---
-    archivo_383 = resultados_dir / f'AN{can}383.DAT'
-    with open(archivo_383, 'w', encoding='utf-8') as f:
-        for k in range(0, 53):
-            if len(u[k]) < 98: 
-                continue
-                
-            minutes = "00" if k % 2 == 0 else "30"
-            latex_cols = []
-            segments = [u[k][i*14 : (i+1)*14] for i in range(7)]
-            
-            for seg in segments:
-                if not seg.strip():
-                    latex_cols.append("   &  &   &     ")
-                    continue
-                    
-                # Parseo CORREGIDO: Extraer partes y limpiar espacios
-                ang = seg[0:6].strip()    # "   182" -> "182"
-                sig = seg[6:9].strip()    # "  +" -> "+"  
-                val = seg[9:14]           # " 31.0" (sin strip para mantener espacios)
-                
-                # Formatear para LaTeX - ÁNGULO SIN ESPACIOS EXTRAS
-                ang_fmt = f"{int(ang):3d}" if ang.strip() else "   "
-                sig_tex = f"${sig}$" if sig else "   "
-                
-                latex_cols.append(f"{ang_fmt}&{minutes}&{sig_tex}&{val}")
-                
-            line = "&".join(latex_cols) + "\\\\"
-            
-            # Salto extra
-            if k % 2 == 1 and (k // 2) % 3 == 2:
-                line = line.replace("\\\\", "\\\\[1ex]")
-            
-            f.write(line + '\n')                
-
-    # =========================================================================
-    # TABLA II (384A.DAT)
-    # =========================================================================
-    #print('\nGenerando TABLA II...')
-    archivo_384a = resultados_dir / f'AN{can}384A.DAT'
-    
-    with open(archivo_384a, 'w', encoding='utf-8') as f:
-        for j in range(19):
-            ha = 20.0 * j * DEG
-            t_val = ha - a0
-            cols = []
-            cols.append(f"{int(ha/DEG+0.5):3d}")
-            
-            for k in range(2, 14):
-                alt = 5.0 * k * DEG
-                val = 0.5 * (cd**2) * (math.sin(t_val)**2) * math.tan(alt) * (60.0 / DEG)
-                cols.append(f"{val:3.1f}")
-            
-            line = "&".join(cols) + "\\\\"
-            if j != 0 and (j % 5 == 0 or j == 18):
-                line = line.replace("\\\\", "\\\\[2ex]")
-            f.write(line + '\n')
-    #print(f"-> {archivo_384a.name} generado.")
-
-    # =========================================================================
-    # TABLA III (384B.DAT)
-    # =========================================================================
-    #print(' TABLA III')
-    archivo_384b = resultados_dir / f'AN{can}384B.DAT'
-    
-    with open(archivo_384b, 'w', encoding='utf-8') as f:
-        for j in range(19):
-            ha = 20.0 * j * DEG
-            t_val = ha - a0
-            cols = [f"{int(ha/DEG+0.5):3d}"]
-            
-            for k in range(1, 14):
-                term1 = (de[k-1] - d0) * math.cos(t_val)
-                term2 = cd * math.sin(al[k-1] - a0) * math.sin(t_val)
-                val = (term1 - term2) * (60.0 / DEG)
-                
-                if abs(val) < 0.05:
-                    sig = " "
-                    num = "0.0"
-                else:
-                    sig = "+" if val >= 0 else "-"
-                    num = f"{abs(val):.1f}"
-                cols.append(f"${sig}$&{num}")
-            
-            line = "&".join(cols) + "\\\\"
-            if j % 5 == 0 and j != 0:
-                line = line.replace("\\\\", "\\\\[2ex]")
-            f.write(line + '\n')
-    #print(f"-> {archivo_384b.name} generado.")
-
-    # =========================================================================
-    # AZIMUTES (385.DAT)
-    # =========================================================================
-    #print(' AZIMUTES')
-    archivo_385 = resultados_dir / f'AN{can}385.DAT'
-    
-    with open(archivo_385, 'w', encoding='utf-8') as f:
-        for j in range(37):
-            ha = 10.0 * j * DEG
-            t_val = ha - a0
-            ha_val = 10 * j
-            
-            line = f"\\bf {ha_val:3d}"
-            for k in range(2, 14):
-                alt = 5.0 * k * DEG
-                denom = math.tan(d0) * math.cos(alt)
-                val = math.atan(-math.sin(t_val) / denom) / DEG
-                
-                if abs(val) < 0.05:
-                    sig = " "
-                    num = "0.0"
-                else:
-                    sig = "+" if val >= 0 else "-"
-                    num = f"{abs(val):3.1f}"
-                
-                line += f"&${sig}${num}"
-            
-            line += f"&\\bf {ha_val:3d}"
-            eol = "\\\\"
-            if j % 4 == 3: eol = "\\\\[2ex]"
-            f.write(line + eol + '\n')
-            
-    #print(f"-> {archivo_385.name} generado.")
-    #print("\nProceso completado.")
+    generar_datos_polar(ano, val_dt)
 
 if __name__ == "__main__":
     #main()
@@ -9,8 +9,9 @@ import numpy as np
 #            y generar una tabla en formato LaTeX para el Almanaque Náutico.
 #            La tabla muestra la corrección respecto al valor estándar de 16'.
 #
-# Entradas:  Solicita al usuario el Año y el valor de Delta T por consola.
-# Salidas:   Genera un archivo .dat en la ruta de datos del proyecto.
+# Entradas:  Año y Delta T (segundos).
+# Salidas:   Fichero AN<Año>387B.dat en el destino 'salida' (utils/salida.py);
+#            por defecto, la ruta de datos del proyecto.
 # =============================================================================
 
 # --- CONFIGURACIÓN DE RUTAS E IMPORTACIÓN DINÁMICA ---
@@ -33,155 +34,84 @@ if ruta_str not in sys.path:
 # 3. Importación de módulos propios (Astronómicos y de Utilidades)
 try:
     from utils import funciones as fun      # Conversiones de tiempo y formatos
-    from utils import read_de440 as lee     # Lectura de efemérides (Skyfield wrapper)
+    from utils import tabla_cambios as tc   # Tablas de cambios de magnitudes diarias
+    from utils.salida import SalidaDirectorio
 except ImportError as e:
     raise ImportError(f"Error importando módulos desde '{ruta_base}': {e}")
 
 
-def SemiDiametroSol(ano, dT):
+# --- CONSTANTES ---
+# RADIO_SOL: Radio angular del Sol en radianes a una distancia de 1 UA.
+# Valor IAU estándar convencional.
+RADIO_SOL = 4.65247265886874E-3
+
+# Identificador del Sol en read_de440.GeoDista
+ID_SOL = 10
+
+# Valor base de la tabla (minutos de arco): se tabula SD - 16'
+SD_BASE = 16
+
+
+def semidiametro_sol(ano, dT):
+    """
+    CABECERA:       semidiametro_sol(ano, dT)
+    DESCRIPCIÓN:    Semidiámetro del Sol menos 16' en todos los días del año,
+                    como una sola expresión sobre la serie compartida de
+                    distancias Tierra-Sol (tabla_cambios.distancias_tabla).
+
+    PRECONDICIÓN:   'ano': año (int); 'dT': Delta T en segundos.
+
+    POSTCONDICIÓN:  Devuelve (jd, valor): fechas de tabla_cambios.fechas_tabla
+                    y array con SD - 16' en minutos de arco.
+    """
+    jd = tc.fechas_tabla(ano, dT)
+    r = tc.distancias_tabla(ano, float(dT), ID_SOL)
+
+    # FÓRMULA: Semidiámetro aparente = arcsin(RadioSol / Distancia)
+    # Convertimos a minutos de arco y restamos 16' (valor base tabla)
+    valor = fun.Rad2MArc(np.arcsin(RADIO_SOL / r)) - SD_BASE
+    return jd, valor
+
+
+def SemiDiametroSol(ano, dT, salida=None):
     """
-    CABECERA:       SemiDiametroSol()
-    DESCRIPCIÓN:    Calcula el semidiámetro angular del Sol día a día y genera un 
-                    archivo de texto con código LaTeX.
+    CABECERA:       SemiDiametroSol(ano, dT, salida)
+    DESCRIPCIÓN:    Calcula el semidiámetro angular del Sol de todo el año y
+                    genera un archivo de texto con código LaTeX.
                     
                     La tabla resultante muestra fechas y valores solo cuando hay 
-                    un cambio en el valor redondeado (compresión de tabla).
+                    un cambio en el valor redondeado (compresión de tabla,
+                    ver utils/tabla_cambios.py).
                     El valor mostrado es (Semidiámetro - 16 minutos de arco).
 
-    PRECONDICIÓN:   1. Ejecución interactiva: Requiere entrada por teclado del 
-                       Año (int) y Delta T (float en segundos).
-                    2. Sistema de archivos: Debe tener permisos de escritura en
-                       ../data/almanaque_nautico/
+    PRECONDICIÓN:   'ano': año (int); 'dT': Delta T en segundos.
+                    'salida' es opcional: destino de utils/salida.py (directorio
+                    o ZIP); por defecto data/almanaque_nautico/AAAA.
     
-    POSTCONDICIÓN:  Genera un archivo 'AN<Año>387B.dat'.
+    POSTCONDICIÓN:  Genera un archivo 'AN<Año>387B.dat' y devuelve, como
+                    cadena, el destino en que se ha escrito.
                     El contenido está formateado con sintaxis LaTeX específica 
                     (ej: columnas &, saltos \\, macros \\Minp).
     """
-
-    # --- CONSTANTES ---
-    # rs: Radio angular del Sol en radianes a una distancia de 1 UA.
-    # Valor IAU estándar convencional.
-    rs = 4.65247265886874E-3
-
-    # Variables de formateo de texto (inicialización)
-    c4 = "    "
-    c04 = "    "
-    c004 = "    "
-
-    dT = dT / 86400.0   # Conversión de segundos a días
-
     can = f"{ano:04d}"  # Año formateado como string (ej. "2024")
 
-    # -------------------------------------------------------------
-    # 2. Configuración del Archivo de Salida
-    #    Ruta: .../data/almanaque_nautico/<año>/AN<ano>387B.dat
-    # -------------------------------------------------------------
-    # Navegamos 4 niveles arriba para llegar a la raíz del proyecto
-    ruta_proyecto = Path(__file__).resolve().parent.parent.parent.parent
-    
-    # Construcción de ruta segura con pathlib
-    filename = ruta_proyecto / "data" / "almanaque_nautico" / f"{can}" / f"AN{can}387B.dat"
-    
-    # Crear directorios si no existen (mkdir -p)
-    filename.parent.mkdir(parents=True, exist_ok=True)
+    # Destino por defecto: .../data/almanaque_nautico/<año>/
+    if salida is None:
+        ruta_proyecto = Path(__file__).resolve().parent.parent.parent.parent
+        salida = SalidaDirectorio(ruta_proyecto / "data" / "almanaque_nautico" / can)
 
-    # Abrir archivo en modo escritura (sobrescribe si existe)
-    f = open(filename, "w", encoding="utf-8")
+    jd, valor = semidiametro_sol(ano, dT)
 
-    # -------------------------------------------------------------
-    # 3. Cálculos Iniciales
-    # -------------------------------------------------------------
-    # Calcular días totales del año (j) manejando bisiestos
-    # Se calcula la diferencia de JD entre el 1 de Enero del año sig. y el actual.
-    j = int(fun.DiaJul(1, 1, ano + 1, 0.0) - fun.DiaJul(1, 1, ano, 0.0) + 0.5)
+    # Sólo se escribe una fila cuando cambia el valor redondeado; "-0.0" se
+    # escribe " 0.0"
+    lineas = tc.tabla_cambios(jd, valor, limpiar_cero=True)
 
-    # Cálculo inicial para el 2 de enero (Referencia inicial)
-    dj = fun.DiaJul(2, 1, ano, 0.0)
-    
-    # Obtener distancia Tierra-Sol (ID 10) en UA
-    r = lee.GeoDista(dj, 10)
+    with salida.abrir(f"AN{can}387B.dat", encoding="utf-8") as f:
+        f.write("\n".join(lineas) + "\n")
+
+    return str(salida)
 
-    # FÓRMULA: Semidiámetro aparente = arcsin(RadioSol / Distancia)
-    # Convertimos a minutos de arco y restamos 16' (valor base tabla)
-    valor = fun.Rad2MArc(np.arcsin(rs / r)) - 16
-    
-    # Formateo inicial: float con 1 decimal y ancho 4 (ej: " 0.2")
-    c04 = f"{valor:4.1f}"
-
-    # Lógica de formateo de signos para LaTeX (+/-)
-    c004 = list("    ")
-    c004[1:4] = c04[1:4]   # Copiamos dígitos y punto
-
-    if (c04[0] != '-') and (c04[1:4] != "0.0"):
-        c004[0] = '+'      # Forzamos signo + si es positivo y no es cero
-    else:
-        c004[0] = c04[0]   # Mantenemos signo original (o espacio)
-
-    c004 = "".join(c004)
-
-    # Escribir cabecera de la tabla (Enero)
-    # Nota: \Minp es presumiblemente una macro LaTeX definida en el documento maestro
-    f.write(
-        f" Ene.& 1&           \\\\\n"
-        f"     &  &${c004[0]}${c004[1]}\\Minp {c004[3]}\\\\\n"
-    )
-
-    # -------------------------------------------------------------
-    # 4. Bucle Principal (Día a Día)
-    # -------------------------------------------------------------
-    for d in range(1, j):
-        # Calcular fecha juliana actual (sumando día 'd' y corrección Delta T)
-        dj = fun.DiaJul(1, 1, ano, 0.0) + d + dT
-        
-        # Calcular distancia geocéntrica al Sol
-        r = lee.GeoDista(dj, 10)
-        
-        # Calcular corrección al semidiámetro
-        valor = fun.Rad2MArc(np.arcsin(rs / r)) - 16
-        c4 = f"{valor:4.1f}"
-
-        # Limpieza de ceros: evitar "-0.0", preferimos " 0.0"
-        if c4[1:4].strip() == "0.0":
-            c4_list = list(c4)
-            c4_list[0] = ' ' 
-            c4 = "".join(c4_list)
-
-        # DETECCIÓN DE CAMBIO:
-        # Solo escribimos una nueva fila si el valor redondeado ha cambiado 
-        # respecto al anterior (c4 != c04). Esto comprime la tabla.
-        if c4 != c04:
-            # Recuperar fecha civil (día, mes) del día anterior (dj - 1)
-            # Se usa dj-1 porque detectamos el cambio hoy, pero el periodo 
-            # válido del valor anterior terminó ayer.
-            dia, mes, _anno2, _hora = fun.DJADia(dj - 1)
-
-            # Actualizar valores de referencia
-            c04 = c4
-            c004 = list(c4)
-
-            # Re-aplicar lógica de signos
-            if (c04[0] != '-') and (c04[1:4] != "0.0"):
-                c004[0] = '+'
-            else:
-                c004[0] = c04[0]
-
-            c004 = "".join(c004)
-
-            # Escribir fila LaTeX: Mes & Día & Valor formateado
-            f.write(
-                f" {fun.MesNom(mes)}&{dia:2d}&           \\\\\n"
-                f"     &  &${c004[0]}${c004[1]}\\Minp {c004[3]}\\\\\n"
-            )
-
-    # -------------------------------------------------------------
-    # 5. Cierre
-    # -------------------------------------------------------------
-    # Escribir línea final obligatoria (31 de Diciembre)
-    f.write(" Dic.&31&           \\\\\n")
-
-    f.close()
-    print(f"Archivo generado: {filename}")
 
 # --- PUNTO DE ENTRADA ---
 if __name__ == "__main__":
-    SemiDiametroSol(2012, 69.184)  # Ejemplo de llamada a la función
\ No newline at end of file
+    print(f"Archivo generado en: {SemiDiametroSol(2012, 69.184)}")  # Ejemplo de llamada a la función
@@ -0,0 +1,195 @@
+import io
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+# Asegurar que la raíz del proyecto está en sys.path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from modern.src.paginas_an import fichDatAN
+from modern.src.paginas_an import pagEntera
+from modern.src.utils.salida import SalidaDirectorio
+
+
+class TestCachePaginas(unittest.TestCase):
+    """Pruebas de la caché de datos numéricos de las páginas diarias."""
+
+    ANIO, DIA, DT = 2025, 10, 69.0
+    FASES = [2460676.5 + 29.53 * k / 4 for k in range(64)]
+
+    def test_clave_depende_de_dt_y_version(self):
+        """La clave cambia con dt, con el día y con la versión del cálculo."""
+        base = fichDatAN.clave_cache_dia(self.ANIO, self.DIA, self.DT, "eph")
+        self.assertEqual(base, fichDatAN.clave_cache_dia(self.ANIO, self.DIA, self.DT, "eph"))
+        self.assertNotEqual(base, fichDatAN.clave_cache_dia(self.ANIO, self.DIA, 70.0, "eph"))
+        self.assertNotEqual(base, fichDatAN.clave_cache_dia(self.ANIO, self.DIA + 1, self.DT, "eph"))
+        self.assertNotEqual(base, fichDatAN.clave_cache_dia(self.ANIO, self.DIA, self.DT, "otra"))
+
+        version = fichDatAN.VERSION_CALCULO
+        try:
+            fichDatAN.VERSION_CALCULO = version + 1
+            self.assertNotEqual(base, fichDatAN.clave_cache_dia(self.ANIO, self.DIA, self.DT, "eph"))
+        finally:
+            fichDatAN.VERSION_CALCULO = version
+
+    def test_pagina_desde_cache_identica(self):
+        """La página formateada desde la caché es idéntica a la de UNAPAG."""
+        esperado = pagEntera.UNAPAG(self.DIA, self.ANIO, self.DT, return_content=True, fases=self.FASES)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            datos, desde_cache = fichDatAN.pagina_cacheada(self.DIA, self.ANIO, self.DT, self.FASES, tmp)
+            self.assertFalse(desde_cache)
+            datos2, desde_cache = fichDatAN.pagina_cacheada(self.DIA, self.ANIO, self.DT, self.FASES, tmp)
+            self.assertTrue(desde_cache)
+
+        self.assertEqual(pagEntera.formatear_pagina(datos), esperado)
+        self.assertEqual(pagEntera.formatear_pagina(datos2), esperado)
+
+    def test_latex_desde_registro(self):
+        """El LaTeX generado del registro coincide con el de pagtex_bis sobre el .dat."""
+        datos = pagEntera.calcular_pagina(self.DIA, self.ANIO, self.DT, self.FASES)
+        salida = io.StringIO()
+        pagEntera.PagTexProcessor().pagtex_bis(self.DIA, self.ANIO,
+                                               input_content=pagEntera.formatear_pagina(datos),
+                                               output_stream=salida)
+
+        self.assertEqual(pagEntera.formatear_latex(datos), salida.getvalue())
+        self.assertFalse(hasattr(datos, '__dict__'))
+
+    def test_latex_desde_registro_sin_fenomenos(self):
+        """También coincide cuando faltan fenómenos o pasos (horas 9999 en el .dat)."""
+        datos = pagEntera.calcular_pagina(self.DIA, self.ANIO, self.DT, self.FASES)
+        datos.fen_sol[0] = [9999.0] * 3
+        datos.fen_lun_hoy[1][1] = 9999.0
+        datos.fen_lun_man[2][0] = None
+        datos.pmg_lun = 24.5
+        datos.pmg_pla[2] = 24.5
+
+        salida = io.StringIO()
+        pagEntera.PagTexProcessor().pagtex_bis(self.DIA, self.ANIO,
+                                               input_content=pagEntera.formatear_pagina(datos),
+                                               output_stream=salida)
+        self.assertEqual(pagEntera.formatear_latex(datos), salida.getvalue())
+
+    def test_entrada_danada_se_recalcula(self):
+        """Una entrada ilegible se trata como ausente."""
+        with tempfile.TemporaryDirectory() as tmp:
+            clave = fichDatAN.clave_cache_dia(self.ANIO, self.DIA, self.DT)
+            ruta = Path(tmp) / clave[:2] / f"{clave}.json"
+            ruta.parent.mkdir(parents=True)
+            ruta.write_text("{incompleto", encoding='utf-8')
+
+            self.assertIsNone(fichDatAN.leer_cache_dia(clave, tmp))
+            _, desde_cache = fichDatAN.pagina_cacheada(self.DIA, self.ANIO, self.DT, self.FASES, tmp)
+            self.assertFalse(desde_cache)
+            self.assertIsNotNone(fichDatAN.leer_cache_dia(clave, tmp))
+
+
+class TestDatosEnOrden(unittest.TestCase):
+    """Las páginas salen en orden de día también con varios procesos."""
+
+    def test_paralelo_igual_que_secuencial(self):
+        fases = TestCachePaginas.FASES
+        secuencial = list(fichDatAN.datos_en_orden(2025, 69.0, fases, 3, usar_cache=False))
+        paralelo = list(fichDatAN.datos_en_orden(2025, 69.0, fases, 3, usar_cache=False, procesos=2))
+
+        self.assertEqual([d for d, _, _ in paralelo], [1, 2, 3])
+        self.assertEqual([pagEntera.formatear_pagina(x) for _, x, _ in paralelo],
+                         [pagEntera.formatear_pagina(x) for _, x, _ in secuencial])
+
+
+class TestCanalizar(unittest.TestCase):
+    """Canalización productor/escritor de la generación del año."""
+
+    def test_orden_y_utilizacion(self):
+        """El escritor recibe todos los elementos en orden, en los dos modos."""
+        for canalizado in (True, False):
+            with self.subTest(canalizado=canalizado):
+                recibidos = []
+                tiempos = fichDatAN.canalizar(range(50), recibidos.append, tam_cola=2,
+                                              canalizado=canalizado)
+                self.assertEqual(recibidos, list(range(50)))
+                self.assertEqual(set(tiempos), {'total', 'produccion', 'consumo', 'espera_cola'})
+                self.assertLessEqual(tiempos['consumo'], tiempos['total'])
+
+    def test_error_del_escritor(self):
+        """Un error en el escritor se relanza sin dejar bloqueado al productor."""
+        def falla(elemento):
+            if elemento == 3:
+                raise ValueError("fallo de escritura")
+
+        with self.assertRaises(ValueError):
+            fichDatAN.canalizar(range(100), falla, tam_cola=1)
+
+
+class TestPaginasIntervalo(unittest.TestCase):
+    """Páginas de un intervalo de fechas sin pasar por la consola."""
+
+    DT = 69.0
+
+    def setUp(self):
+        # Fases y cálculo sustituidos: cada página es su (anio, dia)
+        parches = [
+            mock.patch.object(fichDatAN.faseLuna, 'fechas_fases',
+                              return_value=TestCachePaginas.FASES),
+            mock.patch.object(fichDatAN, 'calcular_pagina',
+                              side_effect=lambda dia, anio, dt, fases: (anio, dia)),
+            mock.patch.object(fichDatAN, 'formatear_pagina',
+                              side_effect=lambda datos: f"{datos[0]} {datos[1]}\n"),
+        ]
+        for parche in parches:
+            self.addCleanup(parche.stop)
+        self.fechas_fases = [parche.start() for parche in parches][0]
+
+    def test_fin_de_anio(self):
+        """Un intervalo que cruza el año sale en orden, con las fases de cada año una vez."""
+        paginas = list(fichDatAN.iter_pages(date(2024, 12, 30), 4, self.DT))
+
+        self.assertEqual([(anio, dia) for anio, dia, _ in paginas],
+                         [(2024, 365), (2024, 366), (2025, 1), (2025, 2)])
+        self.assertEqual(paginas[2][2], "2025 1\n")
+        self.assertEqual(self.fechas_fases.call_args_list,
+                         [mock.call(2024, self.DT), mock.call(2025, self.DT)])
+
+    def test_opciones_sin_consola(self):
+        """Las opciones 2 y 3 con fecha y número de días no llaman a input()."""
+        with tempfile.TemporaryDirectory() as tmp, \
+             mock.patch('builtins.input', side_effect=AssertionError("input")) as entrada:
+            fichDatAN.generarFichero(2025, self.DT, opcion=2, fecha=(1, 3, 2025),
+                                     salida=SalidaDirectorio(tmp))
+            un_dia = (Path(tmp) / "PAG.dat").read_text(encoding='utf-8')
+
+            fichDatAN.generarFichero(2024, self.DT, opcion=3, fecha=(31, 12, 2024), n_dias=3,
+                                     salida=SalidaDirectorio(tmp))
+            intervalo = (Path(tmp) / "PAG.dat").read_text(encoding='utf-8')
+
+        entrada.assert_not_called()
+        self.assertEqual(un_dia, "2025 60\n")
+        self.assertEqual(intervalo, "2024 366\n2025 1\n2025 2\n")
+
+
+class TestEscribirPaginas(unittest.TestCase):
+    """Escritura de varias páginas seguidas en un mismo flujo."""
+
+    def test_latex_en_un_flujo(self):
+        """Con latex=True se escriben las N páginas en LaTeX, una tras otra."""
+        salida = io.StringIO()
+        with mock.patch.object(fichDatAN.faseLuna, 'fechas_fases',
+                               return_value=TestCachePaginas.FASES):
+            n = fichDatAN.escribir_paginas((9, 1, 2025), 3, 69.0, salida, latex=True)
+
+        datos = [pagEntera.calcular_pagina(dia, 2025, 69.0, TestCachePaginas.FASES)
+                 for dia in (9, 10, 11)]
+        self.assertEqual(n, 3)
+        self.assertEqual(salida.getvalue().count("\\def\\fecha{"), 3)
+        self.assertEqual(salida.getvalue(),
+                         "".join(pagEntera.formatear_latex(d) + "\n" for d in datos))
+
+
+if __name__ == '__main__':
+    unittest.main()
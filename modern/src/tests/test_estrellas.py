@@ -0,0 +1,301 @@
+import io
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import numpy as np
+from skyfield.api import Star
+
+# Asegurar que la raíz del proyecto y 'src' están en sys.path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+src_root = project_root / "modern" / "src"
+for ruta in (project_root, src_root):
+    if str(ruta) not in sys.path:
+        sys.path.append(str(ruta))
+
+from estrellas import calculos
+from estrellas import main_estrella
+from estrellas.main_estrella import generar_tablas_catalogo
+from utils.salida import SalidaZip
+
+RUTA_FKH = src_root / "estrellas" / "estANFKH.txt"
+RUTA_UH = src_root / "estrellas" / "estAN_UH.txt"
+
+
+class TestCatalogoVectorial(unittest.TestCase):
+    """Catálogo de estrellas como Star vectorial con registros paralelos."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.catalogo = calculos.cargar_catalogo(RUTA_FKH)
+        cls.registros, cls.estrellas = calculos.cargar_catalogo_vectorial(RUTA_FKH)
+
+    def test_registros_paralelos(self):
+        """Número, magnitud y tipo coinciden con el catálogo estrella a estrella."""
+        self.assertEqual(len(self.registros), len(self.catalogo))
+        self.assertEqual(list(self.registros.inu), [e.inu for e in self.catalogo])
+        self.assertEqual(list(self.registros.img), [e.img for e in self.catalogo])
+        self.assertEqual(list(self.registros.tip), [e.tip for e in self.catalogo])
+        # Ajuste de la Polar
+        self.assertEqual((self.registros.inu[10], self.registros.inu[11]), (12, 11))
+
+    def test_posiciones_iguales_a_las_individuales(self):
+        """Las posiciones vectoriales coinciden con las de cada Star por separado."""
+        jd = [2460676.5 + 30.0 * k for k in range(3)]
+        ra, dec = calculos.calcular_posiciones_aparentes(jd, self.estrellas)
+        self.assertEqual(ra.shape, (len(self.catalogo), 3))
+
+        for n in (0, 10, 50, len(self.catalogo) - 1):
+            for k in range(3):
+                with self.subTest(estrella=n, epoca=k):
+                    ra1, dec1 = calculos.calcular_posicion_aparente(jd[k], self.catalogo[n].skyfield_star)
+                    self.assertAlmostEqual(ra[n, k], ra1, delta=1e-10)
+                    self.assertAlmostEqual(dec[n, k], dec1, delta=1e-10)
+
+
+class TestCacheCatalogo(unittest.TestCase):
+    """Caché en disco y en memoria de los catálogos ya leídos."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.ruta = self.tmp / "estANFKH.txt"
+        shutil.copy(RUTA_FKH, self.ruta)
+        self.cache = self.tmp / "cache"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_memoria_y_disco(self):
+        """La segunda carga es el mismo objeto y la entrada en disco es igual al texto."""
+        registros, _ = calculos.leer_catalogo_cacheado(self.ruta, self.cache)
+        self.assertIs(calculos.leer_catalogo_cacheado(self.ruta, self.cache)[0], registros)
+        self.assertFalse(registros.flags.writeable)
+        self.assertEqual((registros.inu[10], registros.inu[11]), (12, 11))
+
+        [ruta_npy] = self.cache.glob("estANFKH_*.npy")
+        np.testing.assert_array_equal(np.load(ruta_npy), calculos._leer_catalogo(self.ruta))
+
+    def test_invalidacion(self):
+        """Editar el catálogo genera otra entrada; una entrada dañada se rehace."""
+        calculos.leer_catalogo_cacheado(self.ruta, self.cache)
+        [ruta_npy] = self.cache.glob("*.npy")
+        ruta_npy.write_bytes(b"danado")
+        calculos._catalogo_memorizado.cache_clear()
+
+        registros, _ = calculos.leer_catalogo_cacheado(self.ruta, self.cache)
+        self.assertEqual(len(registros), 99)
+        self.assertEqual(len(np.load(ruta_npy)), 99)
+
+        with open(self.ruta, 'a') as f:
+            f.write("100  150  A0    0.0  0.0  0.0  0.0  0.010  0.0\n")
+        registros, _ = calculos.leer_catalogo_cacheado(self.ruta, self.cache)
+        self.assertEqual(len(registros), 100)
+        self.assertEqual(len(list(self.cache.glob("*.npy"))), 2)
+
+
+class TestCatalogosUnidos(unittest.TestCase):
+    """Unión de los dos catálogos del Almanaque sin estrellas repetidas."""
+
+    def test_union(self):
+        """Las 50 estrellas de estAN_UH.txt están entre las 99 de estANFKH.txt."""
+        (uh, fk), estrellas, (sel_uh, sel_fk) = calculos.cargar_catalogos_unidos([RUTA_UH, RUTA_FKH])
+        self.assertEqual(len(estrellas.ra.hours), 99)
+        self.assertEqual(sorted(sel_fk), list(range(99)))
+        self.assertEqual(list(sel_uh), list(range(50)))
+
+        # Cada catálogo conserva sus números (ajuste de la Polar incluido)
+        self.assertEqual(list(fk.inu), [e.inu for e in calculos.cargar_catalogo(RUTA_FKH)])
+        np.testing.assert_array_equal(estrellas.ra.hours[sel_uh], uh.ra_hours)
+        np.testing.assert_array_equal(estrellas.ra.hours[sel_fk], fk.ra_hours)
+
+    def test_mismo_numero_datos_distintos(self):
+        """Un número repetido con otra astrometría no se fusiona."""
+        with tempfile.TemporaryDirectory() as tmp:
+            a, b = Path(tmp) / "a.txt", Path(tmp) / "b.txt"
+            a.write_text("1  215  A0  503.265  1.039  104725.58  -16.33  0.024\n")
+            b.write_text("1  215  A0  503.265  1.039  104725.58  -16.33  0.024\n"
+                         "1  215  A0  600.000  1.039  104725.58  -16.33  0.024\n")
+            _, estrellas, (sel_a, sel_b) = calculos.cargar_catalogos_unidos([a, b], directorio=tmp)
+        self.assertEqual(len(estrellas.ra.hours), 2)
+        self.assertEqual((list(sel_a), list(sel_b)), ([0], [0, 1]))
+
+    def test_pasos_de_una_seleccion(self):
+        """Los pasos de una selección de la unión son los del catálogo solo."""
+        _, estrellas_uh = calculos.cargar_catalogo_vectorial(RUTA_UH)
+        _, estrellas, (_, sel_uh) = calculos.cargar_catalogos_unidos([RUTA_FKH, RUTA_UH])
+        jd = [2460676.5, 2460767.5]
+        _, hora = calculos.calcular_pasos_meridiano_greenwich(jd, estrellas_uh)
+        _, hora_sel = calculos.calcular_pasos_meridiano_greenwich(jd, estrellas, seleccion=sel_uh)
+        np.testing.assert_allclose(hora_sel, hora, rtol=0, atol=1e-9)
+
+
+class TestPosicionesRapido(unittest.TestCase):
+    """Vía rápida (matrices por época) contrastada con Skyfield."""
+
+    TOLERANCIA = np.radians(0.01 / 60.0)    # 0.01'
+
+    def comparar(self, estrellas, jd):
+        ra1, dec1 = calculos.calcular_posiciones_aparentes(jd, estrellas)
+        ra2, dec2 = calculos.calcular_posiciones_aparentes_rapido(jd, estrellas)
+        dif_ra = (ra2 - ra1 + np.pi) % (2 * np.pi) - np.pi
+        self.assertLess(np.abs(dif_ra * np.cos(dec1)).max(), self.TOLERANCIA)
+        self.assertLess(np.abs(dec2 - dec1).max(), self.TOLERANCIA)
+
+    def test_catalogo_almanaque(self):
+        """Las 99 estrellas del catálogo FK en los 12 meses."""
+        _, estrellas = calculos.cargar_catalogo_vectorial(RUTA_FKH)
+        self.comparar(estrellas, [2460691.5 + 30.4 * k for k in range(12)])
+
+    def test_catalogo_grande(self):
+        """Miles de estrellas aleatorias, incluidas las cercanas a los polos."""
+        rng = np.random.default_rng(2025)
+        n = 5000
+        estrellas = Star(
+            ra_hours=rng.uniform(0.0, 24.0, n),
+            dec_degrees=np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, n))),
+            ra_mas_per_year=rng.normal(0.0, 200.0, n),
+            dec_mas_per_year=rng.normal(0.0, 200.0, n),
+            parallax_mas=rng.uniform(1.0, 300.0, n),
+        )
+        self.comparar(estrellas, [2451545.0, 2460800.5, 2469000.5])
+
+    def test_respaldo_sin_internos_de_skyfield(self):
+        """Sin la deflexión interna de Skyfield se calcula con la API pública."""
+        _, estrellas = calculos.cargar_catalogo_vectorial(RUTA_FKH)
+        jd = [2460691.5, 2460722.5]
+        original = calculos._deflexion_un_cuerpo
+        try:
+            calculos._deflexion_un_cuerpo = lambda: None
+            ra2, dec2 = calculos.calcular_posiciones_aparentes_rapido(jd, estrellas)
+        finally:
+            calculos._deflexion_un_cuerpo = original
+        ra1, dec1 = calculos.calcular_posiciones_aparentes(jd, estrellas)
+        np.testing.assert_array_equal(ra2, ra1)
+        np.testing.assert_array_equal(dec2, dec1)
+
+
+class TestPasosMeridiano(unittest.TestCase):
+    """Pasos por el meridiano de Greenwich calculados en lote."""
+
+    def test_lote_igual_que_escalar(self):
+        """El Newton en lote da los mismos (dt_cent, hora_paso) que el escalar."""
+        catalogo = calculos.cargar_catalogo(RUTA_UH)
+        _, estrellas = calculos.cargar_catalogo_vectorial(RUTA_UH)
+        jd = [2460676.5, 2460767.5, 2460859.5]
+        dt_cent, hora = calculos.calcular_pasos_meridiano_greenwich(jd, estrellas)
+        self.assertEqual(hora.shape, (len(catalogo), 3))
+
+        for n in (0, 11, 25, len(catalogo) - 1):
+            for k in range(3):
+                with self.subTest(estrella=n, fecha=k):
+                    dt1, hora1 = calculos.calcular_paso_meridiano_greenwich(jd[k], catalogo[n].skyfield_star)
+                    self.assertAlmostEqual(dt_cent[n, k], dt1, delta=1e-12)
+                    self.assertAlmostEqual(hora[n, k], hora1, delta=1e-6)
+
+    def test_respaldo_sin_internos_de_skyfield(self):
+        """Sin los atributos internos del Star se calcula estrella a estrella."""
+        _, estrellas = calculos.cargar_catalogo_vectorial(RUTA_UH)
+        jd = [2460676.5, 2460767.5]
+        sel = [0, 11, 25]
+        _, hora = calculos.calcular_pasos_meridiano_greenwich(jd, estrellas, seleccion=sel)
+        original = calculos._vectores_estrella
+        try:
+            calculos._vectores_estrella = lambda estrellas: None
+            _, hora_respaldo = calculos.calcular_pasos_meridiano_greenwich(jd, estrellas, seleccion=sel)
+        finally:
+            calculos._vectores_estrella = original
+        np.testing.assert_allclose(hora_respaldo, hora, rtol=0, atol=1e-6)
+
+    def test_via_rapida(self):
+        """La vía rápida de catálogos grandes difiere del Newton en menos de 0.1 s."""
+        _, estrellas = calculos.cargar_catalogo_vectorial(RUTA_FKH)
+        jd = [2460676.5 + 30.4 * k for k in range(12)]
+        _, hora = calculos.calcular_pasos_meridiano_greenwich(jd, estrellas)
+        _, hora_rapida = calculos.calcular_pasos_meridiano_rapido(jd, estrellas)
+        dif = (hora_rapida - hora + 12.0) % 24.0 - 12.0
+        self.assertLess(np.abs(dif).max() * 3600.0, 0.1)
+
+
+class TestTablasCatalogo(unittest.TestCase):
+    """Tablas de catálogos extendidos calculadas y escritas por bloques."""
+
+    def generar(self, tam_bloque):
+        buffer = io.BytesIO()
+        with SalidaZip(buffer) as salida:
+            generar_tablas_catalogo(2025, 69.0, RUTA_FKH, salida=salida, tam_bloque=tam_bloque)
+        with zipfile.ZipFile(buffer) as z:
+            return z.read("AN2025CAT_estANFKH.DAT").decode().splitlines()
+
+    def test_bloques(self):
+        """El resultado no depende del tamaño de bloque."""
+        bloques = [len(b) for b in calculos.leer_catalogo_por_bloques(RUTA_FKH, 40)]
+        self.assertEqual(bloques, [40, 40, 19])
+
+        lineas = self.generar(40)
+        self.assertEqual(lineas, self.generar(1000))
+        self.assertEqual(len(lineas), 1 + 99 * 12)
+
+    def test_valores(self):
+        """Las filas llevan el AS y la declinación de la posición aparente."""
+        lineas = self.generar(1000)
+        catalogo = calculos.cargar_catalogo(RUTA_FKH)
+        jd = calculos.read_de440._ts.ut1(2025, 3, 15).tt
+        ra, dec = calculos.calcular_posicion_aparente(jd, catalogo[5].skyfield_star)
+
+        campos = lineas[1 + 5 * 12 + 2].split()
+        self.assertEqual(int(campos[0]), catalogo[5].inu)
+        self.assertEqual(int(campos[2]), 3)
+        sha = int(campos[3]) + float(campos[4]) / 60.0
+        self.assertAlmostEqual(sha, np.degrees(2 * np.pi - ra) % 360.0, delta=0.1 / 60)
+        signo = -1 if campos[5].startswith('-') else 1
+        de = signo * (abs(int(campos[5])) + float(campos[6]) / 60.0)
+        self.assertAlmostEqual(de, np.degrees(dec), delta=0.1 / 60)
+
+
+class TestPaginasEstrellas(unittest.TestCase):
+    """Escritores de las páginas 376-381, CARTAS y CARTDE por columnas."""
+
+    def test_celdas(self):
+        """Cada tipo de celda sale con su ancho fijo directamente del número."""
+        self.assertEqual(main_estrella._celdas_paso([5, 23] + [0] * 10, [7.9, 59.4] + [0.0] * 10, (1, 0)),
+                         ["23", "59", " 5", "07"])
+        self.assertEqual(main_estrella._celdas_as(7, [0.04, 61.25] + [119.9] * 10)[:3],
+                         ["  7", "  0.0", " 61.2"])
+        self.assertEqual(main_estrella._celdas_dec("-", 4, [-0.04, 9.96] + [0.0] * 10)[:3],
+                         ["$-$ 4", "-0.0", "10.0"])
+
+    def test_paginas(self):
+        """Número de filas, celdas por fila y filas con espacio extra."""
+        buffer = io.BytesIO()
+        with SalidaZip(buffer) as salida:
+            main_estrella.generar_datos_estrellas(2025, 69.0, salida=salida)
+
+        with zipfile.ZipFile(buffer) as z:
+            paginas = {nombre[6:-4]: z.read(nombre).decode().splitlines() for nombre in z.namelist()}
+
+        # (filas, separadores '&' por fila, filas con espacio extra)
+        posicion = (50, 16, range(4, 49, 5))
+        cartas = (36, 16, range(4, 34, 5))
+        esperado = {"376": posicion, "377": posicion,
+                    "378": (49, 16, range(4, 49, 5)), "379": (49, 16, range(4, 49, 5)),
+                    "380": (50, 17, range(4, 49, 5)), "381": (50, 13, range(4, 49, 5)),
+                    "CARTAS": cartas, "CARTDE": cartas}
+        for pagina, (filas, separadores, espacio) in esperado.items():
+            with self.subTest(pagina=pagina):
+                lineas = paginas[pagina]
+                self.assertEqual(len(lineas), filas)
+                self.assertEqual({linea.count("&") for linea in lineas
+                                  if "multicolumn" not in linea}, {separadores})
+                self.assertEqual([i for i, linea in enumerate(lineas) if linea.endswith("ex]")],
+                                 list(espacio))
+
+        # Las cartas repiten las filas de 376-379 de sus estrellas
+        self.assertEqual(paginas["CARTAS"][1].split("\\\\")[0],
+                         paginas["376"][5].split("\\\\")[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
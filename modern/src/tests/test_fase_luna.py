@@ -0,0 +1,192 @@
+import io
+import sys
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+from pathlib import Path
+
+import numpy as np
+
+# Asegurar que la raíz del proyecto y 'src' están en sys.path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+src_root = project_root / "modern" / "src"
+for ruta in (project_root, src_root):
+    if str(ruta) not in sys.path:
+        sys.path.append(str(ruta))
+
+from fase_luna import faseLuna
+from utils import funciones as fun
+from utils.salida import SalidaZip
+
+
+class TestSerieFases(unittest.TestCase):
+    """Serie de fases del año compartida por las tablas y las páginas diarias."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.serie = faseLuna.serie_fases(2025, 69.0, metodo='vectorial')
+
+    def test_serie(self):
+        """Fases consecutivas en orden cronológico, cubriendo todo el año."""
+        self.assertEqual(self.serie.dtype, faseLuna.DTYPE_FASES)
+        self.assertTrue(np.all(np.diff(self.serie['fase']) % 4 == 1))
+        self.assertTrue(np.all(np.diff(self.serie['ut']) > 0))
+        self.assertLess(self.serie['ut'][0], fun.DiaJul(1, 1, 2025, 0.0))
+        self.assertGreater(self.serie['ut'][-1], fun.DiaJul(31, 12, 2025, 24.0))
+
+    def test_cacheada(self):
+        """Una sola búsqueda por (año, Delta T) y resultado de sólo lectura."""
+        self.assertIs(faseLuna.serie_fases(2025, 69.0, metodo='vectorial'), self.serie)
+        with self.assertRaises(ValueError):
+            self.serie['ut'][0] = 0.0
+
+    def test_vectorial_frente_a_newton(self):
+        """La búsqueda vectorial da las mismas fases que la secuencial a menos de 1 s."""
+        newton = faseLuna.serie_fases(2025, 69.0, metodo='newton')
+        self.assertEqual(newton['fase'].tolist(), self.serie['fase'].tolist())
+        self.assertEqual(newton['lunacion'].tolist(), self.serie['lunacion'].tolist())
+        self.assertLess(np.max(np.abs(newton['ut'] - self.serie['ut'])) * 86400.0, 1.0)
+
+        with self.assertRaises(ValueError):
+            faseLuna.serie_fases(2025, 69.0, metodo='brent')
+
+    def test_buscar_fases(self):
+        """Cada raíz deja la elongación en el ángulo de su fase."""
+        tt_ini = fun.DiaJul(1, 3, 2031, 0.0)
+        fases, tt, diagnostico = faseLuna.buscar_fases(tt_ini, tt_ini + 60.0)
+        self.assertTrue(np.all(tt > tt_ini))
+        self.assertTrue(np.all(np.diff(tt) > 0))
+        self.assertGreaterEqual(len(tt), 8)
+
+        dif = faseLuna.elongacion(tt) - fases * (np.pi / 2.0)
+        dif = (dif + np.pi) % (2.0 * np.pi) - np.pi
+        # La elongación avanza ~12.2°/día: 1e-7 rad son menos de 0.1 s
+        self.assertLess(np.max(np.abs(dif)), 1e-7)
+
+    def test_respaldo_biseccion(self):
+        """Sin convergencia de Newton las fases se resuelven por bisección, sin bloquear."""
+        tt_ini = fun.DiaJul(1, 3, 2031, 0.0)
+        fases, tt, _ = faseLuna.buscar_fases(tt_ini, tt_ini + 60.0)
+        fases_b, tt_b, diagnostico = faseLuna.buscar_fases(tt_ini, tt_ini + 60.0, max_iter=0)
+        self.assertTrue(diagnostico['biseccion'].all())
+        self.assertEqual(fases_b.tolist(), fases.tolist())
+        self.assertLess(np.max(np.abs(tt_b - tt)) * 86400.0, 0.01)
+
+        ut = fun.DiaJul(1, 12, 2024, 0.0)
+        utf = fun.DiaJul(31, 12, 2025, 24.0)
+        with mock.patch.object(faseLuna, 'MAX_ITER_NEWTON', 0), \
+                mock.patch('builtins.input', side_effect=AssertionError("input() bloquea")):
+            serie, i0, _, biseccion = faseLuna._fases_newton(ut, utf, 69.0 / 86400.0)
+        self.assertEqual(biseccion, len(serie))
+        self.assertEqual(i0, 1)
+        self.assertLess(max(abs(u - v) for (_, u), v in zip(serie, self.serie['ut'])) * 86400.0, 1.0)
+
+    def test_metricas(self):
+        """Cada búsqueda deja sus métricas de convergencia."""
+        metricas = faseLuna.METRICAS_FASES[(2025, 69.0, 'vectorial')]
+        self.assertEqual(metricas.fases, len(self.serie))
+        self.assertEqual(metricas.biseccion, 0)
+        self.assertGreaterEqual(metricas.iteraciones, 1)
+        self.assertLess(metricas.residuo, 1e-7)
+
+    def test_fechas_fichero(self):
+        """Las 64 fechas del fichero numérico salen de la serie (índice % 4 = fase)."""
+        f = faseLuna.fechas_fases(2025, 69.0)
+        self.assertEqual(len(f), 64)
+        llenas = [(i, ut) for i, ut in enumerate(f) if ut != 0.0]
+        self.assertEqual([ut for _, ut in llenas], self.serie['ut'][:len(llenas)].tolist())
+        self.assertEqual([i % 4 for i, _ in llenas], self.serie['fase'][:len(llenas)].tolist())
+
+    def test_tabla_latex(self):
+        """Cada fila de la tabla LaTeX lleva la lunación de sus fases en la serie."""
+        buffer = io.BytesIO()
+        with SalidaZip(buffer) as salida:
+            faseLuna.FasesDeLaLunaLatex(2025, 69.0, salida=salida)
+        with zipfile.ZipFile(buffer) as z:
+            filas = z.read("FasesLuna.dat").decode().splitlines()
+
+        del_anio = [(fase, ut, lun) for fase, ut, lun in self.serie.tolist()
+                    if fun.DJADia(ut + faseLuna.AJUSTE_LATEX)[2] == 2025]
+        columnas = [[c.strip() for c in fila.split("\\\\")[0].split("&")] for fila in filas]
+        celdas = [(int(c[0]), k, c[1 + 4 * k: 5 + 4 * k]) for c in columnas for k in range(4)]
+        celdas = [(lun, k, c) for lun, k, c in celdas if c[0]]
+
+        self.assertEqual(len(celdas), len(del_anio))
+        for (lun, k, (mes, dia, hora, minuto)), (fase, ut, lunacion) in zip(celdas, del_anio):
+            d, m, _, h = fun.DJADia(ut + faseLuna.AJUSTE_LATEX)
+            self.assertEqual((lun, k), (lunacion, fase))
+            self.assertEqual((mes, int(dia), int(hora), int(minuto)),
+                             (fun.MesNom(m), d, int(h), int(60.0 * (h - int(h)))))
+
+
+class TestCatalogoFases(unittest.TestCase):
+    """Catálogo precalculado de fases y consultas por búsqueda binaria."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.ruta = mock.patch.object(faseLuna, 'RUTA_CACHE_FASES', Path(cls.tmp.name))
+        cls.ruta.start()
+        faseLuna.construir_catalogo_fases(2024, 2026)
+        cls.catalogo = faseLuna.catalogo_fases()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.ruta.stop()
+        faseLuna._catalogo_memorizado.cache_clear()
+        cls.tmp.cleanup()
+
+    def test_catalogo(self):
+        """Tabla ordenada, de sólo lectura, con fases consecutivas y lunaciones."""
+        self.assertEqual(self.catalogo.dtype, faseLuna.DTYPE_CATALOGO_FASES)
+        self.assertTrue(np.all(np.diff(self.catalogo['tt']) > 0))
+        self.assertTrue(np.all(np.diff(self.catalogo['fase']) % 4 == 1))
+        self.assertEqual(set(np.diff(self.catalogo['lunacion']).tolist()), {0, 1})
+        self.assertFalse(self.catalogo.flags.writeable)
+
+    def test_huella_contenido(self):
+        """El catálogo se identifica por el mismo hash que la caché de páginas."""
+        huella = faseLuna.read_de440.hash_efemerides(faseLuna.read_de440.DE440_PATH)[:16]
+        self.assertEqual(faseLuna._huella_efemerides(), huella)
+        self.assertIsNotNone(faseLuna._catalogo_memorizado(str(faseLuna.RUTA_CACHE_FASES), huella))
+
+    def test_serie_desde_catalogo(self):
+        """La serie de un año cubierto sale del catálogo sin buscar fases."""
+        serie = faseLuna.serie_fases(2025, 50.0)
+        calculada = faseLuna.serie_fases(2025, 50.0, metodo='vectorial')
+        self.assertEqual(faseLuna.METRICAS_FASES[(2025, 50.0, 'catalogo')].fases, len(serie))
+        self.assertEqual(serie['fase'].tolist(), calculada['fase'].tolist())
+        self.assertEqual(serie['lunacion'].tolist(), calculada['lunacion'].tolist())
+        self.assertLess(np.max(np.abs(serie['ut'] - calculada['ut'])) * 86400.0, 0.01)
+
+        # Las lunaciones del catálogo son las de la tabla LaTeX
+        tt = serie['ut'] + 50.0 / 86400.0
+        i = np.searchsorted(self.catalogo['tt'], tt - 1e-6)
+        self.assertEqual(self.catalogo['lunacion'][i].tolist(), serie['lunacion'].tolist())
+
+    def test_fuera_del_catalogo(self):
+        """Un año no cubierto se calcula (o es un error si se exige el catálogo)."""
+        faseLuna.serie_fases(2030, 50.0)
+        self.assertIn((2030, 50.0, 'vectorial'), faseLuna.METRICAS_FASES)
+        with self.assertRaises(ValueError):
+            faseLuna.serie_fases(2031, 50.0, metodo='catalogo')
+        self.assertIsNone(faseLuna.fase_catalogo(fun.DiaJul(1, 1, 2030, 0.0)))
+        self.assertIsNone(faseLuna.edad_luna(fun.DiaJul(1, 1, 2030, 0.0), 50.0))
+
+    def test_consultas(self):
+        """Cuadrante y edad de la Luna iguales a los calculados."""
+        serie = faseLuna.serie_fases(2025, 50.0, metodo='vectorial')
+        nuevas = serie['ut'][serie['fase'] == 0]
+        for ut in fun.DiaJul(1, 1, 2025, 0.0) + np.linspace(0.3, 360.3, 37):
+            with self.subTest(ut=ut):
+                fase = int(faseLuna.elongacion(ut) * 2.0 / np.pi)
+                self.assertEqual(faseLuna.fase_catalogo(ut), fase)
+                self.assertEqual(faseLuna.cual_fase(ut), fase)
+
+                edad = faseLuna.edad_luna(ut, 50.0)
+                self.assertAlmostEqual(edad, ut - nuevas[nuevas <= ut][-1], delta=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
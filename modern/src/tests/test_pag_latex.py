@@ -0,0 +1,109 @@
+import io
+import sys
+import unittest
+from pathlib import Path
+
+# Asegurar que la raíz del proyecto está en sys.path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from modern.src.paginas_an import pagLatex as pl
+
+
+def _linea_arriba(hora, dec_sol=22, dec_lun=27, fen=15):
+    """Línea de la tabla superior con la disposición de columnas de CAMPOS_ARRIBA."""
+    return (f"&{hora:2d}  179 28.1 - {dec_sol:2d} 56.8   11  4.7  66 + {dec_lun:2d} 37.6  42  58    "
+            f"{fen:>2} 20  16 11  17  4  15 20   96  10 12   16")
+
+
+def _linea_abajo(hora, dec=10):
+    """Línea de la tabla inferior (Aries y cuatro planetas) según CAMPOS_ABAJO."""
+    return f"&{hora:2d}  117 12.9  " + f"148 28.5 - {dec:2d}  0.7  " * 4
+
+
+class TestPagLatex(unittest.TestCase):
+    """Pruebas del tratamiento por columnas de las tablas horarias de pagLatex."""
+
+    def test_oculta_repetidos_arriba(self):
+        """Los grados repetidos se ocultan salvo en la primera, última y filas fijas."""
+        filas = pl.PagTexProcessor().tabla_arriba([_linea_arriba(h) for h in range(25)])
+
+        self.assertEqual(len(filas), 25)
+        self.assertIn("&$ $&  &56.8&", filas[2])
+        self.assertIn("&$ $&  &37.6&", filas[2])
+        for i in (0, 5, 6, 11, 12, 17, 18, 24):
+            with self.subTest(fila=i):
+                self.assertIn("&$-$&22&56.8&", filas[i])
+
+    def test_compara_con_filas_originales(self):
+        """Una fila distinta impide ocultar en ella y en sus vecinas."""
+        lineas = [_linea_arriba(h, dec_sol=21 if h == 3 else 22) for h in range(25)]
+        filas = pl.PagTexProcessor().tabla_arriba(lineas)
+
+        self.assertIn("&$-$&22&", filas[2])
+        self.assertIn("&$-$&21&", filas[3])
+        self.assertIn("&$-$&22&", filas[4])
+        self.assertIn("&$ $&  &56.8&", filas[8])
+
+    def test_asteriscos_no_se_ocultan(self):
+        """Las horas '**' de los fenómenos nunca se ocultan; las demás sí."""
+        filas = pl.PagTexProcessor().tabla_arriba([_linea_arriba(h, fen='**') for h in range(25)])
+        self.assertIn("&**&20&  &11&", filas[2])
+
+    def test_formato_filas_arriba(self):
+        """Negrita en la latitud (filas 11, 13, 24) y espacio extra cada 6 horas."""
+        filas = pl.PagTexProcessor().tabla_arriba([_linea_arriba(h) for h in range(25)])
+
+        self.assertTrue(filas[0].startswith(r"\bf  0&179&28.1&$-$&22&56.8& 11&04.7& &"))
+        self.assertIn(pl.HUECO_LATITUD, filas[2])
+        self.assertIn(r"\bf 58 &\bf ", filas[13])
+        self.assertTrue(filas[5].endswith(r" \\[1.0ex]"))
+        self.assertTrue(filas[11].endswith(r" \\[1.0ex]"))
+        self.assertTrue(filas[12].endswith(" \\\\"))
+
+    def test_tabla_abajo(self):
+        """Tabla de planetas: ocultación, relleno de ceros y espaciado cada 6 horas."""
+        filas = pl.PagTexProcessor().tabla_abajo([_linea_abajo(h) for h in range(25)])
+
+        self.assertEqual(len(filas), 25)
+        self.assertEqual(filas[0], r"\bf  0&117&12.9" + r"&148&28.5&$-$&10&00.7" * 4 + "\\\\")
+        self.assertEqual(filas[1], r"\bf  1&117&12.9" + r"&148&28.5&$ $&  &00.7" * 4 + "\\\\")
+        self.assertTrue(filas[5].endswith(r"\\[1.0ex]"))
+
+    def test_matriz_por_columnas(self):
+        """Las columnas formateadas dan la misma matriz que las líneas del .dat."""
+        lineas = [_linea_abajo(h) + " sobrante" for h in range(25)]
+        por_lineas = pl.TABLA_ABAJO.matriz_lineas(lineas)
+        por_columnas = pl.TABLA_ABAJO.matriz_columnas([(1, [f"{h:2d}" for h in range(25)]),
+                                                       (4, [linea[4:] for linea in lineas])])
+        self.assertTrue((por_lineas == por_columnas).all())
+        self.assertEqual(pl.PagTexProcessor().filas_abajo(por_columnas),
+                         pl.PagTexProcessor().tabla_abajo(lineas))
+
+    def test_pagina_completa(self):
+        """Una página completa produce todas las macros y no cierra el flujo externo."""
+        cabecera = ["    Jueves   3  de  Enero  de  2025", "S D : 16.0", "PMG : 12  1.1",
+                    "S D : 15.1", "Edad : 12.3", "PMG : 21 33", "PHE :  4 55.4",
+                    "PHE : 12 55.3", "PHE : 20 55.2", "Rº PMG  48"]
+        arriba = [_linea_arriba(h) for h in range(25)]
+        medio = ["PMG Aries : 17  8.5"] + ["PMG : 15  6", "Mag. : - 4.4"] * 4
+        abajo = [_linea_abajo(h) for h in range(25)]
+        pie = ["DIF               +  1      + 11      + 35      +  0      + 27      +  0      + 23      +  1",
+               "\\def\\figlun{FigLuna07.epsf scaled 120}"]
+        contenido = "\n".join(cabecera + arriba + medio + abajo + pie) + "\n"
+
+        salida = io.StringIO()
+        pl.PagTexProcessor().pagtex_bis(3, 2025, input_content=contenido, output_stream=salida)
+        lineas = salida.getvalue().splitlines()
+
+        self.assertFalse(salida.closed)
+        self.assertEqual(len(lineas), 10 + 27 + 9 + 27 + 2)
+        self.assertEqual(lineas[2], r"\def\pmgsol{12\Hora\ 01.1\Mint}")
+        self.assertEqual(lineas[10], r"\def\arriba{")
+        self.assertEqual(lineas[36], "}")
+        self.assertEqual(lineas[-1], r"\def\figlun{FigLuna07.pdf}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import math
+import sys
+import unittest
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+# Asegurar que la raíz del proyecto y 'src' están en sys.path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+src_root = project_root / "modern" / "src"
+for ruta in (project_root, src_root):
+    if str(ruta) not in sys.path:
+        sys.path.append(str(ruta))
+
+from paralajes_v_m import VenusMarte
+from utils import funciones as fun
+from utils import read_de440
+from utils import tabla_cambios
+from utils.salida import SalidaZip
+
+
+class TestParalajesVenusMarte(unittest.TestCase):
+    """Paralajes de Venus y Marte de todo el año como una matriz (días x 4)."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.jd, cls.paralajes = VenusMarte.calcular_paralajes(2025, 69.0)
+
+    def test_fechas(self):
+        """Primera fila el 2 de enero sin Delta T; el resto, un día por fila con Delta T."""
+        jd0 = fun.DiaJul(1, 1, 2025, 0.0)
+        self.assertEqual(self.paralajes.shape, (365, 4))
+        self.assertEqual(self.jd[0], fun.DiaJul(2, 1, 2025, 0.0))
+        np.testing.assert_array_equal(self.jd[1:], jd0 + np.arange(1, 365) + 69.0 / 86400.0)
+
+    def test_matriz_frente_a_escalar(self):
+        """Cada fila es el cálculo escalar del día (Venus con la distancia de Marte tras el primer día)."""
+        alturas = [math.radians(a) for a in VenusMarte.ALTURAS_GRADOS]
+        for i in (0, 1, 100, 364):
+            with self.subTest(dia=i):
+                r_marte = read_de440.GeoDista(float(self.jd[i]), 4)
+                r_venus = read_de440.GeoDista(float(self.jd[i]), 2) if i == 0 else r_marte
+                esperado = [fun.Rad2MArc(math.asin(VenusMarte.RADIO_TIERRA / r * math.cos(a)))
+                            for r, a in zip([r_marte] * 3 + [r_venus], alturas)]
+                np.testing.assert_allclose(self.paralajes[i], esperado, rtol=1e-12)
+
+    def test_fichero(self):
+        """Tabla de cambios con Venus en la primera columna."""
+        buffer = io.BytesIO()
+        with SalidaZip(buffer) as salida:
+            VenusMarte.calculo_paralaje(2025, 69.0, salida=salida)
+        with zipfile.ZipFile(buffer) as z:
+            lineas = z.read("AN2025387.dat").decode().splitlines()
+
+        esperado = tabla_cambios.tabla_cambios(self.jd, self.paralajes[:, VenusMarte.ORDEN_COLUMNAS])
+        self.assertEqual(lineas, esperado)
+        self.assertEqual(lineas[1].count("\\Minp"), 4)
+        self.assertTrue(lineas[0].startswith(" Ene.& 1&"))
+        self.assertTrue(lineas[-1].startswith(" Dic.&31&"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import io
+import math
+import sys
+import unittest
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+# Asegurar que la raíz del proyecto y 'src' están en sys.path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+src_root = project_root / "modern" / "src"
+for ruta in (project_root, src_root):
+    if str(ruta) not in sys.path:
+        sys.path.append(str(ruta))
+
+from polar import main_polar
+from polar.main_polar import DEG
+from utils import read_de440
+from utils.salida import SalidaZip
+
+
+class _PosicionesPolar2025(unittest.TestCase):
+    """Posiciones mensuales de la Polar de 2025 y sus medias, comunes a las pruebas."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.al, cls.de = main_polar.calcular_posiciones_polar(2025)
+        cls.a0 = float(np.mean(cls.al))
+        cls.d0 = float(np.mean(cls.de))
+        cls.cd = math.pi / 2.0 - cls.d0
+
+
+class TestPolarVectorial(_PosicionesPolar2025):
+    """Posiciones mensuales de la Polar y tablas 382-385 como rejillas de NumPy."""
+
+    def test_posiciones_mensuales(self):
+        """Las 13 posiciones en lote coinciden con las observaciones mes a mes."""
+        ts = read_de440._ts
+        earth = read_de440._planets['earth']
+        for k in range(13):
+            t = ts.ut1(2025 + k // 12, k % 12 + 1, 1)
+            ra, dec, _ = earth.at(t).observe(main_polar.POLARIS).apparent().radec(epoch='date')
+            self.assertAlmostEqual(self.al[k], ra.radians, delta=1e-12)
+            self.assertAlmostEqual(self.de[k], dec.radians, delta=1e-12)
+
+    def test_rejillas(self):
+        """Cada celda de las rejillas es la fórmula escalar de su fila y columna."""
+        angulos, tabla_i = main_polar._tabla_i(self.a0, self.cd, main_polar.INICIO_383)
+        tabla_ii = main_polar._tabla_ii(self.a0, self.cd)
+        tabla_iii = main_polar._tabla_iii(self.a0, self.d0, self.cd, self.al, self.de)
+        azimutes = main_polar._azimutes(self.a0, self.d0)
+        self.assertEqual(tabla_i.shape, (53, 7))
+        self.assertEqual(tabla_ii.shape, (19, 12))
+        self.assertEqual(tabla_iii.shape, (19, 13))
+        self.assertEqual(azimutes.shape, (37, 12))
+
+        k, j = 17, 5
+        self.assertEqual(angulos[k, j], 0.5 * (364 + k) + 26 * j)
+        self.assertAlmostEqual(tabla_i[k, j],
+                               -self.cd * math.cos(angulos[k, j] * DEG - self.a0) * 60.0 / DEG)
+
+        t_val = 20.0 * 7 * DEG - self.a0
+        self.assertAlmostEqual(tabla_ii[7, 3], 0.5 * self.cd**2 * math.sin(t_val)**2
+                               * math.tan(25.0 * DEG) * 60.0 / DEG)
+        self.assertAlmostEqual(tabla_iii[7, 3], ((self.de[3] - self.d0) * math.cos(t_val)
+                               - self.cd * math.sin(self.al[3] - self.a0) * math.sin(t_val)) * 60.0 / DEG)
+
+        t_val = 10.0 * 11 * DEG - self.a0
+        self.assertAlmostEqual(azimutes[11, 4], math.atan(
+            -math.sin(t_val) / (math.tan(self.d0) * math.cos(30.0 * DEG))) / DEG)
+
+    def test_paginas(self):
+        """Número de filas y columnas vacías al final de la página 383."""
+        buffer = io.BytesIO()
+        with SalidaZip(buffer) as salida:
+            main_polar.generar_datos_polar(2025, 69.0, salida=salida)
+
+        with zipfile.ZipFile(buffer) as z:
+            paginas = {nombre[6:-4]: z.read(nombre).decode().splitlines() for nombre in z.namelist()}
+
+        filas = {"382": 53, "383": 53, "384A": 19, "384B": 19, "385": 37}
+        for pagina, n in filas.items():
+            self.assertEqual(len(paginas[pagina]), n, pagina)
+
+        for linea in paginas["383"][45:]:
+            self.assertIn(main_polar.CELDA_VACIA_TABLA_I, linea)
+        self.assertNotIn(main_polar.CELDA_VACIA_TABLA_I, paginas["383"][44])
+
+
+class TestCorreccionPolar(_PosicionesPolar2025):
+    """Consulta de correcciones de la Polar para un instante cualquiera."""
+
+    def test_coincide_con_tablas(self):
+        """El día 1 de un mes a 0h UT1 da los valores de las Tablas I-III."""
+        jd = read_de440._ts.ut1(2025, 4, 1).ut1
+        angulos = main_polar.ANGULOS_TABLA_II
+        c = main_polar.polaris_correction(jd, angulos[:, None], main_polar.ALTURAS)
+
+        t_val = angulos * DEG - self.a0
+        np.testing.assert_allclose(c.q1[:, 0], -self.cd * np.cos(t_val) * 60.0 / DEG, atol=1e-9)
+        np.testing.assert_allclose(c.q2, main_polar._tabla_ii(self.a0, self.cd), atol=1e-9)
+        tabla_iii = main_polar._tabla_iii(self.a0, self.d0, self.cd, self.al, self.de)
+        np.testing.assert_allclose(c.q3[:, 0], tabla_iii[:, 3], atol=1e-6)
+
+    def test_latitud(self):
+        """La latitud recupera la del observador a partir de la altura verdadera."""
+        ts = read_de440._ts
+        earth = read_de440._planets['earth']
+        rng = np.random.default_rng(5)
+        jd = ts.ut1(2025, 1, 1).ut1 + rng.uniform(0.0, 365.0, 50)
+        lha = rng.uniform(0.0, 360.0, 50)
+        latitud = rng.uniform(10.0, 60.0, 50)
+
+        ra, dec, _ = earth.at(ts.ut1_jd(jd)).observe(main_polar.POLARIS).apparent().radec(epoch='date')
+        t_val = lha * DEG - ra.radians
+        altura = np.arcsin(np.sin(latitud * DEG) * np.sin(dec.radians)
+                           + np.cos(latitud * DEG) * np.cos(dec.radians) * np.cos(t_val)) / DEG
+        azimut = np.arctan2(-np.sin(t_val), np.cos(latitud * DEG) * np.tan(dec.radians)
+                            - np.sin(latitud * DEG) * np.cos(t_val)) / DEG
+
+        c = main_polar.polaris_correction(jd, lha, altura)
+        self.assertLess(np.max(np.abs(c.latitud - latitud)) * 60.0, 0.2)
+        self.assertLess(np.max(np.abs(c.azimut - azimut)), 0.05)
+
+    def test_efemeride_cacheada(self):
+        """La efeméride diaria se calcula una vez por año y es de sólo lectura."""
+        jd = read_de440._ts.ut1(2026, 6, 15.3).ut1
+        main_polar.polaris_correction(jd, 50.0, 40.0)
+        aciertos = main_polar.efemeride_diaria_polar.cache_info().hits
+        c = main_polar.polaris_correction(jd, 50.0, 40.0)
+        self.assertEqual(main_polar.efemeride_diaria_polar.cache_info().hits, aciertos + 1)
+        self.assertIsInstance(c.latitud, float)
+
+        jd_dia, al, _, _, _ = main_polar.efemeride_diaria_polar(2026)
+        self.assertEqual(len(jd_dia), 366)
+        with self.assertRaises(ValueError):
+            al[0] = 0.0
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import io
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+# Asegurar que la raíz del proyecto está en sys.path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from modern.src.utils.salida import SalidaDirectorio, SalidaZip
+
+
+class _FlujoSinPosicion(io.RawIOBase):
+    """Flujo binario de sólo escritura sin seek (como una respuesta HTTP)."""
+
+    def __init__(self):
+        super().__init__()
+        self.datos = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.datos.extend(b)
+        return len(b)
+
+
+class TestSalida(unittest.TestCase):
+    """Destinos de salida de los generadores (directorio y ZIP en flujo)."""
+
+    def test_directorio(self):
+        """SalidaDirectorio crea las subcarpetas y escribe en disco."""
+        with tempfile.TemporaryDirectory() as tmp:
+            salida = SalidaDirectorio(Path(tmp) / "2025")
+            with salida.abrir("latex/AN202501.dat", encoding='latin-1') as f:
+                f.write("ñ\n")
+            ruta = salida.ruta("latex/AN202501.dat")
+            self.assertEqual(ruta.read_bytes(), "ñ\n".encode('latin-1'))
+            self.assertEqual(str(salida), str(Path(tmp) / "2025"))
+
+    def test_zip_entradas_simultaneas(self):
+        """Varias entradas abiertas a la vez acaban completas en el ZIP."""
+        buffer = io.BytesIO()
+        with SalidaZip(buffer) as salida:
+            ficheros = [salida.abrir(f"AN2025{n}.DAT") for n in (376, 377, 378)]
+            for linea in range(200):
+                for n, f in zip((376, 377, 378), ficheros):
+                    f.write(f"{n} {linea}\n")
+            for f in reversed(ficheros):
+                f.close()
+            with salida.abrir("latex/AN202501.dat", encoding='latin-1') as f:
+                f.write("\\def\\fecha{Miércoles}\n")
+
+        with zipfile.ZipFile(buffer) as z:
+            self.assertEqual(sorted(z.namelist()),
+                             ["AN2025376.DAT", "AN2025377.DAT", "AN2025378.DAT",
+                              "latex/AN202501.dat"])
+            texto = z.read("AN2025377.DAT").decode()
+            self.assertEqual(texto.splitlines()[-1], "377 199")
+            self.assertEqual(len(texto.splitlines()), 200)
+            self.assertEqual(z.read("latex/AN202501.dat").decode('latin-1'),
+                             "\\def\\fecha{Miércoles}\n")
+
+    def test_zip_flujo_sin_posicion(self):
+        """El ZIP se puede escribir sobre un flujo sin seek."""
+        flujo = _FlujoSinPosicion()
+        with SalidaZip(flujo) as salida:
+            with salida.abrir("a.dat") as f_a, salida.abrir("b.dat") as f_b:
+                f_a.write("A" * 10000)
+                f_b.write("B")
+
+        with zipfile.ZipFile(io.BytesIO(bytes(flujo.datos))) as z:
+            self.assertEqual(z.read("a.dat"), b"A" * 10000)
+            self.assertEqual(z.read("b.dat"), b"B")
+
+    def test_zip_cierra_entradas_abiertas(self):
+        """'cerrar' vuelca al ZIP el texto en búfer de las entradas sin cerrar."""
+        buffer = io.BytesIO()
+        with self.assertRaises(RuntimeError):
+            with SalidaZip(buffer) as salida:
+                f_a = salida.abrir("a.dat")
+                f_b = salida.abrir("b.dat")
+                f_a.write("A\n")
+                f_b.write("B\n")
+                raise RuntimeError("fallo del generador")
+
+        self.assertTrue(f_a.closed and f_b.closed)
+        with zipfile.ZipFile(buffer) as z:
+            self.assertEqual(z.read("a.dat"), b"A\n")
+            self.assertEqual(z.read("b.dat"), b"B\n")
+
+    def test_generador_en_zip(self):
+        """Un generador produce el mismo fichero en un directorio y en un ZIP."""
+        from modern.src.uso_anio_siguiente import uso_anio_siguiente
+
+        buffer = io.BytesIO()
+        with SalidaZip(buffer) as salida:
+            ruta = uso_anio_siguiente.compute_corrections(2023, 69.0, salida=salida)
+        self.assertEqual(str(ruta), "AN2023TUSO2024.DAT")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            en_disco = uso_anio_siguiente.compute_corrections(
+                2023, 69.0, salida=SalidaDirectorio(tmp))
+            with zipfile.ZipFile(buffer) as z:
+                self.assertEqual(z.read(str(ruta)), en_disco.read_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
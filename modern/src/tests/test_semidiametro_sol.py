@@ -0,0 +1,59 @@
+import io
+import sys
+import unittest
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+# Asegurar que la raíz del proyecto y 'src' están en sys.path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+src_root = project_root / "modern" / "src"
+for ruta in (project_root, src_root):
+    if str(ruta) not in sys.path:
+        sys.path.append(str(ruta))
+
+from semi_diametro_sol import SDSol
+from utils import funciones as fun
+from utils import read_de440
+from utils import tabla_cambios
+from utils.salida import SalidaZip
+
+
+class TestSemiDiametroSol(unittest.TestCase):
+    """Semidiámetro del Sol de todo el año sobre la serie compartida de distancias."""
+
+    def test_frente_a_escalar(self):
+        """Cada día coincide con el cálculo escalar con GeoDista."""
+        jd, valor = SDSol.semidiametro_sol(2025, 69.0)
+        self.assertEqual(valor.shape, (365,))
+        for i in (0, 1, 180, 364):
+            with self.subTest(dia=i):
+                r = read_de440.GeoDista(float(jd[i]), SDSol.ID_SOL)
+                esperado = fun.Rad2MArc(np.arcsin(SDSol.RADIO_SOL / r)) - SDSol.SD_BASE
+                self.assertAlmostEqual(valor[i], esperado, delta=1e-12)
+
+    def test_serie_compartida(self):
+        """Las distancias se calculan una vez por (año, Delta T, cuerpo) y son de sólo lectura."""
+        r = tabla_cambios.distancias_tabla(2026, 69.0, SDSol.ID_SOL)
+        aciertos = tabla_cambios.distancias_tabla.cache_info().hits
+        SDSol.semidiametro_sol(2026, 69.0)
+        self.assertEqual(tabla_cambios.distancias_tabla.cache_info().hits, aciertos + 1)
+        with self.assertRaises(ValueError):
+            r[0] = 1.0
+
+    def test_fichero(self):
+        """AN<año>387B.dat en el destino dado, con la tabla de cambios de una columna."""
+        buffer = io.BytesIO()
+        with SalidaZip(buffer) as salida:
+            SDSol.SemiDiametroSol(2025, 69.0, salida=salida)
+        with zipfile.ZipFile(buffer) as z:
+            lineas = z.read("AN2025387B.dat").decode().splitlines()
+
+        jd, valor = SDSol.semidiametro_sol(2025, 69.0)
+        self.assertEqual(lineas, tabla_cambios.tabla_cambios(jd, valor, limpiar_cero=True))
+        self.assertEqual(lineas[-1], f" Dic.&31&{tabla_cambios.CELDA_VACIA}\\\\")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Asegurar que la raíz del proyecto y 'src' están en sys.path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+src_root = project_root / "modern" / "src"
+for ruta in (project_root, src_root):
+    if str(ruta) not in sys.path:
+        sys.path.append(str(ruta))
+
+from utils import funciones as fun
+from utils import tabla_cambios
+
+
+class TestTablaCambios(unittest.TestCase):
+    """Tablas de cambios de magnitudes diarias (páginas 387 y 387B)."""
+
+    def test_fechas(self):
+        """2 de enero sin Delta T y después un día por fila con Delta T."""
+        jd = tabla_cambios.fechas_tabla(2024, 69.0)
+        self.assertEqual(len(jd), 366)
+        self.assertEqual(jd[0], fun.DiaJul(2, 1, 2024, 0.0))
+        self.assertEqual(jd[365], fun.DiaJul(31, 12, 2024, 0.0) + 69.0 / 86400.0)
+        self.assertEqual(len(tabla_cambios.fechas_tabla(2025, 69.0)), 365)
+
+    def test_celdas(self):
+        """Formato F4.1 con signo '+' y limpieza opcional de '-0.0'."""
+        valores = np.array([[0.26, -0.04, 0.04, -1.25]])
+        cadenas, signos = tabla_cambios.celdas_decimas(valores)
+        self.assertEqual(cadenas.tolist(), [[" 0.3", "-0.0", " 0.0", "-1.2"]])
+        self.assertEqual(signos.tolist(), [["+0.3", "-0.0", " 0.0", "-1.2"]])
+
+        cadenas, signos = tabla_cambios.celdas_decimas(valores, limpiar_cero=True)
+        self.assertEqual(cadenas[0, 1], " 0.0")
+        self.assertEqual(signos[0, 1], " 0.0")
+
+    def test_tabla(self):
+        """Una entrada por cambio, fechada el día anterior, y la línea del 31 de diciembre."""
+        jd = tabla_cambios.fechas_tabla(2025, 0.0)
+        valores = np.zeros((len(jd), 2))
+        valores[40:, 0] = 0.2       # cambia el 10 de febrero
+        valores[100:, 1] = -0.31    # cambia el 11 de abril
+
+        lineas = tabla_cambios.tabla_cambios(jd, valores)
+        vacias = "&".join([tabla_cambios.CELDA_VACIA] * 2)
+        self.assertEqual(lineas, [
+            f" Ene.& 1&{vacias}\\\\",
+            "     &  &$ $0\\Minp 0&$ $0\\Minp 0\\\\",
+            f" Feb.& 9&{vacias}\\\\",
+            "     &  &$+$0\\Minp 2&$ $0\\Minp 0\\\\",
+            f" Abr.&10&{vacias}\\\\",
+            "     &  &$+$0\\Minp 2&$-$0\\Minp 3\\\\",
+            f" Dic.&31&{vacias}\\\\",
+        ])
+
+        # Una serie de una sola columna
+        lineas = tabla_cambios.tabla_cambios(jd, valores[:, 0])
+        self.assertEqual(len(lineas), 5)
+        self.assertEqual(lineas[3], "     &  &$+$0\\Minp 2\\\\")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Asegurar que la raíz del proyecto está en sys.path
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from modern.src.paginas_an import tablas_puertos as tp
+from modern.src.paginas_an.ortoocasol import fenosol
+
+
+class TestTablasPuertos(unittest.TestCase):
+    """Pruebas del cálculo vectorizado de fenómenos para listas de puertos."""
+
+    PUERTOS = [("Cadiz", 36.533, -6.300), ("Reykjavik", 64.150, -21.950),
+               ("Wellington", -41.283, 174.783)]
+    JD_INICIO = 2460676.5   # 1 de enero de 2025, 0h UT1
+
+    @classmethod
+    def setUpClass(cls):
+        lats = [p[1] for p in cls.PUERTOS]
+        lons = [p[2] for p in cls.PUERTOS]
+        cls.res = tp.calcular_fenomenos_puertos(lats, lons, cls.JD_INICIO, 10)
+
+    def test_shapes(self):
+        """Cada fenómeno devuelve un array (puertos x días)."""
+        for evt in tp.EVENTOS_SOL:
+            self.assertEqual(self.res['sol'][evt].shape, (3, 10))
+        for evt in tp.EVENTOS_LUNA:
+            self.assertEqual(self.res['luna'][evt].shape, (3, 10))
+
+    def test_matches_fenosol(self):
+        """Las horas solares coinciden con 'fenosol' por debajo del minuto."""
+        for ip, (nombre, lat, lon) in enumerate(self.PUERTOS):
+            for d in (0, 5, 9):
+                for evt in tp.EVENTOS_SOL:
+                    with self.subTest(puerto=nombre, dia=d, evento=evt):
+                        # 'fenosol' toma como día UT el de int(jd) - 0.5
+                        esperado = fenosol(self.JD_INICIO + d + 0.6, lat, evt, lon)
+                        obtenido = self.res['sol'][evt][ip, d]
+                        if esperado == tp.SIN_FENOMENO:
+                            self.assertEqual(obtenido, tp.SIN_FENOMENO)
+                        else:
+                            self.assertAlmostEqual(obtenido, esperado, delta=1.0 / 60.0)
+
+    def test_table_file(self):
+        """El fichero tiene un bloque por puerto con una fila por día."""
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = Path(tmp) / "puertos.dat"
+            tp.generar_tablas_puertos(self.PUERTOS, 1, 1, 2025, 3, ruta_salida=ruta)
+            lineas = ruta.read_text(encoding='utf-8').splitlines()
+
+        self.assertEqual(len(lineas), 1 + len(self.PUERTOS) * 4)
+        self.assertTrue(lineas[1].startswith("# Cadiz"))
+        self.assertTrue(lineas[2].startswith("01 01 2025 "))
+        self.assertEqual(len(lineas[2].split()), 3 + 8)
+
+    def test_start_date(self):
+        """La primera fila es el día pedido aunque UT1 - UTC sea negativo."""
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = Path(tmp) / "puertos.dat"
+            tp.generar_tablas_puertos(self.PUERTOS[:1], 1, 1, 2050, 1, ruta_salida=ruta)
+            lineas = ruta.read_text(encoding='utf-8').splitlines()
+
+        self.assertTrue(lineas[2].startswith("01 01 2050 "))
+
+
+if __name__ == '__main__':
+    unittest.main()
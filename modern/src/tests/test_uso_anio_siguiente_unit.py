@@ -44,6 +44,30 @@ class TestUsoAnioSiguiente(unittest.TestCase):
         # Feb 29 exists in 2012 but not 2013. Should raise ValueError for 2013 and be skipped.
         self.assertNotIn((29, 2), data)
 
+    def test_vectorized_against_scalar(self):
+        """The array form matches the day-by-day scalar GAST and solar RA computation."""
+        from modern.src.utils import coordena
+        from modern.src.utils.coordena import ts
+
+        ano = 2024  # Leap: Feb 29 exists only in the first year
+        dt = 69.2
+        dias, meses, corr = core.calculate_corrections_arrays(ano, dt)
+        self.assertEqual(len(dias), 365)
+        self.assertEqual(list(zip(dias[:2].tolist(), meses[:2].tolist())), [(1, 1), (2, 1)])
+        self.assertEqual((dias[-1], meses[-1]), (31, 12))
+        self.assertEqual(list(core.calculate_corrections_data(ano, dt).values()), corr.tolist())
+
+        for k in (0, 58, 59, 200, 364):
+            with self.subTest(dia=int(dias[k]), mes=int(meses[k])):
+                gha = []
+                for year in (ano, ano + 1):
+                    t_base = ts.utc(year, int(meses[k]), int(dias[k]))
+                    t = ts.tt_jd(int(t_base.ut1) + 0.5 + dt / 86400.0)
+                    ar, _, _ = coordena.equatorial_apparent(11, t)
+                    gha.append((t.gast * 15.0 * core.DEGREE - ar) % core.DPI)
+                diff = (gha[1] - gha[0] + core.PI) % core.DPI - core.PI
+                self.assertAlmostEqual(corr[k], diff / core.DEGREE * 60.0, delta=1e-9)
+
     def test_generate_latex_file(self):
         """Test that the LaTeX file is generated with correct content and column alignment."""
 
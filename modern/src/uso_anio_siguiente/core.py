@@ -7,8 +7,8 @@ el año siguiente.
 
 import logging
 import math
-from datetime import date
-from typing import cast
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +28,74 @@ DPI = 2.0 * PI
 DEGREE = PI / 180.0
 
 
+def valid_dates(ano: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    CABECERA:       valid_dates(ano)
+    DESCRIPCIÓN:    Fechas (día, mes) que existen tanto en 'ano' como en 'ano+1',
+                    en orden cronológico (mes a mes).
+
+    PRECONDICIÓN:   - ano: Año del Almanaque actual (int).
+
+    POSTCONDICIÓN:  Tupla (dias, meses) de arrays de enteros.
+                    El 29 de febrero nunca se incluye: dos años consecutivos
+                    no pueden ser bisiestos a la vez.
+    """
+    fechas = np.arange(np.datetime64(f"{ano:04d}-01-01"),
+                       np.datetime64(f"{ano + 1:04d}-01-01"))
+    inicio_mes = fechas.astype("datetime64[M]")
+
+    meses = inicio_mes.astype(np.int64) % 12 + 1
+    dias = (fechas - inicio_mes).astype(np.int64) + 1
+
+    validas = ~((meses == 2) & (dias == 29))
+    return dias[validas], meses[validas]
+
+
+def calculate_corrections_arrays(ano: int, dt_seconds: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    CABECERA:       calculate_corrections_arrays(ano, dt_seconds)
+    DESCRIPCIÓN:    Forma vectorial de calculate_corrections_data: las fechas
+                    válidas de los dos años se evalúan juntas, con una sola
+                    llamada a GAST y otra a la AR aparente del Sol.
+
+    PRECONDICIÓN:   - ano: Año del Almanaque actual (int, ej: 2025).
+                    - dt_seconds: ΔT = TT - UT1 en segundos (float).
+
+    POSTCONDICIÓN:  Tupla (dias, meses, correcciones) de arrays paralelos, con
+                    las correcciones en minutos de arco (ver
+                    calculate_corrections_data).
+    """
+    dias, meses = valid_dates(ano)
+    n = len(dias)
+
+    # Fechas de los dos años: primero las de 'ano' y después las de 'ano+1'
+    anos = np.repeat([ano, ano + 1], n)
+    t_base = ts.utc(anos, np.tile(meses, 2), np.tile(dias, 2))
+
+    # Forzamos 0h UT1 para coincidir con la definición clásica del Almanaque
+    # ts.utc(ano, mes, dia) devuelve 0h UTC.
+    # Tomamos el número de día juliano entero y sumamos 0.5 para tener 0h UT1 exactas.
+    jd_ut1 = np.floor(t_base.ut1) + 0.5
+    t = ts.tt_jd(jd_ut1 + dt_seconds / 86400.0)
+
+    # GAST (theta) en radianes: horas siderales * 15 * (pi/180)
+    theta = (t.gast * 15.0 * DEGREE) % DPI
+
+    # AR (alpha) del Sol (cuerpo 11) en radianes
+    ar, _, _ = coordena_moderno.equatorial_apparent(11, t)
+
+    # GHA = theta - alpha
+    gha = (theta - ar) % DPI
+    gha1, gha2 = gha[:n], gha[n:]
+
+    # Delta = GHA(N+1) - GHA(N), normalizado a [-PI, PI] (camino más corto)
+    diff = gha2 - gha1
+    diff = np.where(diff > PI, diff - DPI, np.where(diff < -PI, diff + DPI, diff))
+
+    # Conversión a minutos de arco: diff_rad * (180/pi) * 60
+    return dias, meses, (diff / DEGREE) * 60.0
+
+
 def calculate_corrections_data(ano: int, dt_seconds: float) -> dict[tuple[int, int], float]:
     """
     CABECERA:       calculate_corrections_data(ano, dt_seconds)
@@ -43,73 +111,15 @@ def calculate_corrections_data(ano: int, dt_seconds: float) -> dict[tuple[int, i
                     - Valores: corrección en minutos de arco (float).
                     - Los días inexistentes (ej: 30 Feb) se omiten.
 
-                    ALGORITMO:
+                    ALGORITMO (vectorial, ver calculate_corrections_arrays):
                     1. GAST (θ): Greenwich Apparent Sidereal Time [calculado en UT1]
                     2. AR (α): Ascensión Recta Aparente del Sol [calculado en TT]
                     3. GHA = θ - α
                     4. Corrección = GHA(año+1) - GHA(año), normalizado a [-π, π]
     """
-    data: dict[tuple[int, int], float] = {}
-
     logger.info(
         f"Calculando correcciones para {ano}-{ano+1} con DT={dt_seconds}s...")
 
-    for mes in range(1, 13):
-        for dia in range(1, 32):
-            try:
-                # Validación estricta: date() lanza ValueError si la fecha no existe
-                date(ano, mes, dia)
-                date(ano + 1, mes, dia)
-
-                t_base_1 = ts.utc(ano, mes, dia)
-                t_base_2 = ts.utc(ano + 1, mes, dia)
-            except ValueError:
-                continue
-
-            # --- AÑO ACTUAL (1) ---
-            # Forzamos 0h UT1 para coincidir con la definición clásica del Almanaque
-            # ts.utc(ano, mes, dia) devuelve 0h UTC.
-            # Obtenemos el número de día juliano entero y sumamos 0.5 para tener 0h UT1 exactas.
-            jd_ut1_val_1 = int(t_base_1.ut1) + 0.5
-            jd_tt1 = jd_ut1_val_1 + dt_seconds / 86400.0
-            t1 = ts.tt_jd(jd_tt1)
-
-            # GAST (theta) en radianes
-            # t1.gast devuelve horas siderales, convertimos a radianes:
-            # theta = gast * 15 * (pi/180)
-            ts1 = (cast(float, t1.gast) * 15.0 * DEGREE) % DPI
-
-            # AR (alpha) del Sol (cuerpo 11) en radianes
-            ar1, _, _ = coordena_moderno.equatorial_apparent(11, t1)
-
-            # --- AÑO SIGUIENTE (2) ---
-            jd_ut1_val_2 = int(t_base_2.ut1) + 0.5
-            jd_tt2 = jd_ut1_val_2 + dt_seconds / 86400.0
-            t2 = ts.tt_jd(jd_tt2)
-
-            # GAST (theta) en radianes
-            ts2 = (cast(float, t2.gast) * 15.0 * DEGREE) % DPI
-
-            # AR (alpha) del Sol (cuerpo 11) en radianes
-            ar2, _, _ = coordena_moderno.equatorial_apparent(11, t2)
-
-            # --- CÁLCULO ---
-            # GHA = theta - alpha
-            gha1 = (ts1 - ar1) % DPI
-            gha2 = (ts2 - ar2) % DPI
-
-            # Delta = GHA(N+1) - GHA(N)
-            diff = gha2 - gha1
-
-            # Normalización a [-PI, PI] para obtener el camino más corto
-            if diff > PI:
-                diff -= DPI
-            elif diff < -PI:
-                diff += DPI
-
-            # Conversión a minutos de arco
-            # Corrección = diff_rad * (180/pi) * 60
-            corr_arc_minutes = (diff / DEGREE) * 60.0
-            data[(dia, mes)] = corr_arc_minutes
-
-    return data
+    dias, meses, correcciones = calculate_corrections_arrays(ano, dt_seconds)
+    return {(dia, mes): corr
+            for dia, mes, corr in zip(dias.tolist(), meses.tolist(), correcciones.tolist())}
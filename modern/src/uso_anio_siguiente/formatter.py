@@ -5,11 +5,13 @@ Generación de ficheros de salida (LaTeX) para las correcciones del uso del Alma
 """
 
 import calendar
+import contextlib
 
 
 def generate_latex_file(data, ano, output_path):
     """
     Genera el fichero LaTeX a partir de los datos calculados.
+    'output_path' puede ser una ruta o un flujo de texto ya abierto (no se cierra).
     """
     # Matriz de cadenas para la salida LaTeX
     correc = [["    " for _ in range(12)] for _ in range(31)]
@@ -19,7 +21,12 @@ def generate_latex_file(data, ano, output_path):
         s = f"{val:+4.1f}"
         correc[dia - 1][mes - 1] = s
 
-    with output_path.open("w", encoding="ascii") as f:
+    if hasattr(output_path, "write"):
+        destino = contextlib.nullcontext(output_path)
+    else:
+        destino = output_path.open("w", encoding="ascii")
+
+    with destino as f:
 
         def cell(d, m):
             return correc[d - 1][m - 1]
@@ -30,12 +30,22 @@ except ImportError:
     from modern.src.utils.coordena import ts
 
 
-def compute_corrections(ano, dt_seconds, base_dir=None):
+def compute_corrections(ano, dt_seconds, base_dir=None, salida=None):
     """
     Orquesta el cálculo y la generación del fichero.
+
+    Si se da 'salida' (destino de utils/salida.py, directorio o ZIP) el fichero
+    se escribe en él y se ignora 'base_dir'.
     """
     can1 = f"{ano:04d}"
     can2 = f"{ano + 1:04d}"
+    nombre = f"AN{can1}TUSO{can2}.DAT"
+
+    if salida is not None:
+        data = core.calculate_corrections_data(ano, dt_seconds)
+        with salida.abrir(nombre, encoding="ascii") as f:
+            formatter.generate_latex_file(data, ano, f)
+        return salida.ruta(nombre)
 
     if base_dir:
         output_dir = Path(base_dir) / can1
@@ -48,7 +58,7 @@ def compute_corrections(ano, dt_seconds, base_dir=None):
         output_dir = Path("output") / can1
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / f"AN{can1}TUSO{can2}.DAT"
+    output_path = output_dir / nombre
 
     # 1. Calcular datos (Core Logic)
     data = core.calculate_corrections_data(ano, dt_seconds)
@@ -10,6 +10,8 @@
 #            cargan en memoria la primera vez que se llama a una función.
 # =============================================================================
 
+import hashlib
+
 from skyfield.api import load
 # Importamos iau2000a (Modelo completo de alta precisión para nutación)
 from skyfield.nutationlib import iau2000a
@@ -26,6 +28,7 @@ DE440_PATH = BASE_DIR / "data" / "de440.bsp"
 
 # Variables Globales (Singleton) para evitar recargas
 _planets = None
+_hash_efemerides_memo = {}  # SHA-256 por (ruta, tamaño, fecha de modificación)
 _ts = load.timescale()  # Escala de tiempo (siempre cargada)
 
 # Constantes de Conversión
@@ -60,6 +63,32 @@ def load_data():
         _planets = load('de440.bsp')
 
 
+def hash_efemerides(ruta=DE440_PATH):
+    """
+    CABECERA:       hash_efemerides(ruta=DE440_PATH)
+    DESCRIPCIÓN:    Huella del contenido del fichero de efemérides. La comparten
+                    las cachés que dependen de él (páginas diarias y catálogo de
+                    fases), de modo que todas se invalidan a la vez.
+
+    PRECONDICIÓN:   'ruta': ruta (str o Path) de un fichero existente.
+
+    POSTCONDICIÓN:  Devuelve el SHA-256 (hexadecimal) de su contenido. Sólo se
+                    lee el fichero la primera vez (o si cambia su tamaño o fecha).
+    """
+    ruta = Path(ruta)
+    info = ruta.stat()
+    firma = (str(ruta), info.st_size, info.st_mtime_ns)
+
+    if firma not in _hash_efemerides_memo:
+        h = hashlib.sha256()
+        with open(ruta, 'rb') as f_eph:
+            for bloque in iter(lambda: f_eph.read(1 << 20), b""):
+                h.update(bloque)
+        _hash_efemerides_memo[firma] = h.hexdigest()
+
+    return _hash_efemerides_memo[firma]
+
+
 # ------------------------------------------------------------
 #   FUNCIONES DE TIEMPO
 # ------------------------------------------------------------
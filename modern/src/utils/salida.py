@@ -0,0 +1,187 @@
+import io
+import shutil
+import tempfile
+import threading
+import zipfile
+from pathlib import Path, PurePosixPath
+
+# =============================================================================
+# DESTINOS DE SALIDA DE LOS GENERADORES DEL ALMANAQUE
+# =============================================================================
+# Propósito: Desacoplar los generadores (páginas, estrellas, polar, fases de la
+#            Luna, paralajes, uso del año siguiente) del sitio donde acaban sus
+#            ficheros. Todos escriben con 'salida.abrir(nombre)' y el destino
+#            decide si el fichero va a un directorio del disco o a un ZIP.
+#
+# - SalidaDirectorio: comportamiento original, un fichero por nombre bajo una
+#                     carpeta raíz (data/almanaque_nautico/AAAA).
+# - SalidaZip:        cada fichero se comprime directamente dentro de un ZIP
+#                     (fichero, BytesIO o cualquier flujo binario), sin pasar
+#                     por un directorio intermedio.
+# =============================================================================
+
+# Tamaño máximo en memoria de una entrada del ZIP que tiene que esperar turno
+# (ver SalidaZip.abrir); por encima se vuelca a un temporal en disco.
+TAM_MAX_MEMORIA_ZIP = 32 * 1024 * 1024
+
+
+class SalidaDirectorio:
+    """
+    CABECERA:       SalidaDirectorio(raiz)
+    DESCRIPCIÓN:    Destino que escribe cada fichero bajo el directorio 'raiz'
+                    (se crean las carpetas que falten).
+
+    PRECONDICIÓN:   'raiz': ruta (str o Path) del directorio de salida.
+
+    POSTCONDICIÓN:  'abrir(nombre)' devuelve un fichero de texto abierto en
+                    escritura en raiz/nombre.
+    """
+
+    def __init__(self, raiz):
+        self.raiz = Path(raiz)
+        self.raiz.mkdir(parents=True, exist_ok=True)
+
+    def abrir(self, nombre, encoding=None, errors=None, newline=None):
+        ruta = self.raiz / nombre
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        return open(ruta, 'w', encoding=encoding, errors=errors, newline=newline)
+
+    def ruta(self, nombre):
+        """Ubicación final del fichero 'nombre' (ruta en disco)."""
+        return self.raiz / nombre
+
+    def cerrar(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __str__(self):
+        return str(self.raiz)
+
+
+class _EntradaZip(io.RawIOBase):
+    """Flujo binario de una entrada del ZIP que avisa a su destino al cerrarse."""
+
+    def __init__(self, salida, nombre, destino, directa):
+        super().__init__()
+        self.salida = salida
+        self.nombre = nombre
+        self.destino = destino      # ZipExtFile de escritura o temporal en memoria
+        self.directa = directa      # True si escribe directamente en el ZIP
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        return self.destino.write(datos)
+
+    def close(self):
+        if not self.closed:
+            super().close()
+            self.salida._entrada_cerrada(self)
+
+
+class SalidaZip:
+    """
+    CABECERA:       SalidaZip(destino, compresion=zipfile.ZIP_DEFLATED)
+    DESCRIPCIÓN:    Destino que va comprimiendo los ficheros dentro de un ZIP a
+                    medida que se escriben (zipfile.ZipFile.open en modo 'w').
+
+                    Un ZIP sólo admite una entrada en escritura a la vez: la
+                    primera que se abre se comprime en flujo directo y las que
+                    se abren mientras tanto (p. ej. los seis ficheros de las
+                    estrellas) se guardan en un SpooledTemporaryFile y se
+                    añaden al ZIP en cuanto queda libre. Cada una se mantiene
+                    en memoria hasta TAM_MAX_MEMORIA_ZIP (32 MB); por encima
+                    se vuelca a un fichero temporal en disco.
+
+                    'cerrar' vacía y cierra los ficheros que sigan abiertos
+                    (p. ej. si un generador falla antes de cerrarlos), de modo
+                    que su texto en búfer también llega al ZIP.
+
+    PRECONDICIÓN:   'destino': ruta del ZIP o flujo binario abierto en
+                    escritura (io.BytesIO, respuesta HTTP, ...). Un flujo sin
+                    posicionamiento también sirve.
+
+    POSTCONDICIÓN:  'abrir(nombre)' devuelve un fichero de texto cuyo
+                    contenido acaba en la entrada 'nombre' del ZIP. El ZIP
+                    queda completo al llamar a 'cerrar' (o al salir del 'with').
+    """
+
+    def __init__(self, destino, compresion=zipfile.ZIP_DEFLATED):
+        self.destino = destino
+        self._zip = zipfile.ZipFile(destino, 'w', compression=compresion)
+        self._abierta = None        # Entrada que se está comprimiendo en flujo
+        self._pendientes = []       # Entradas cerradas esperando a que quede libre
+        self._envolturas = {}       # Entrada abierta -> fichero de texto devuelto
+        self._cerrojo = threading.RLock()
+
+    def abrir(self, nombre, encoding=None, errors=None, newline=None):
+        nombre = str(PurePosixPath(nombre))
+        with self._cerrojo:
+            if self._abierta is None:
+                destino = self._zip.open(nombre, 'w', force_zip64=True)
+                entrada = _EntradaZip(self, nombre, destino, directa=True)
+                self._abierta = entrada
+            else:
+                destino = tempfile.SpooledTemporaryFile(max_size=TAM_MAX_MEMORIA_ZIP)
+                entrada = _EntradaZip(self, nombre, destino, directa=False)
+
+            fichero = io.TextIOWrapper(io.BufferedWriter(entrada), encoding=encoding,
+                                       errors=errors, newline=newline)
+            self._envolturas[entrada] = fichero
+        return fichero
+
+    def _entrada_cerrada(self, entrada):
+        with self._cerrojo:
+            self._envolturas.pop(entrada, None)
+            if entrada.directa:
+                entrada.destino.close()
+                self._abierta = None
+            else:
+                self._pendientes.append(entrada)
+
+            if self._abierta is None:
+                self._vaciar_pendientes()
+
+    def _vaciar_pendientes(self):
+        for entrada in self._pendientes:
+            entrada.destino.seek(0)
+            with self._zip.open(entrada.nombre, 'w', force_zip64=True) as f_zip:
+                shutil.copyfileobj(entrada.destino, f_zip)
+            entrada.destino.close()
+        self._pendientes = []
+
+    def ruta(self, nombre):
+        """Ubicación final del fichero 'nombre' (nombre de la entrada en el ZIP)."""
+        return PurePosixPath(nombre)
+
+    def nombres(self):
+        """Nombres de las entradas ya escritas en el ZIP."""
+        return self._zip.namelist()
+
+    def cerrar(self):
+        with self._cerrojo:
+            # Cerrar el fichero de texto (no la entrada cruda) vuelca lo que
+            # quede en los búferes; la entrada directa va primero para dejar
+            # el ZIP libre a las demás.
+            abiertas = sorted(self._envolturas.items(), key=lambda par: not par[0].directa)
+            for _, fichero in abiertas:
+                fichero.close()
+            self._vaciar_pendientes()
+            self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __str__(self):
+        if isinstance(self.destino, (str, Path)):
+            return str(self.destino)
+        return "<ZIP en memoria>"
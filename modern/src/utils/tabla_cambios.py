@@ -0,0 +1,142 @@
+from functools import lru_cache
+
+import numpy as np
+
+from utils import funciones as fun
+from utils import read_de440
+
+# =============================================================================
+# TABLAS DE CAMBIOS DE MAGNITUDES DIARIAS
+# =============================================================================
+# Propósito: Construir las tablas del Almanaque que sólo listan los días en que
+#            cambia una magnitud redondeada a la décima de minuto (paralajes de
+#            Venus y Marte, página 387; semidiámetro del Sol, página 387B).
+#
+# - fechas_tabla:   fechas julianas de cada día del año con el criterio de los
+#                   programas FORTRAN (primer valor el 2 de enero a 0h sin
+#                   Delta T; el resto, días 1..N-1 del año con Delta T).
+# - distancias_tabla: distancias geocéntricas de un cuerpo en esas fechas, con
+#                   una sola llamada vectorial y cacheadas por (año, Delta T,
+#                   cuerpo) para que las compartan todas las tablas.
+# - celdas_decimas: cadenas de 4 caracteres (F4.1) de toda la serie de una vez,
+#                   con las reglas de signo y cero del formato original.
+# - tabla_cambios:  líneas LaTeX de la tabla, una entrada por día de cambio.
+#
+# Una tabla nueva sólo tiene que calcular su serie diaria (días x columnas) en
+# las fechas de 'fechas_tabla' y escribir las líneas de 'tabla_cambios'.
+# =============================================================================
+
+# Celda vacía de la fila de fecha (una por columna de valores)
+CELDA_VACIA = "           "
+
+
+def fechas_tabla(anio, dT):
+    """
+    CABECERA:       fechas_tabla(anio, dT)
+    DESCRIPCIÓN:    Fechas julianas en las que se evalúa la magnitud diaria.
+                    La primera es el 2 de enero a 0h sin Delta T (valor de la
+                    fila del 1 de enero) y las siguientes son los días
+                    1..N-1 del año con Delta T, como en el original.
+
+    PRECONDICIÓN:   'anio': año (int); 'dT': Delta T en segundos.
+
+    POSTCONDICIÓN:  Devuelve un array float64 con una fecha por día del año.
+    """
+    jd0 = fun.DiaJul(1, 1, anio, 0.0)
+    dias = int(fun.DiaJul(1, 1, anio + 1, 0.0) - jd0 + 0.5)
+
+    jd = jd0 + np.arange(dias, dtype=np.float64) + float(dT) / 86400.0
+    jd[0] = fun.DiaJul(2, 1, anio, 0.0)
+    return jd
+
+
+@lru_cache(maxsize=16)
+def distancias_tabla(anio, dT, cuerpo):
+    """
+    CABECERA:       distancias_tabla(anio, dT, cuerpo)
+    DESCRIPCIÓN:    Distancia geocéntrica del cuerpo en todas las fechas de
+                    fechas_tabla, con una sola llamada a read_de440.GeoDista.
+                    La serie se calcula una vez por (año, Delta T, cuerpo).
+
+    PRECONDICIÓN:   'anio': año (int); 'dT': Delta T en segundos; 'cuerpo':
+                    identificador de GeoDista (10 = Sol, 2 = Venus, 4 = Marte).
+
+    POSTCONDICIÓN:  Devuelve un array float64 de sólo lectura en UA.
+    """
+    distancias = np.asarray(read_de440.GeoDista(fechas_tabla(anio, dT), cuerpo), dtype=np.float64)
+    distancias.flags.writeable = False
+    return distancias
+
+
+def celdas_decimas(valores, limpiar_cero=False):
+    """
+    CABECERA:       celdas_decimas(valores, limpiar_cero)
+    DESCRIPCIÓN:    Redondea toda la serie a la décima con el formato F4.1
+                    (se conservan los 4 últimos caracteres) y aplica las
+                    reglas de signo del formato LaTeX original:
+                      - con 'limpiar_cero', '-0.0' se escribe ' 0.0';
+                      - el signo de los valores positivos que no son '0.0'
+                        se escribe '+'.
+
+    PRECONDICIÓN:   'valores': array (días,) o (días x columnas) en minutos
+                    de arco.
+
+    POSTCONDICIÓN:  Devuelve (cadenas, signos): 'cadenas' es el array de
+                    cadenas de 4 caracteres con la forma de 'valores' (sobre
+                    el que se detectan los cambios) y 'signos' el mismo array
+                    con los signos '+' ya puestos.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    cadenas = np.array([f"{v:4.1f}"[-4:] for v in valores.ravel().tolist()], dtype="<U4")
+
+    # Vista carácter a carácter: (..., 4)
+    caracteres = cadenas.view("<U1").reshape(valores.shape + (4,)).copy()
+    cero = ((caracteres[..., 1] == "0") & (caracteres[..., 2] == ".")
+            & (caracteres[..., 3] == "0"))
+
+    if limpiar_cero:
+        caracteres[..., 0][cero] = " "
+    cadenas = caracteres.view("<U4").reshape(valores.shape).copy()
+
+    caracteres[..., 0][(caracteres[..., 0] != "-") & ~cero] = "+"
+    signos = caracteres.view("<U4").reshape(valores.shape)
+    return cadenas, signos
+
+
+def tabla_cambios(jd, valores, limpiar_cero=False):
+    """
+    CABECERA:       tabla_cambios(jd, valores, limpiar_cero)
+    DESCRIPCIÓN:    Genera las líneas de una tabla de cambios: la entrada del
+                    1 de enero, una entrada por cada día en que cambia alguna
+                    de las columnas redondeadas (fechada con el día anterior)
+                    y la línea final del 31 de diciembre. Cada valor se
+                    escribe como '$s$d\\Minp c' (signo, unidades y décima).
+
+    PRECONDICIÓN:   'jd': fechas de 'fechas_tabla'; 'valores': array (días,)
+                    o (días x columnas) evaluado en esas fechas, con las
+                    columnas en el orden de la tabla; 'limpiar_cero': ver
+                    celdas_decimas.
+
+    POSTCONDICIÓN:  Devuelve la lista de líneas (sin salto de línea).
+    """
+    valores = np.asarray(valores, dtype=np.float64).reshape(len(jd), -1)
+    cadenas, signos = celdas_decimas(valores, limpiar_cero)
+
+    # Días en los que cambia alguna columna respecto al día anterior
+    cambios = np.flatnonzero(np.any(cadenas[1:] != cadenas[:-1], axis=1)) + 1
+
+    # Entradas (día, mes, fila): el 1 de enero y el día anterior a cada cambio
+    entradas = [(1, 1, 0)]
+    for i in cambios:
+        dia, mes, _anio, _hora = fun.DJADia(jd[i] - 1)
+        entradas.append((dia, mes, i))
+
+    vacias = "&".join([CELDA_VACIA] * valores.shape[1])
+    lineas = []
+    for dia, mes, i in entradas:
+        celdas = "&".join(f"${s[0]}${s[1]}\\Minp {s[3]}" for s in signos[i])
+        lineas.append(f" {fun.MesNom(mes)}&{dia:2d}&{vacias}\\\\")
+        lineas.append(f"     &  &{celdas}\\\\")
+
+    lineas.append(f" {fun.MesNom(12)}&{31:2d}&{vacias}\\\\")
+    return lineas
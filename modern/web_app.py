@@ -1,4 +1,4 @@
-import shutil
+import io
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -10,15 +10,14 @@ import streamlit as st
 # =============================================================================
 # Este script actúa como el punto de entrada principal para la aplicación web.
 # Gestiona la configuración del usuario, la ejecución secuencial de los módulos
-# científicos y la gestión de archivos (generación, compresión y limpieza).
+# científicos y la entrega de los resultados en un ZIP.
 #
 # Flujo principal:
 # 1. Configuración de parámetros (Año, Delta T).
 # 2. Selección de módulos a ejecutar.
-# 3. Generación de datos en disco.
-# 4. Compresión de resultados a ZIP en memoria.
-# 5. Limpieza agresiva de archivos temporales en disco.
-# 6. Entrega del archivo al usuario.
+# 3. Generación de datos directamente en un ZIP en memoria (SalidaZip): cada
+#    módulo comprime sus ficheros a medida que los escribe, sin pasar por disco.
+# 4. Entrega del archivo al usuario.
 
 
 # =============================================================================
@@ -33,18 +32,19 @@ src_path = current_dir / "src"
 if str(src_path) not in sys.path:
     sys.path.append(str(src_path))
 
-# Definimos la ruta RAIZ donde se generarán los datos temporales ("../data")
-DATA_ROOT_DIR = current_dir.parent / "data"
-
 # Importación de módulos científicos con manejo de errores
 try:
     from src.estrellas.main_estrella import generar_datos_estrellas
-    from src.fase_luna.faseLuna import FasesDeLaLunaLatex
+    # Mismo módulo que importa fichDatAN ('fase_luna', desde src), para que
+    # "Fases Luna" y "Páginas Anuales" compartan la serie de fases cacheada
+    from fase_luna.faseLuna import METRICAS_FASES, FasesDeLaLunaLatex
     from src.paginas_an.fichDatAN import generarFichero
     from src.paralajes_v_m.VenusMarte import calculo_paralaje
     from src.polar.main_polar import generar_datos_polar
+    from src.semi_diametro_sol.SDSol import SemiDiametroSol
     from src.uso_anio_siguiente.uso_anio_siguiente import compute_corrections
     from src.utils.read_de440 import get_delta_t
+    from src.utils.salida import SalidaZip
     MODULOS_OK = True
 except ImportError as e:
     # Si falta algún módulo, la app carga pero avisa del error y deshabilita cálculos automáticos
@@ -79,7 +79,7 @@ st.markdown("""
 # =============================================================================
 # Lista de claves para los checkboxes de los módulos
 keys_modulos = ["run_fichero_dat", "run_stars", "run_polar",
-                "run_luna", "run_paralajes", "run_uso_anio"]
+                "run_luna", "run_paralajes", "run_semidiametro", "run_uso_anio"]
 
 # Inicialización del estado "Seleccionar Todos"
 if 'select_all' not in st.session_state:
@@ -147,6 +147,8 @@ with col_main:
         st.checkbox("Fases Luna", key="run_luna", on_change=check_individual)
         st.checkbox("Paralajes", key="run_paralajes",
                     on_change=check_individual)
+        st.checkbox("Semidiámetro Sol", key="run_semidiametro",
+                    on_change=check_individual)
         st.checkbox("Uso Año Siguiente", key="run_uso_anio",
                     on_change=check_individual)
 
@@ -167,27 +169,10 @@ with col_main:
     if start_btn:
 
             # -----------------------------------------------------------------
-            # PASO 1: LIMPIEZA INICIAL DEL ENTORNO
-            # -----------------------------------------------------------------
-            # Objetivo: Eliminar cualquier residuo en la carpeta 'data' de ejecuciones previas
-            if DATA_ROOT_DIR.exists():
-                try:
-                    shutil.rmtree(DATA_ROOT_DIR)  # Borrado recursivo
-                    DATA_ROOT_DIR.mkdir(parents=True, exist_ok=True)
-                except Exception as e:
-                    st.error(f"Error crítico limpiando carpeta data: {e}")
-                    st.stop()
-            else:
-                DATA_ROOT_DIR.mkdir(parents=True, exist_ok=True)
-
-            # Crear estructura de carpetas para el año específico
-            year_output_dir = DATA_ROOT_DIR / "almanaque_nautico" / str(year)
-            year_output_dir.mkdir(parents=True, exist_ok=True)
-
-            # -----------------------------------------------------------------
-            # PASO 2: DEFINICIÓN DE COLA DE TAREAS
+            # PASO 1: DEFINICIÓN DE COLA DE TAREAS
             # -----------------------------------------------------------------
             # Estructura: (Nombre visible, Función, Argumentos Posicionales, Argumentos Nombrados)
+            # Todas las funciones reciben además el destino 'salida' (ver PASO 2)
             tareas = []
 
             if st.session_state.run_stars:
@@ -211,6 +196,12 @@ with col_main:
                 tareas.append(("Paralajes", calculo_paralaje, (),
                               {'anio': year, 'dT': delta_t_val}))
 
+            if st.session_state.run_semidiametro:
+                # Página 387B: comparte con Paralajes las fechas y el cálculo
+                # de distancias (utils/tabla_cambios.py)
+                tareas.append(("Semidiámetro Sol", SemiDiametroSol, (),
+                              {'ano': year, 'dT': delta_t_val}))
+
             if st.session_state.run_uso_anio:
                 tareas.append(("Uso Año Siguiente", compute_corrections, (), {
                               'ano': year, 'dt_seconds': delta_t_val}))
@@ -221,69 +212,59 @@ with col_main:
                 st.stop()
 
             # -----------------------------------------------------------------
-            # PASO 3: EJECUCIÓN SECUENCIAL
+            # PASO 2: EJECUCIÓN SECUENCIAL ESCRIBIENDO EN EL ZIP
             # -----------------------------------------------------------------
-            output_paths = []
+            # Todos los módulos escriben en el mismo ZIP en memoria; el archivo
+            # se construye a medida que se generan los ficheros y nada se
+            # escribe en la carpeta 'data' del servidor.
+            zip_name = f"Almanaque_Nautico_{year}"
+            buffer_zip = io.BytesIO()
             total_pasos = len(tareas)
 
             with status_container:
-                my_bar = st.progress(0, text="Iniciando limpieza y cálculo...")
+                my_bar = st.progress(0, text="Iniciando cálculo...")
+
+                with SalidaZip(buffer_zip) as salida:
+                    try:
+                        for i, (nombre, func, args, kwargs) in enumerate(tareas):
+                            # Actualizar barra de progreso
+                            pct = int((i / total_pasos) * 100)
+                            my_bar.progress(pct, text=f"Procesando: {nombre}...")
 
-                try:
-                    for i, (nombre, func, args, kwargs) in enumerate(tareas):
-                        # Actualizar barra de progreso
-                        pct = int((i / total_pasos) * 100)
-                        my_bar.progress(pct, text=f"Procesando: {nombre}...")
+                            # Ejecutar función del módulo
+                            with st.spinner(f"Calculando {nombre}..."):
+                                func(*args, salida=salida, **kwargs)
 
-                        # Ejecutar función del módulo
-                        with st.spinner(f"Calculando {nombre}..."):
-                            res = func(*args, **kwargs)
-                            output_paths.append(res)
+                            st.success(f"{nombre} generado correctamente")
 
-                        st.success(f"{nombre} generado correctamente")
+                        my_bar.progress(100, text="¡Completado!")
 
-                    my_bar.progress(100, text="¡Completado!")
+                        # Métricas de la búsqueda de fases de la Luna (si se ha hecho)
+                        for (anio_f, _dt, metodo), m in METRICAS_FASES.items():
+                            if anio_f == year:
+                                aviso = st.warning if m.biseccion else st.caption
+                                aviso(f"Fases de la Luna {anio_f} ({metodo}): {m.fases} fases "
+                                      f"en {m.segundos:.2f} s, máx. {m.iteraciones} iteraciones, "
+                                      f"residuo máx. {m.residuo:.1e} rad, "
+                                      f"{m.biseccion} resueltas por bisección")
 
-                except Exception as e:
-                    st.error(f"Error durante la ejecución de {nombre}: {e}")
-                    st.stop()
+                    except Exception as e:
+                        st.error(f"Error durante la ejecución de {nombre}: {e}")
+                        st.stop()
 
             # -----------------------------------------------------------------
-            # PASO 4: EMPAQUETADO Y LIMPIEZA FINAL (POST-PROCESADO)
+            # PASO 3: DISPONIBILIZAR DESCARGA
             # -----------------------------------------------------------------
-            if output_paths:
-                zip_name = f"Almanaque_Nautico_{year}"
-
-                # A. Crear ZIP temporal en /tmp (fuera de la carpeta visible data)
-                zip_path_str = shutil.make_archive(
-                    f"/tmp/{zip_name}", 'zip', year_output_dir)
-
-                # B. Cargar el archivo ZIP completo en la memoria RAM
-                #    Esto permite borrar el archivo físico inmediatamente después.
-                with open(zip_path_str, "rb") as fp:
-                    zip_data = fp.read()
-
-                # C. Limpieza Final: Borrar carpeta 'data' del servidor
-                #    Se realiza ANTES de mostrar el botón para asegurar que no quedan residuos
-                if DATA_ROOT_DIR.exists():
-                    shutil.rmtree(DATA_ROOT_DIR)
-                    # (Opcional) Recrear carpeta vacía por consistencia
-                    DATA_ROOT_DIR.mkdir()
-
-                # D. Limpieza del ZIP temporal en /tmp
-                Path(zip_path_str).unlink(missing_ok=True)
-
-                # -----------------------------------------------------------------
-                # PASO 5: DISPONIBILIZAR DESCARGA
-                # -----------------------------------------------------------------
-                # El botón sirve los datos directamente desde la variable 'zip_data' (RAM)
-                download_placeholder.download_button(
-                    label="Descargar ZIP",
-                    data=zip_data,
-                    file_name=f"{zip_name}.zip",
-                    mime="application/zip",
-                    type="primary"
-                )
-
-                status_container.info(
-                    "Archivos generados, empaquetados y eliminados del servidor. Listo para descargar.")
+            # El botón sirve los datos directamente desde el ZIP en memoria (RAM)
+            zip_data = buffer_zip.getvalue()
+
+            download_placeholder.download_button(
+                label="Descargar ZIP",
+                data=zip_data,
+                file_name=f"{zip_name}.zip",
+                mime="application/zip",
+                type="primary"
+            )
+
+            status_container.info(
+                "Archivos generados y empaquetados en memoria. Listo para descargar.")